@@ -1,19 +1,27 @@
 from django.contrib import admin
-from .models import Content, Playlist, Schedule, Device, DeviceGroup
+from .models import Content, ContentRendition, Playlist, Schedule, Device, DeviceGroup, TranscodeJob
+
+class ContentRenditionInline(admin.TabularInline):
+    model = ContentRendition
+    extra = 0
+    readonly_fields = ('width', 'height', 'file', 'date_created')
 
 class ContentAdmin(admin.ModelAdmin):
     list_display = ('content_name', 'device', 'creator', 'file_type_content', 
                    'file_size_kb', 'supported_device', 'expiration_date')
-    list_filter = ('device__group', 'expiration_date', 'supported_device', 'creator')
+    list_filter = ('device__group', 'expiration_date', 'supported_device', 'creator', 'media_kind')
     search_fields = ('content_name', 'device__name')
     raw_id_fields = ('device', 'creator')
-    readonly_fields = ('date_modified', 'supported_device')
+    readonly_fields = ('date_modified', 'supported_device', 'size_bytes', 'media_kind', 'mime_type',
+                       'width', 'height', 'duration')
+    inlines = [ContentRenditionInline]
     fieldsets = (
         (None, {
             'fields': ('content_name', 'file', 'device', 'creator')
         }),
         ('Metadata', {
-            'fields': ('supported_device', 'expiration_date', 'date_modified')
+            'fields': ('supported_device', 'expiration_date', 'date_modified', 'size_bytes',
+                       'media_kind', 'mime_type', 'width', 'height', 'duration')
         }),
     )
 
@@ -22,16 +30,18 @@ admin.site.register(Content, ContentAdmin)
 class PlaylistAdmin(admin.ModelAdmin):
     list_display = ('playlist_name', 'device', 'creator', 'file_type_playlist', 
                    'file_size_kb', 'supported_device', 'expiration_date')
-    list_filter = ('device__group', 'supported_device', 'creator', 'expiration_date')
+    list_filter = ('device__group', 'supported_device', 'creator', 'expiration_date', 'media_kind')
     search_fields = ('playlist_name', 'device__name')
     raw_id_fields = ('device', 'creator')
-    readonly_fields = ('date_modified', 'supported_device')
+    readonly_fields = ('date_modified', 'supported_device', 'size_bytes', 'media_kind', 'mime_type',
+                       'width', 'height', 'duration')
     fieldsets = (
         (None, {
             'fields': ('playlist_name', 'file', 'device', 'creator')
         }),
         ('Metadata', {
-            'fields': ('supported_device', 'expiration_date', 'date_modified')
+            'fields': ('supported_device', 'expiration_date', 'date_modified', 'size_bytes',
+                       'media_kind', 'mime_type', 'width', 'height', 'duration')
         }),
     )
 
@@ -39,11 +49,11 @@ admin.site.register(Playlist, PlaylistAdmin)
 
 class ScheduleAdmin(admin.ModelAdmin):
     list_display = ('schedule_name', 'schedule_type', 'publish_status', 
-                   'playback_date', 'playback_start', 'playback_end', 'get_groups')
+                   'playback_date', 'recurrence_end', 'playback_start', 'playback_end', 'get_groups')
     list_filter = ('publish_status', 'schedule_type', 'playback_date')
     search_fields = ('schedule_name', 'description', 'content__content_name', 'playlist__playlist_name')
     filter_horizontal = ('publish_to',)
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('recurrence_end', 'created_at', 'updated_at')
     raw_id_fields = ('content', 'playlist')
     
     def get_groups(self, obj):
@@ -78,4 +88,11 @@ class DeviceAdmin(admin.ModelAdmin):
         ('Metadata', {
             'fields': ('created_at',)
         }),
-    )
\ No newline at end of file
+    )
+
+@admin.register(TranscodeJob)
+class TranscodeJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'progress', 'content', 'playlist', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('kind', 'status')
+    raw_id_fields = ('content', 'playlist')
+    readonly_fields = ('created_at', 'started_at', 'finished_at', 'updated_at')
@@ -0,0 +1,307 @@
+"""
+Load generation untuk armada display: seed grup/device/content/schedule lalu
+replay polling ``/signage/display/`` (AJAX) dan ``/device/ping/`` secara
+konkuren dari IP simulasi.
+
+Rencana request (urutan jenis request dan IP) dibangun dari ``random.Random``
+dengan seed tetap, sehingga run di commit berbeda bisa dibandingkan langsung.
+Runner yang tersedia:
+
+- ``client``: Django test client in-process, IP lewat ``REMOTE_ADDR``.
+- ``wsgi``: ThreadedWSGIServer Django di thread lokal lewat HTTP sungguhan.
+- ``url``: server yang sudah jalan (gunicorn/uvicorn) yang memakai entry point
+  ``signage.benchmark_server``; IP dikirim lewat header ``X-Benchmark-IP``.
+
+Jumlah query per request dihitung dengan ``connection.execute_wrapper`` di
+proses aplikasi dan, untuk runner HTTP, dikembalikan lewat header
+``X-Benchmark-Queries``. Dipakai oleh command ``benchmark_signage``.
+"""
+import ipaddress
+import json
+import logging
+import math
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+BENCH_PREFIX = 'bench-'
+BENCH_NETWORK = ipaddress.ip_network('10.128.0.0/10')
+IP_HEADER = 'X-Benchmark-IP'
+QUERIES_HEADER = 'X-Benchmark-Queries'
+
+DISPLAY_PATH = '/signage/display/'
+PING_PATH = '/device/ping/'
+
+
+class QueryCounter:
+    """execute_wrapper yang menghitung query pada connection thread ini"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def device_ip(index):
+    return str(BENCH_NETWORK[index + 1])
+
+
+# ----------------------------------------------------------------------
+# Data
+# ----------------------------------------------------------------------
+
+def seed(groups=10, devices_per_group=100, contents=50, schedules_per_group=48):
+    """
+    Buat data benchmark (semua nama diawali BENCH_PREFIX). Schedule hari ini
+    dibagi rata sepanjang 24 jam per grup sehingga setiap display selalu punya
+    schedule aktif dan berikutnya. Return list IP device.
+    """
+    from .models import Content, Device, DeviceGroup, Schedule
+    from .schedule_builder import bulk_create_schedules
+
+    today = timezone.localdate()
+    media = Content.objects.bulk_create([
+        Content(
+            content_name=f"{BENCH_PREFIX}content-{index}",
+            file=f"content_uploads/{BENCH_PREFIX}{index}.{'mp4' if index % 3 == 0 else 'jpg'}",
+        )
+        for index in range(contents)
+    ])
+
+    ips = []
+    slot = timedelta(minutes=24 * 60 // max(schedules_per_group, 1))
+    for group_index in range(groups):
+        group = DeviceGroup.objects.create(name=f"{BENCH_PREFIX}group-{group_index}")
+        devices = Device.objects.bulk_create([
+            Device(
+                name=f"{BENCH_PREFIX}screen-{group_index}-{device_index}",
+                ip_address=device_ip(group_index * devices_per_group + device_index),
+                user_agent='benchmark_signage',
+                resolution='1920x1080',
+                group=group,
+                is_online=True,
+            )
+            for device_index in range(devices_per_group)
+        ])
+        ips.extend(device.ip_address for device in devices)
+
+        start = datetime.combine(today, datetime.min.time())
+        schedules = []
+        for index in range(schedules_per_group):
+            begin = start + slot * index
+            schedules.append(Schedule(
+                schedule_name=f"{BENCH_PREFIX}schedule-{group_index}-{index}",
+                schedule_type='None',
+                publish_status='Published',
+                content=media[(group_index + index) % len(media)] if media else None,
+                playback_date=today,
+                playback_start=begin.time(),
+                playback_end=(begin + slot - timedelta(seconds=1)).time(),
+            ))
+        bulk_create_schedules(schedules, devices)
+
+    logger.info(f"[BENCHMARK] Seeded {groups} groups, {len(ips)} devices, {contents} contents")
+    return ips
+
+
+def seeded_ips():
+    from .models import Device
+    return list(Device.objects.filter(name__startswith=BENCH_PREFIX).order_by('id').values_list('ip_address', flat=True))
+
+
+def cleanup():
+    """Hapus semua data benchmark"""
+    from .models import Content, Device, DeviceGroup, Schedule
+
+    Schedule.objects.filter(schedule_name__startswith=BENCH_PREFIX).delete()
+    Device.objects.filter(name__startswith=BENCH_PREFIX).delete()
+    DeviceGroup.objects.filter(name__startswith=BENCH_PREFIX).delete()
+    Content.objects.filter(content_name__startswith=BENCH_PREFIX).delete()
+
+
+# ----------------------------------------------------------------------
+# Rencana request dan statistik
+# ----------------------------------------------------------------------
+
+def build_plan(ips, total, ping_ratio=0.5, random_seed=0):
+    """List (jenis, ip) yang sama untuk setiap runner dengan seed yang sama"""
+    rng = random.Random(random_seed)
+    return [
+        ('ping' if rng.random() < ping_ratio else 'display', rng.choice(ips))
+        for _ in range(total)
+    ]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile dari list yang sudah terurut"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples, elapsed):
+    """samples: list (jenis, status, detik, jumlah query atau None)"""
+    def _stats(rows):
+        latencies = sorted(row[2] * 1000 for row in rows)
+        queries = [row[3] for row in rows if row[3] is not None]
+        return {
+            'requests': len(rows),
+            'errors': sum(1 for row in rows if row[1] is None or row[1] >= 400),
+            'latency_ms': {
+                'mean': round(sum(latencies) / len(latencies), 3) if latencies else None,
+                'p50': round(percentile(latencies, 0.50), 3) if latencies else None,
+                'p95': round(percentile(latencies, 0.95), 3) if latencies else None,
+                'p99': round(percentile(latencies, 0.99), 3) if latencies else None,
+                'max': round(latencies[-1], 3) if latencies else None,
+            },
+            'queries_per_request': {
+                'mean': round(sum(queries) / len(queries), 2) if queries else None,
+                'max': max(queries) if queries else None,
+            },
+            'throughput_rps': round(len(rows) / elapsed, 2) if elapsed else None,
+        }
+
+    summary = _stats(samples)
+    summary['elapsed_s'] = round(elapsed, 3)
+    summary['endpoints'] = {
+        kind: _stats([row for row in samples if row[0] == kind])
+        for kind in sorted({row[0] for row in samples})
+    }
+    return summary
+
+
+# ----------------------------------------------------------------------
+# Runner
+# ----------------------------------------------------------------------
+
+def _run_concurrent(plan, concurrency, make_worker):
+    """Bagi plan ke `concurrency` thread; make_worker() -> callable(kind, ip)"""
+    samples = []
+    lock = threading.Lock()
+    cursor = iter(plan)
+
+    def _loop():
+        send = make_worker()
+        local = []
+        try:
+            while True:
+                with lock:
+                    item = next(cursor, None)
+                if item is None:
+                    break
+                kind, ip = item
+                started = time.perf_counter()
+                try:
+                    status, queries = send(kind, ip)
+                except Exception as e:
+                    logger.debug(f"[BENCHMARK] {kind} {ip} failed: {e}")
+                    status, queries = None, None
+                local.append((kind, status, time.perf_counter() - started, queries))
+        finally:
+            connection.close()
+            with lock:
+                samples.extend(local)
+
+    threads = [threading.Thread(target=_loop, name=f'benchmark-{index}') for index in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+def _ping_body():
+    return json.dumps({'is_heartbeat': True}).encode()
+
+
+def client_worker():
+    from django.test import Client
+
+    client = Client()
+
+    def send(kind, ip):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            if kind == 'ping':
+                response = client.post(PING_PATH, _ping_body(), content_type='application/json', REMOTE_ADDR=ip)
+            else:
+                response = client.get(DISPLAY_PATH, REMOTE_ADDR=ip, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        return response.status_code, counter.count
+
+    return send
+
+
+def http_worker(base_url):
+    base_url = base_url.rstrip('/')
+
+    def send(kind, ip):
+        headers = {IP_HEADER: ip}
+        if kind == 'ping':
+            headers['Content-Type'] = 'application/json'
+            request = urllib.request.Request(base_url + PING_PATH, data=_ping_body(), headers=headers)
+        else:
+            headers['X-Requested-With'] = 'XMLHttpRequest'
+            request = urllib.request.Request(base_url + DISPLAY_PATH, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                response.read()
+                status, queries = response.status, response.headers.get(QUERIES_HEADER)
+        except urllib.error.HTTPError as e:
+            status, queries = e.code, e.headers.get(QUERIES_HEADER)
+        return status, int(queries) if queries is not None else None
+
+    return lambda: send
+
+
+def run_client(plan, concurrency):
+    return _run_concurrent(plan, concurrency, client_worker)
+
+
+def run_http(plan, concurrency, base_url):
+    return _run_concurrent(plan, concurrency, http_worker(base_url))
+
+
+class LocalServer:
+    """ThreadedWSGIServer Django di port acak dengan entry point benchmark"""
+
+    def __init__(self, host='127.0.0.1'):
+        self.host = host
+        self.httpd = None
+        self.thread = None
+
+    def __enter__(self):
+        from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+        from django.core.wsgi import get_wsgi_application
+
+        from .benchmark_server import BenchmarkWSGI
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadedWSGIServer((self.host, 0), QuietHandler, allow_reuse_address=False)
+        self.httpd.set_app(BenchmarkWSGI(get_wsgi_application()))
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='benchmark-wsgi', daemon=True)
+        self.thread.start()
+        return self
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.httpd.server_address[1]}"
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
@@ -0,0 +1,72 @@
+"""
+Entry point WSGI/ASGI khusus benchmark (lihat signage.benchmark).
+
+REMOTE_ADDR diambil dari header ``X-Benchmark-IP`` agar satu load generator
+bisa mensimulasikan ribuan display, dan pada WSGI jumlah query per request
+dikembalikan lewat header ``X-Benchmark-Queries``. Header IP dipercaya begitu
+saja, jadi JANGAN dipakai di production::
+
+    gunicorn signage.benchmark_server:wsgi_application
+    uvicorn signage.benchmark_server:asgi_application
+"""
+import os
+
+from django.db import connection
+
+from .benchmark import IP_HEADER, QUERIES_HEADER, QueryCounter
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'signage_project.settings')
+
+_WSGI_IP_KEY = 'HTTP_' + IP_HEADER.upper().replace('-', '_')
+_ASGI_IP_KEY = IP_HEADER.lower().encode()
+
+
+class BenchmarkWSGI:
+    def __init__(self, application):
+        self.application = application
+
+    def __call__(self, environ, start_response):
+        ip = environ.pop(_WSGI_IP_KEY, None)
+        if ip:
+            environ['REMOTE_ADDR'] = ip
+        counter = QueryCounter()
+
+        # start_response dipanggil setelah view selesai, jadi hitungan sudah lengkap
+        def _start_response(status, headers, exc_info=None):
+            return start_response(status, headers + [(QUERIES_HEADER, str(counter.count))], exc_info)
+
+        with connection.execute_wrapper(counter):
+            return self.application(environ, _start_response)
+
+
+class BenchmarkASGI:
+    """Hanya mengganti client address; view sync berjalan di thread lain sehingga query tidak dihitung"""
+
+    def __init__(self, application):
+        self.application = application
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            for name, value in scope.get('headers', []):
+                if name == _ASGI_IP_KEY:
+                    scope = dict(scope, client=(value.decode('latin-1'), 0))
+                    break
+        return await self.application(scope, receive, send)
+
+
+def _wsgi():
+    from django.core.wsgi import get_wsgi_application
+    return BenchmarkWSGI(get_wsgi_application())
+
+
+def _asgi():
+    from django.core.asgi import get_asgi_application
+    return BenchmarkASGI(get_asgi_application())
+
+
+def __getattr__(name):
+    # Dibuat saat diminta server; runner lokal hanya memakai BenchmarkWSGI
+    factories = {'wsgi_application': _wsgi, 'asgi_application': _asgi}
+    if name in factories:
+        return factories[name]()
+    raise AttributeError(name)
@@ -0,0 +1,133 @@
+"""
+Data kalender bulanan untuk SchedulesView (``?action=calendar``).
+
+Satu bulan diambil dengan satu query ``values()`` (tanpa instance model dan
+tanpa lazy load content/playlist), kemunculan schedule berulang di-expand
+untuk bulan itu saja, lalu diserialisasi langsung menjadi bytes JSON. Hasilnya
+di-cache per (tahun, bulan, set grup) bersama ETag-nya. Semua entry
+di-invalidasi sekaligus dengan menaikkan nomor versi setiap kali Schedule,
+publish_to, Content/Playlist atau grup device berubah.
+"""
+import hashlib
+import json
+from calendar import monthrange
+from datetime import date
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from .recurrence import occurrence_dates
+
+CALENDAR_CACHE_PREFIX = 'signage:calendar'
+CALENDAR_CACHE_TIMEOUT = 60 * 60
+IMAGE_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif', 'webp']
+VIDEO_EXTENSIONS = ['mp4', 'mov', 'avi', 'webm']
+
+
+def _version_key():
+    return f"{CALENDAR_CACHE_PREFIX}:version"
+
+
+def _version():
+    return cache.get_or_set(_version_key(), 1, None)
+
+
+def invalidate_calendar():
+    """Naikkan versi cache kalender (sekarang dan sekali lagi setelah commit)"""
+    def _bump():
+        try:
+            cache.incr(_version_key())
+        except ValueError:
+            cache.set(_version_key(), 1, None)
+
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def parse_group_ids(group_filter):
+    """'3,1,x,3' -> (1, 3)"""
+    if not group_filter:
+        return ()
+    return tuple(sorted({int(group_id) for group_id in group_filter.split(',') if group_id.isdigit()}))
+
+
+def _media_type(name):
+    ext = name.split('.')[-1].lower() if name else ''
+    if ext in IMAGE_EXTENSIONS:
+        return 'image'
+    if ext in VIDEO_EXTENSIONS:
+        return 'video'
+    return 'unknown'
+
+
+def resolve_media(content_id, content_file, playlist_id, playlist_file):
+    """(media_url, media_type) dari kolom hasil values(), sama seperti is_content/is_playlist"""
+    if content_id and not playlist_id and content_file:
+        name = content_file
+    elif playlist_id and not content_id and playlist_file:
+        name = playlist_file
+    else:
+        return None, None
+    return default_storage.url(name), _media_type(name)
+
+
+def month_rows(first_day, last_day, group_ids=()):
+    """Baris schedule Published yang rentangnya beririsan dengan bulan tersebut"""
+    from .models import Schedule
+
+    rows = Schedule.objects.filter(
+        publish_status='Published',
+        playback_date__lte=last_day,
+        recurrence_end__gte=first_day,
+    )
+    if group_ids:
+        rows = rows.for_groups(group_ids, first_day, last_day)
+    return rows.values_list(
+        'id', 'schedule_name', 'playback_date', 'recurrence', 'playback_start', 'playback_end',
+        'publish_status', 'content_id', 'content__file', 'playlist_id', 'playlist__file',
+    )
+
+
+def build_month(year, month, group_ids=()):
+    """List schedule (satu per kemunculan) untuk bulan tersebut, terurut"""
+    first_day = date(year, month, 1)
+    last_day = date(year, month, monthrange(year, month)[1])
+    rows = month_rows(first_day, last_day, group_ids)
+
+    schedules = []
+    for (schedule_id, name, first_date, rule, start, end, status,
+         content_id, content_file, playlist_id, playlist_file) in rows:
+        media_url, media_type = resolve_media(content_id, content_file, playlist_id, playlist_file)
+
+        for day in occurrence_dates(first_date, rule, first_day, last_day):
+            schedules.append({
+                'id': schedule_id,
+                'schedule_name': name,
+                'playback_date': day.isoformat(),
+                'playback_start': start.strftime('%H:%M') if start else None,
+                'playback_end': end.strftime('%H:%M') if end else None,
+                'publish_status': status,
+                'media_url': media_url,
+                'media_type': media_type,
+            })
+
+    schedules.sort(key=lambda item: (item['playback_date'], item['playback_start'] or '', item['id']))
+    return schedules
+
+
+def month_payload(year, month, group_ids=()):
+    """(bytes JSON response, etag) untuk endpoint kalender, dari cache jika ada"""
+    key = f"{CALENDAR_CACHE_PREFIX}:{_version()}:{year}-{month:02d}:{','.join(map(str, group_ids))}"
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    body = json.dumps(
+        {'status': 'success', 'schedules': build_month(year, month, group_ids)},
+        cls=DjangoJSONEncoder, separators=(',', ':')
+    ).encode()
+    payload = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+    cache.set(key, payload, CALENDAR_CACHE_TIMEOUT)
+    return payload
@@ -0,0 +1,206 @@
+"""
+Pemeliharaan counter DeviceGroup.device_count dan schedule_count secara
+incremental.
+
+Event save/delete/m2m_changed hanya menghitung delta (+1/-1) per grup.
+Delta dikumpulkan per transaksi dan ditulis sekali saat commit lewat
+``UPDATE ... SET x = x + delta`` (F expression), bukan COUNT(*) ulang per
+grup. ``reconcile()`` (command ``reconcile_group_counters``) menghitung ulang
+semua counter untuk memperbaiki drift, misalnya setelah ``QuerySet.update``
+atau SQL manual yang melewati signal.
+
+schedule_count = jumlah schedule berbeda yang dipublish ke minimal satu
+device di grup, sehingga delta hanya terjadi saat grup mulai/berhenti
+"tercakup" oleh sebuah schedule.
+"""
+import logging
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Greatest
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ('device_count', 'schedule_count')
+
+
+class _Batch:
+    def __init__(self):
+        self.deltas = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+
+    def flush(self):
+        group_counters.apply(self.deltas)
+        self.deltas.clear()
+
+
+class GroupCounters:
+    """Kumpulkan delta counter per transaksi dan terapkan saat commit"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _batch(self):
+        connection = transaction.get_connection()
+        batch = getattr(self._local, 'batch', None)
+        # Batch lama hilang dari antrian on_commit jika transaksinya di-rollback
+        if batch is None or not any(entry[1] == batch.flush for entry in connection.run_on_commit):
+            batch = _Batch()
+            self._local.batch = batch
+            transaction.on_commit(batch.flush)
+        return batch
+
+    def add(self, group_id, field, delta):
+        if not group_id or not delta:
+            return
+        if not transaction.get_connection().in_atomic_block:
+            self.apply({group_id: {field: delta}})
+            return
+        self._batch().deltas[group_id][field] += delta
+
+    def apply(self, deltas):
+        from .models import DeviceGroup
+
+        for group_id, changes in deltas.items():
+            updates = {
+                field: Greatest(F(field) + Value(delta), Value(0))
+                for field, delta in changes.items() if delta
+            }
+            if updates:
+                DeviceGroup.objects.filter(pk=group_id).update(**updates)
+
+        if deltas:
+            from .timeline import invalidate_group_timeline
+            invalidate_group_timeline(*deltas.keys())
+
+    # ------------------------------------------------------------------
+    # Delta per event
+    # ------------------------------------------------------------------
+
+    def _exclusive_schedules(self, device_id, group_id):
+        """Jumlah schedule device yang tidak dipublish ke device lain di grup"""
+        from .models import Schedule
+
+        through = Schedule.publish_to.through
+        shared = through.objects.filter(device__group_id=group_id).exclude(
+            device_id=device_id
+        ).values('schedule_id')
+        return through.objects.filter(device_id=device_id).exclude(schedule_id__in=shared).count()
+
+    def device_added(self, device_id, group_id, created=False):
+        if group_id:
+            self.add(group_id, 'device_count', 1)
+            if not created:
+                self.add(group_id, 'schedule_count', self._exclusive_schedules(device_id, group_id))
+
+    def device_removed(self, device_id, group_id):
+        if group_id:
+            self.add(group_id, 'device_count', -1)
+            self.add(group_id, 'schedule_count', -self._exclusive_schedules(device_id, group_id))
+
+    def device_moved(self, device_id, old_group_id, new_group_id):
+        if old_group_id == new_group_id:
+            return
+        self.device_removed(device_id, old_group_id)
+        self.device_added(device_id, new_group_id)
+
+    def schedule_groups(self, schedule_id, device_ids=None, exclude_device_ids=None):
+        from .models import Schedule
+
+        rows = Schedule.publish_to.through.objects.filter(
+            schedule_id=schedule_id, device__group__isnull=False
+        )
+        if device_ids is not None:
+            rows = rows.filter(device_id__in=device_ids)
+        if exclude_device_ids:
+            rows = rows.exclude(device_id__in=exclude_device_ids)
+        return set(rows.values_list('device__group_id', flat=True).distinct())
+
+    def schedule_devices_added(self, schedule_id, device_ids):
+        """post_add: grup yang baru tercakup schedule ini"""
+        added = self.schedule_groups(schedule_id, device_ids)
+        if added:
+            already = self.schedule_groups(schedule_id, exclude_device_ids=device_ids)
+            for group_id in added - already:
+                self.add(group_id, 'schedule_count', 1)
+
+    def schedule_devices_removed(self, schedule_id, removed_groups):
+        """post_remove: grup yang tidak lagi tercakup schedule ini"""
+        if removed_groups:
+            remaining = self.schedule_groups(schedule_id)
+            for group_id in removed_groups - remaining:
+                self.add(group_id, 'schedule_count', -1)
+
+    def schedule_removed(self, schedule_id):
+        """pre_delete / pre_clear: semua grup yang tercakup kehilangan satu schedule"""
+        for group_id in self.schedule_groups(schedule_id):
+            self.add(group_id, 'schedule_count', -1)
+
+    def _shared_schedules(self, device_id, group_id, schedule_ids):
+        from .models import Schedule
+
+        return Schedule.publish_to.through.objects.filter(
+            schedule_id__in=schedule_ids, device__group_id=group_id
+        ).exclude(device_id=device_id).values('schedule_id').distinct().count()
+
+    def device_schedules_added(self, device_id, group_id, schedule_ids):
+        """Reverse post_add (device.published_schedules.add)"""
+        if group_id and schedule_ids:
+            shared = self._shared_schedules(device_id, group_id, schedule_ids)
+            self.add(group_id, 'schedule_count', len(schedule_ids) - shared)
+
+    def device_schedules_removed(self, device_id, group_id, schedule_ids):
+        """Reverse post_remove (device.published_schedules.remove)"""
+        if group_id and schedule_ids:
+            shared = self._shared_schedules(device_id, group_id, schedule_ids)
+            self.add(group_id, 'schedule_count', -(len(schedule_ids) - shared))
+
+    def device_schedules_cleared(self, device_id, group_id):
+        """Reverse pre_clear (device.published_schedules.clear)"""
+        if group_id:
+            self.add(group_id, 'schedule_count', -self._exclusive_schedules(device_id, group_id))
+
+    # ------------------------------------------------------------------
+    # Rekonsiliasi
+    # ------------------------------------------------------------------
+
+    def reconcile(self, dry_run=False):
+        """
+        Hitung ulang semua counter dengan dua query agregat dan perbaiki yang
+        drift. Return list (group, field, stored, actual).
+        """
+        from .models import DeviceGroup, Schedule
+
+        actual_devices = dict(
+            DeviceGroup.objects.annotate(actual=Count('devices')).values_list('id', 'actual')
+        )
+        actual_schedules = dict(
+            Schedule.publish_to.through.objects.filter(device__group__isnull=False)
+            .values('device__group_id')
+            .annotate(actual=Count('schedule_id', distinct=True))
+            .values_list('device__group_id', 'actual')
+        )
+
+        drift = []
+        for group in DeviceGroup.objects.only('id', 'name', *COUNTER_FIELDS):
+            actual = {
+                'device_count': actual_devices.get(group.id, 0),
+                'schedule_count': actual_schedules.get(group.id, 0),
+            }
+            changed = {
+                field: value for field, value in actual.items() if getattr(group, field) != value
+            }
+            for field, value in changed.items():
+                drift.append((group, field, getattr(group, field), value))
+            if changed and not dry_run:
+                DeviceGroup.objects.filter(pk=group.pk).update(**changed)
+
+        if drift and not dry_run:
+            from .timeline import invalidate_group_timeline
+            invalidate_group_timeline(*{group.id for group, *_ in drift})
+            logger.warning(f"[COUNTERS] Reconciled {len(drift)} drifted group counters")
+        return drift
+
+
+group_counters = GroupCounters()
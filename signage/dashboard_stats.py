@@ -0,0 +1,181 @@
+"""
+Snapshot statistik dashboard.
+
+Semua angka dihitung dengan beberapa query agregat kondisional
+(``Count(filter=Q(...))``) yang jumlahnya tetap berapapun banyaknya content,
+device dan grup; ukuran folder upload dibaca dari FolderUsage
+(signage.storage_usage). Snapshot di-cache dengan TTL pendek
+(``DASHBOARD_CACHE_TTL``) sehingga page view dashboard cukup satu cache get.
+"""
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .recurrence import expand_occurrences
+from .storage_usage import source_tree_size, storage_usage
+
+DASHBOARD_CACHE_KEY = 'signage:dashboard'
+
+
+def _mb(size):
+    return round(size / (1024 * 1024), 2)
+
+
+def storage_percentage(size_mb, total_storage_mb=100):
+    if total_storage_mb == 0:
+        return 0
+    percentage = (size_mb / total_storage_mb) * 100
+    return min(round(percentage, 1), 100)
+
+
+def _lifecycle_counts(model, now):
+    return model.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(expiration_date__isnull=True) | Q(expiration_date__gt=now)),
+        expired=Count('id', filter=Q(expiration_date__lte=now)),
+    )
+
+
+def _group_status(online_percentage):
+    if online_percentage >= 75:
+        return 'online'
+    elif online_percentage >= 25:
+        return 'partial'
+    return 'offline'
+
+
+class DashboardStats:
+
+    def snapshot(self):
+        data = cache.get(DASHBOARD_CACHE_KEY)
+        if data is None:
+            data = self.build()
+            cache.set(DASHBOARD_CACHE_KEY, data, settings.SIGNAGE_SETTINGS.get('DASHBOARD_CACHE_TTL', 30))
+        return data
+
+    def invalidate(self):
+        cache.delete(DASHBOARD_CACHE_KEY)
+
+    def storage(self):
+        sizes = {
+            'frontend_size': _mb(source_tree_size(os.path.join(settings.BASE_DIR, 'signage'))),
+            'backend_size': _mb(source_tree_size(os.path.join(settings.BASE_DIR, 'signage_project'))),
+        }
+        uploads = storage_usage.usage('content_uploads', 'playlist_uploads')
+        sizes['content_uploads_size'] = _mb(uploads.get('content_uploads', 0))
+        sizes['playlist_uploads_size'] = _mb(uploads.get('playlist_uploads', 0))
+
+        sizes.update({
+            'frontend_percentage': storage_percentage(sizes['frontend_size']),
+            'backend_percentage': storage_percentage(sizes['backend_size']),
+            'content_percentage': storage_percentage(sizes['content_uploads_size']),
+            'playlist_percentage': storage_percentage(sizes['playlist_uploads_size']),
+        })
+        return sizes
+
+    def device_groups(self):
+        """Grup yang punya device dan schedule Published, dengan persentase online"""
+        from .models import DeviceGroup, ScheduleGroup
+
+        published = dict(
+            ScheduleGroup.objects.filter(publish_status='Published').values('group_id').annotate(
+                total=Count('id')
+            ).values_list('group_id', 'total')
+        )
+        groups = DeviceGroup.objects.annotate(
+            total_devices=Count('devices'),
+            online_devices=Count('devices', filter=Q(devices__is_online=True)),
+        ).values_list('id', 'name', 'total_devices', 'online_devices')
+
+        total_groups = 0
+        device_groups = []
+        for group_id, name, total_devices, online_devices in groups:
+            total_groups += 1
+            if not total_devices or not published.get(group_id):
+                continue
+            online_percentage = online_devices / total_devices * 100
+            device_groups.append({
+                'name': name,
+                'total_devices': total_devices,
+                'online_devices': online_devices,
+                'online_percentage': round(online_percentage),
+                'status_class': _group_status(online_percentage),
+                'total_schedules': published[group_id],
+            })
+        return total_groups, device_groups
+
+    def top_creator(self):
+        from .models import Content, Playlist
+
+        creator_stats = {}
+        for model, field in ((Content, 'content_count'), (Playlist, 'playlist_count')):
+            rows = model.objects.filter(creator__isnull=False).values_list(
+                'creator__username'
+            ).annotate(total=Count('id')).order_by('-total')
+            for username, total in rows:
+                creator_stats.setdefault(username, {'content_count': 0, 'playlist_count': 0})[field] = total
+
+        top_creator_username = None
+        max_total = 0
+        for username, stats in creator_stats.items():
+            total = stats['content_count'] + stats['playlist_count']
+            if total > max_total:
+                max_total = total
+                top_creator_username = username
+
+        return {
+            'username': top_creator_username or 'No creator',
+            'content_count': creator_stats.get(top_creator_username, {}).get('content_count', 0),
+            'playlist_count': creator_stats.get(top_creator_username, {}).get('playlist_count', 0)
+        }
+
+    def upcoming_schedules(self, now):
+        from .models import Schedule
+
+        today = now.date()
+        tomorrow = today + timedelta(days=1)
+        return [
+            schedule for schedule in expand_occurrences(
+                Schedule.objects.spanning(today, tomorrow).filter(
+                    publish_status='Published'
+                ).select_related('content', 'playlist'),
+                today, tomorrow
+            )
+            if schedule.playback_date == tomorrow or (schedule.playback_start and schedule.playback_start > now.time())
+        ][:3]
+
+    def build(self):
+        from .models import Content, Device, Playlist
+
+        now = timezone.localtime(timezone.now())
+        content = _lifecycle_counts(Content, now)
+        playlist = _lifecycle_counts(Playlist, now)
+        devices = Device.objects.aggregate(
+            total=Count('id'), online=Count('id', filter=Q(is_online=True))
+        )
+        total_device_group, device_groups = self.device_groups()
+
+        data = self.storage()
+        data.update({
+            'upcoming_schedules': self.upcoming_schedules(now),
+            'total_content': content['total'],
+            'content_active': content['active'],
+            'content_expired': content['expired'],
+            'total_playlist': playlist['total'],
+            'playlist_active': playlist['active'],
+            'playlist_expired': playlist['expired'],
+            'total_device': devices['total'],
+            'online_device': devices['online'],
+            'offline_device': devices['total'] - devices['online'],
+            'total_device_group': total_device_group,
+            'device_groups': device_groups,
+            'top_creator': self.top_creator(),
+        })
+        return data
+
+
+dashboard_stats = DashboardStats()
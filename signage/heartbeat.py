@@ -0,0 +1,255 @@
+"""
+Buffer write-behind untuk heartbeat device.
+
+Request biasa dan ``/device/ping/`` hanya mencatat heartbeat (ip, last_seen,
+resolusi, user agent) ke memory. Buffer di-flush secara periodik dengan satu
+UPDATE massal, sehingga biaya ping tidak lagi tumbuh sebanding jumlah device.
+Hanya IP yang benar-benar baru yang langsung ditulis ke database.
+
+Mapping IP -> id device di-cache per proses dan dibuang dari signal
+post_save/post_delete Device. Perubahan di proses lain tidak terlihat, jadi
+flush hanya meng-update baris yang id dan IP-nya masih cocok; IP yang tidak
+cocok di-resolve ulang (atau device-nya dibuat ulang) dan ditulis di flush
+berikutnya.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from .signals import device_status_changed
+
+logger = logging.getLogger(__name__)
+
+
+class HeartbeatBuffer:
+    """Kumpulkan heartbeat per IP dan tulis ke database secara batch"""
+
+    def __init__(self, flush_interval=None, max_buffer=None):
+        self._flush_interval = flush_interval
+        self._max_buffer = max_buffer
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._known = {}
+        self._last_flush = time.monotonic()
+        self._flusher = None
+        self.counters = {
+            'received': 0,
+            'coalesced': 0,
+            'written': 0,
+            'created': 0,
+            'reresolved': 0,
+            'flushes': 0,
+        }
+
+    @property
+    def flush_interval(self):
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return settings.SIGNAGE_SETTINGS.get('HEARTBEAT_FLUSH_INTERVAL', 10)
+
+    @property
+    def max_buffer(self):
+        if self._max_buffer is not None:
+            return self._max_buffer
+        return settings.SIGNAGE_SETTINGS.get('HEARTBEAT_MAX_BUFFER', 500)
+
+    def configure(self, flush_interval=None, max_buffer=None):
+        if flush_interval is not None:
+            self._flush_interval = flush_interval
+        if max_buffer is not None:
+            self._max_buffer = max_buffer
+
+    def record(self, ip_address, resolution=None, user_agent=None, name=None):
+        """
+        Catat heartbeat. Device baru langsung dibuat di database, device yang
+        sudah dikenal hanya masuk buffer. Return True jika device baru dibuat.
+        """
+        now = timezone.now()
+        with self._lock:
+            self.counters['received'] += 1
+            device_id = self._known.get(ip_address)
+
+        if device_id is None:
+            device_id, created = self._resolve(ip_address, now, resolution, user_agent, name)
+            if created:
+                return True
+
+        with self._lock:
+            pending = self._pending.get(ip_address)
+            if pending is None:
+                pending = self._pending[ip_address] = {'id': device_id}
+            else:
+                self.counters['coalesced'] += 1
+            pending['last_updated'] = now
+            if resolution:
+                pending['resolution'] = resolution
+            if user_agent:
+                pending['user_agent'] = user_agent
+            should_flush = (
+                len(self._pending) >= self.max_buffer
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+
+        self._ensure_flusher()
+        if should_flush:
+            self.flush()
+        return False
+
+    def _resolve(self, ip_address, now, resolution=None, user_agent=None, name=None):
+        """Cari device untuk IP, buat baru jika belum ada. Return (id, created)"""
+        from .models import Device
+
+        device = Device.objects.filter(ip_address=ip_address).only('id').first()
+        created = device is None
+        if created:
+            device = Device.objects.create(
+                ip_address=ip_address,
+                user_agent=user_agent or 'Unknown',
+                name=name or f"Device-{ip_address.replace('.', '-')}",
+                resolution=resolution or 'Unknown',
+                last_updated=now,
+                is_online=True,
+            )
+        with self._lock:
+            self._known[ip_address] = device.id
+            if created:
+                self.counters['created'] += 1
+        return device.id, created
+
+    def forget(self, ip_address, device_id=None):
+        """
+        Lupakan IP (mis. device dihapus) supaya heartbeat berikutnya dicek ulang.
+        Dengan `device_id`, mapping lain ke device itu (IP lama) ikut dibuang.
+        """
+        with self._lock:
+            self._known.pop(ip_address, None)
+            self._pending.pop(ip_address, None)
+            if device_id is None:
+                return
+            for known_ip, known_id in list(self._known.items()):
+                if known_id == device_id:
+                    del self._known[known_ip]
+            for pending_ip, item in list(self._pending.items()):
+                if item['id'] == device_id:
+                    del self._pending[pending_ip]
+
+    def flush(self):
+        """Tulis semua heartbeat di buffer dengan satu UPDATE massal"""
+        from .models import Device
+        from .timeline import invalidate_device_snapshot
+
+        with self._flush_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = {}
+                self._last_flush = time.monotonic()
+            if not pending:
+                return 0
+
+            last_updated_cases = []
+            resolution_cases = []
+            user_agent_cases = []
+            for item in pending.values():
+                last_updated_cases.append(When(pk=item['id'], then=Value(item['last_updated'])))
+                if 'resolution' in item:
+                    resolution_cases.append(When(pk=item['id'], then=Value(item['resolution'])))
+                if 'user_agent' in item:
+                    user_agent_cases.append(When(pk=item['id'], then=Value(item['user_agent'])))
+
+            updates = {
+                'is_online': True,
+                'last_updated': Case(*last_updated_cases, default=F('last_updated')),
+            }
+            if resolution_cases:
+                updates['resolution'] = Case(*resolution_cases, default=F('resolution'))
+            if user_agent_cases:
+                updates['user_agent'] = Case(*user_agent_cases, default=F('user_agent'))
+
+            # id dari _known bisa basi (device dihapus atau IP-nya diganti di proses lain)
+            devices = Device.objects.filter(
+                pk__in=[item['id'] for item in pending.values()],
+                ip_address__in=list(pending),
+            )
+            stale = {}
+            try:
+                came_online = list(devices.filter(is_online=False).values_list('pk', flat=True))
+                written = devices.update(**updates)
+                if written != len(pending):
+                    matched = set(devices.values_list('pk', 'ip_address'))
+                    stale = {
+                        ip_address: item for ip_address, item in pending.items()
+                        if (item['id'], ip_address) not in matched
+                    }
+            except Exception as e:
+                logger.error(f"Error flushing {len(pending)} heartbeats: {str(e)}")
+                with self._lock:
+                    for ip_address, item in pending.items():
+                        self._pending.setdefault(ip_address, item)
+                return 0
+
+            with self._lock:
+                self.counters['written'] += written
+                self.counters['flushes'] += 1
+
+            if stale:
+                self._requeue_stale(stale)
+            if came_online:
+                device_status_changed.send(sender=Device, device_ids=came_online, is_online=True)
+            invalidate_device_snapshot(*[
+                ip_address for ip_address, item in pending.items()
+                if 'resolution' in item and ip_address not in stale
+            ])
+            logger.debug(f"Flushed {written} heartbeats")
+            return written
+
+    def _requeue_stale(self, stale):
+        """Resolve ulang IP yang id-nya basi; heartbeat-nya ditulis di flush berikutnya"""
+        for ip_address, item in stale.items():
+            with self._lock:
+                self._known.pop(ip_address, None)
+            try:
+                device_id, created = self._resolve(
+                    ip_address, item['last_updated'], item.get('resolution'), item.get('user_agent')
+                )
+            except Exception as e:
+                logger.error(f"Error resolving heartbeat device for {ip_address}: {str(e)}")
+                continue
+            with self._lock:
+                self.counters['reresolved'] += 1
+                if not created:
+                    self._pending.setdefault(ip_address, dict(item))['id'] = device_id
+        logger.info(f"Re-resolved {len(stale)} heartbeats with stale device ids")
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, pending=len(self._pending), known=len(self._known))
+
+    def _ensure_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._flusher = threading.Thread(target=self._run_flusher, name='heartbeat-flusher', daemon=True)
+            self._flusher.start()
+
+    def _run_flusher(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Heartbeat flusher error: {str(e)}")
+            finally:
+                close_old_connections()
+
+
+heartbeat_buffer = HeartbeatBuffer()
+atexit.register(heartbeat_buffer.flush)
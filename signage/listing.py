@@ -0,0 +1,259 @@
+"""
+Listing dengan keyset pagination untuk halaman content, playlist, recycle bin
+dan device.
+
+Setiap listing punya whitelist sort key yang dipetakan ke kolom dengan
+composite index ``(kolom..., id)``. Halaman diambil dengan
+``WHERE (kolom, id) > cursor ORDER BY kolom, id LIMIT page_size + 1`` sehingga
+biaya per halaman konstan berapapun posisinya, dan template hanya merender
+(dan memanggil ``file_details()``) untuk baris di halaman itu. Total baris
+dihitung exact sampai ``LISTING_COUNT_EXACT_LIMIT``; di atas itu dipakai
+estimasi planner (Postgres) supaya tidak ada COUNT(*) penuh per request.
+"""
+import base64
+import json
+import logging
+from datetime import date, datetime
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import F, Q
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return settings.SIGNAGE_SETTINGS.get(name, default)
+
+
+class Listing:
+    """
+    Definisi satu listing: sorts = {sort key: (field, ...)}; field yang bisa
+    NULL ditulis di `nullable` dan selalu diurutkan NULL di akhir.
+    """
+
+    def __init__(self, sorts, default_sort, default_order='desc', nullable=()):
+        self.sorts = sorts
+        self.default_sort = default_sort
+        self.default_order = default_order
+        self.nullable = set(nullable)
+
+    def fields(self, sort):
+        return tuple(self.sorts[sort]) + ('id',)
+
+    def paginate(self, request, queryset):
+        sort = request.GET.get('sort') or self.default_sort
+        if sort not in self.sorts:
+            sort = self.default_sort
+        order = request.GET.get('order') or self.default_order
+        if order not in ('asc', 'desc'):
+            order = self.default_order
+        return Page(self, queryset, sort, order, request.GET)
+
+    # --- keyset ---
+
+    def _order_by(self, fields, descending, backwards=False):
+        """ORDER BY halaman; backwards membalik arah (dan posisi NULL) untuk halaman prev"""
+        ordering = []
+        for field in fields:
+            nulls = {}
+            if field in self.nullable:
+                # NULL selalu di akhir arah maju, jadi di awal saat mundur
+                nulls = {'nulls_first': True} if backwards else {'nulls_last': True}
+            if descending != backwards:
+                ordering.append(F(field).desc(**nulls))
+            else:
+                ordering.append(F(field).asc(**nulls))
+        return ordering
+
+    def _after(self, field, value, descending):
+        """Baris yang datang setelah `value` pada satu kolom (NULL di akhir)"""
+        if value is None:
+            return None
+        condition = Q(**{f"{field}__lt" if descending else f"{field}__gt": value})
+        if field in self.nullable:
+            condition |= Q(**{f"{field}__isnull": True})
+        return condition
+
+    def _before(self, field, value, descending):
+        if value is None:
+            return Q(**{f"{field}__isnull": False})
+        return Q(**{f"{field}__gt" if descending else f"{field}__lt": value})
+
+    def _equal(self, field, value):
+        if value is None:
+            return Q(**{f"{field}__isnull": True})
+        return Q(**{field: value})
+
+    def keyset_filter(self, fields, values, descending, backwards=False):
+        """(f1, f2, ..., id) > values secara leksikografis (atau < jika backwards)"""
+        compare = self._before if backwards else self._after
+        condition = None
+        prefix = Q()
+        for field, value in zip(fields, values):
+            step = compare(field, value, descending)
+            if step is not None:
+                step = prefix & step
+                condition = step if condition is None else condition | step
+            prefix &= self._equal(field, value)
+        return condition if condition is not None else Q(pk__in=[])
+
+
+def encode_cursor(values):
+    payload = json.dumps([
+        value.isoformat() if isinstance(value, (date, datetime)) else value for value in values
+    ], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, length):
+    """List nilai kolom dari cursor; None jika cursor rusak atau tidak cocok"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(values, list) or len(values) != length:
+        return None
+    return values
+
+
+def estimate_count(queryset):
+    """(jumlah, exact) dengan COUNT dibatasi LISTING_COUNT_EXACT_LIMIT baris"""
+    limit = _setting('LISTING_COUNT_EXACT_LIMIT', 1000)
+    queryset = queryset.order_by()
+    count = queryset[:limit + 1].count()
+    if count <= limit:
+        return count, True
+
+    if connections[queryset.db].vendor == 'postgresql':
+        try:
+            plan = json.loads(queryset.explain(format='json'))
+            return max(count, int(plan[0]['Plan']['Plan Rows'])), False
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            logger.debug(f"[LISTING] Planner estimate unavailable: {e}")
+    return count, False
+
+
+class Page:
+    """Satu halaman listing beserta cursor prev/next dan query string-nya"""
+
+    def __init__(self, listing, queryset, sort, order, params):
+        self.sort = sort
+        self.order = order
+        self.page_size = self._page_size(params.get('per_page'))
+        self.params = params
+
+        fields = listing.fields(sort)
+        descending = order == 'desc'
+        self.total, self.total_exact = estimate_count(queryset)
+
+        after = decode_cursor(params.get('after', ''), len(fields))
+        before = decode_cursor(params.get('before', ''), len(fields))
+        backwards = before is not None and after is None
+        cursor = before if backwards else after
+
+        page = queryset
+        if cursor is not None:
+            page = page.filter(listing.keyset_filter(fields, cursor, descending, backwards))
+        page = page.order_by(*listing._order_by(fields, descending, backwards))
+        rows = list(page[:self.page_size + 1])
+
+        more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if backwards:
+            rows.reverse()
+            self.has_prev, self.has_next = more, True
+        else:
+            self.has_prev, self.has_next = cursor is not None, more
+        self.object_list = rows
+
+        self.first_cursor = self._cursor(rows[0], fields) if rows else ''
+        self.last_cursor = self._cursor(rows[-1], fields) if rows else ''
+
+    @staticmethod
+    def _page_size(value):
+        default = _setting('LISTING_PAGE_SIZE', 25)
+        maximum = _setting('LISTING_MAX_PAGE_SIZE', 100)
+        try:
+            size = int(value) if value else default
+        except (TypeError, ValueError):
+            size = default
+        return max(1, min(size, maximum))
+
+    @staticmethod
+    def _cursor(row, fields):
+        values = []
+        for field in fields:
+            value = row
+            for part in field.split('__'):
+                value = getattr(value, part, None) if value is not None else None
+            values.append(value)
+        return encode_cursor(values)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def _query(self, **extra):
+        params = self.params.copy()
+        for key in ('after', 'before'):
+            params.pop(key, None)
+        params['sort'] = self.sort
+        params['order'] = self.order
+        params['per_page'] = str(self.page_size)
+        for key, value in extra.items():
+            params[key] = value
+        return params.urlencode()
+
+    @property
+    def first_query(self):
+        return self._query()
+
+    @property
+    def next_query(self):
+        return self._query(after=self.last_cursor) if self.has_next else ''
+
+    @property
+    def prev_query(self):
+        return self._query(before=self.first_cursor) if self.has_prev else ''
+
+    @property
+    def page_sizes(self):
+        return sorted({10, 25, 50, 100, self.page_size})
+
+
+CONTENT_LISTING = Listing(
+    sorts={
+        'date_modified': ('date_modified',),
+        'content_name': ('content_name',),
+        'expiration_date': ('expiration_date',),
+        'creator__username': ('creator__username',),
+        'size_bytes': ('size_bytes',),
+    },
+    default_sort='date_modified',
+    nullable=('expiration_date', 'creator__username', 'size_bytes'),
+)
+
+PLAYLIST_LISTING = Listing(
+    sorts={
+        'date_modified': ('date_modified',),
+        'playlist_name': ('playlist_name',),
+        'expiration_date': ('expiration_date',),
+        'creator__username': ('creator__username',),
+        'size_bytes': ('size_bytes',),
+    },
+    default_sort='date_modified',
+    nullable=('expiration_date', 'creator__username', 'size_bytes'),
+)
+
+DEVICE_LISTING = Listing(
+    sorts={
+        'status': ('is_online', 'last_updated'),
+        'name': ('name',),
+        'last_updated': ('last_updated',),
+    },
+    default_sort='status',
+)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from signage.media_metadata import backfill_media_columns
+from signage.models import Content, Playlist
+
+class Command(BaseCommand):
+    help = "Isi kolom size_bytes/media_kind/mime_type/width/height/duration Content dan Playlist lama"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Hitung ulang semua baris, bukan hanya yang kosong")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        for model in (Content, Playlist):
+            updated, missing = backfill_media_columns(
+                model, force=options['force'], batch_size=options['batch_size']
+            )
+            self.stdout.write(self.style.SUCCESS(
+                f"{model._meta.verbose_name_plural.title()}: updated {updated} rows"
+            ))
+            if missing:
+                self.stdout.write(self.style.WARNING(f"  {missing} files not found on disk"))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from signage.media_metadata import backfill_media_metadata
+
+class Command(BaseCommand):
+    help = "Probe file media yang belum punya MediaMetadata atau sudah berubah, dan hapus metadata file yang hilang"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Probe ulang semua file, bukan hanya yang berubah")
+
+    def handle(self, *args, **options):
+        checked, missing = backfill_media_metadata(force=options['force'])
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} media files"))
+        if missing:
+            self.stdout.write(self.style.WARNING(f"  {missing} files not found on disk"))
@@ -0,0 +1,121 @@
+import json
+import platform
+import subprocess
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from signage import benchmark
+
+class Command(BaseCommand):
+    help = "Seed armada display sintetis dan ukur latency, query per request dan throughput display/ping"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--groups', type=int, default=10)
+        parser.add_argument('--devices-per-group', type=int, default=100)
+        parser.add_argument('--contents', type=int, default=50)
+        parser.add_argument('--schedules-per-group', type=int, default=48)
+        parser.add_argument('--requests', type=int, default=5000, help="Jumlah request per runner")
+        parser.add_argument('--warmup', type=int, default=100, help="Request pemanasan per runner (tidak dihitung)")
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--ping-ratio', type=float, default=0.5, help="Porsi request /device/ping/")
+        parser.add_argument('--random-seed', type=int, default=0)
+        parser.add_argument(
+            '--runner', action='append', choices=['client', 'wsgi', 'url'],
+            help="client (test client), wsgi (server WSGI lokal), url (server eksternal, butuh --url); default client"
+        )
+        parser.add_argument('--url', help="Base URL server yang memakai signage.benchmark_server")
+        parser.add_argument('--no-seed', action='store_true', help="Pakai data benchmark yang sudah ada")
+        parser.add_argument('--keep-data', action='store_true', help="Jangan hapus data benchmark setelah selesai")
+        parser.add_argument('--output', help="Tulis hasil JSON ke file ini")
+
+    def handle(self, *args, **options):
+        runners = options['runner'] or ['client']
+        if 'url' in runners and not options['url']:
+            raise CommandError("--runner url requires --url")
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--requests and --concurrency must be positive")
+
+        if options['no_seed']:
+            ips = benchmark.seeded_ips()
+            if not ips:
+                raise CommandError("No benchmark data found; run without --no-seed first")
+        else:
+            benchmark.cleanup()
+            ips = benchmark.seed(
+                options['groups'], options['devices_per_group'],
+                options['contents'], options['schedules_per_group'],
+            )
+
+        plan = benchmark.build_plan(ips, options['requests'], options['ping_ratio'], options['random_seed'])
+        warmup = benchmark.build_plan(ips, options['warmup'], options['ping_ratio'], options['random_seed'] + 1)
+
+        results = {}
+        try:
+            for runner in runners:
+                self.stdout.write(f"Running {runner}: {len(plan)} requests, concurrency {options['concurrency']}")
+                results[runner] = self._run(runner, plan, warmup, options)
+                self._report(runner, results[runner])
+        finally:
+            if not options['keep_data']:
+                benchmark.cleanup()
+
+        payload = {
+            'timestamp': timezone.now().isoformat(),
+            'commit': self._commit(),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'debug': settings.DEBUG,
+            },
+            'parameters': {
+                key: options[key] for key in (
+                    'groups', 'devices_per_group', 'contents', 'schedules_per_group', 'requests',
+                    'warmup', 'concurrency', 'ping_ratio', 'random_seed',
+                )
+            },
+            'devices': len(ips),
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(payload, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {options['output']}"))
+        else:
+            self.stdout.write(json.dumps(payload, indent=2))
+
+    def _run(self, runner, plan, warmup, options):
+        concurrency = options['concurrency']
+        if runner == 'client':
+            benchmark.run_client(warmup, concurrency)
+            samples, elapsed = benchmark.run_client(plan, concurrency)
+        elif runner == 'wsgi':
+            with benchmark.LocalServer() as server:
+                benchmark.run_http(warmup, concurrency, server.url)
+                samples, elapsed = benchmark.run_http(plan, concurrency, server.url)
+        else:
+            benchmark.run_http(warmup, concurrency, options['url'])
+            samples, elapsed = benchmark.run_http(plan, concurrency, options['url'])
+        return benchmark.summarize(samples, elapsed)
+
+    def _report(self, runner, summary):
+        for name, stats in [('all', summary)] + list(summary['endpoints'].items()):
+            latency = stats['latency_ms']
+            self.stdout.write(
+                f"  {runner}/{name}: {stats['requests']} req, {stats['errors']} errors, "
+                f"p50 {latency['p50']} ms, p95 {latency['p95']} ms, p99 {latency['p99']} ms, "
+                f"{stats['queries_per_request']['mean']} queries/req, {stats['throughput_rps']} req/s"
+            )
+
+    def _commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
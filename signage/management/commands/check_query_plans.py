@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from signage import query_plans
+
+class Command(BaseCommand):
+    help = "EXPLAIN query Schedule yang sering dipakai dan gagal jika ada yang memakai sequential scan"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=2000, help="Schedule sintetis per grup (0 = pakai data yang ada)")
+        parser.add_argument('--groups', type=int, default=5, help="Jumlah grup sintetis")
+        parser.add_argument('--query', action='append', choices=sorted(query_plans.HOT_QUERIES), help="Hanya cek query ini")
+        parser.add_argument('--show-plan', action='store_true', help="Tampilkan SQL dan plan setiap query")
+
+    def handle(self, *args, **options):
+        # Data seed dan perubahan setting planner tidak pernah di-commit
+        with transaction.atomic():
+            try:
+                if options['seed']:
+                    query_plans.seed(options['seed'], options['groups'])
+                results = query_plans.check(options['query'])
+            except NotImplementedError as e:
+                raise CommandError(str(e))
+            finally:
+                transaction.set_rollback(True)
+
+        failed = [result for result in results if not result.ok]
+        for result in results:
+            if result.ok:
+                self.stdout.write(f"{result.name}: ok")
+            else:
+                self.stdout.write(self.style.ERROR(
+                    f"{result.name}: sequential scan on {', '.join(sorted(set(result.seq_scans)))}"
+                ))
+            if options['show_plan'] or not result.ok:
+                self.stdout.write(result.sql)
+                self.stdout.write(result.plan)
+
+        if failed:
+            raise CommandError(f"{len(failed)} of {len(results)} hot queries use sequential scans")
+        self.stdout.write(self.style.SUCCESS(f"All {len(results)} hot queries use indexes"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from signage.schedule_groups import schedule_groups
+
+class Command(BaseCommand):
+    help = "Bangun ulang tabel ScheduleGroup dari publish_to dan perbaiki baris yang drift"
+
+    def handle(self, *args, **options):
+        added, removed = schedule_groups.rebuild()
+        if added or removed:
+            self.stdout.write(self.style.SUCCESS(f"Added {added} and removed {removed} schedule-group rows"))
+        else:
+            self.stdout.write(self.style.SUCCESS("ScheduleGroup table is consistent"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from signage.counters import group_counters
+
+class Command(BaseCommand):
+    help = "Hitung ulang device_count dan schedule_count DeviceGroup dan perbaiki yang drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Hanya tampilkan drift tanpa menyimpan")
+
+    def handle(self, *args, **options):
+        drift = group_counters.reconcile(dry_run=options['dry_run'])
+        for group, field, stored, actual in drift:
+            self.stdout.write(f"{group.name}: {field} {stored} -> {actual}")
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("All group counters are consistent"))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"{len(drift)} drifted counters found (dry run)"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {len(drift)} drifted counters"))
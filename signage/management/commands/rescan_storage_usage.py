@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from signage.storage_usage import UPLOAD_FOLDERS, storage_usage
+
+class Command(BaseCommand):
+    help = "Hitung ulang pemakaian storage folder upload dari disk (FolderUsage)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('folders', nargs='*', help=f"Folder di MEDIA_ROOT (default: {', '.join(UPLOAD_FOLDERS)})")
+
+    def handle(self, *args, **options):
+        usage = storage_usage.rescan(*options['folders'])
+        for folder, size in usage.items():
+            self.stdout.write(f"{folder}: {round(size / (1024 * 1024), 2)} MB")
+        self.stdout.write(self.style.SUCCESS(f"Rescanned {len(usage)} folders"))
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from signage.transcode import claim_next_job, requeue_stale_jobs, run_job
+
+class Command(BaseCommand):
+    help = "Jalankan worker lokal yang mengerjakan antrian TranscodeJob"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Kerjakan semua job queued lalu berhenti")
+        parser.add_argument('--poll-interval', type=float, default=2.0, help="Jeda cek antrian saat kosong (detik)")
+        parser.add_argument('--stale-minutes', type=int, default=60, help="Job running lebih lama dari ini dikembalikan ke antrian")
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_jobs(options['stale_minutes'])
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale jobs")
+
+        self.stdout.write("Transcode worker running, press Ctrl+C to stop")
+        try:
+            while True:
+                close_old_connections()
+                job = claim_next_job()
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                self.stdout.write(f"Running {job}")
+                if run_job(job):
+                    self.stdout.write(self.style.SUCCESS(f"Job #{job.pk} done"))
+                else:
+                    self.stdout.write(self.style.ERROR(f"Job #{job.pk} failed"))
+        except KeyboardInterrupt:
+            self.stdout.write("Transcode worker stopped")
@@ -0,0 +1,30 @@
+
+from django.core.management.base import BaseCommand
+
+from signage.sweeper import offline_sweeper, sweep_offline_devices
+
+class Command(BaseCommand):
+    help = "Tandai device yang tidak mengirim heartbeat sebagai offline"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Jalan terus dan sweep setiap --interval detik")
+        parser.add_argument('--interval', type=int, default=None, help="Jeda antar sweep dalam mode loop (detik)")
+        parser.add_argument('--threshold', type=int, default=None, help="Batas detik tanpa heartbeat sebelum offline")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            count = sweep_offline_devices(threshold=options['threshold'], batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f"Marked {count} devices as offline"))
+            return
+
+        self.stdout.write("Offline sweeper running, press Ctrl+C to stop")
+        try:
+            offline_sweeper.run_forever(
+                interval=options['interval'],
+                threshold=options['threshold'],
+                batch_size=options['batch_size'],
+            )
+        except KeyboardInterrupt:
+            offline_sweeper.stop()
+            self.stdout.write("Offline sweeper stopped")
@@ -0,0 +1,332 @@
+"""
+Metadata media (dimensi, durasi, codec, bitrate, hash) yang disimpan di tabel
+MediaMetadata.
+
+Probe PIL/ffprobe hanya dijalankan saat file baru disimpan (upload, transcode,
+rendition) dan oleh command ``backfill_media_metadata`` (file lama atau yang
+mtime/ukurannya berubah). Jalur display cukup membaca cache atau satu lookup
+ber-index berdasarkan path, tanpa subprocess dan tanpa menulis ke database:
+file yang hilang atau belum di-probe di-cache sebentar
+(MEDIA_METADATA_MISS_TTL) supaya poll berikutnya tidak query lagi.
+"""
+import json
+import logging
+import mimetypes
+import os
+import subprocess
+
+from django.conf import settings
+from django.core.cache import cache
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+METADATA_CACHE_PREFIX = 'signage:media'
+MISSING = 'missing'
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
+VIDEO_EXTENSIONS = ['.mp4', '.avi', '.mov', '.mkv', '.webm', '.wmv', '.flv']
+
+COMMON_RESOLUTIONS = [
+    (1920, 1080),  # Full HD
+    (1366, 768),   # HD
+    (3840, 2160),  # 4K
+    (2560, 1440),  # 2K
+]
+
+METADATA_FIELDS = [
+    'path', 'media_kind', 'width', 'height', 'duration', 'video_codec', 'audio_codec',
+    'has_audio', 'bitrate', 'file_size', 'mtime', 'content_hash', 'optimized',
+]
+
+
+def _cache_key(name):
+    return f"{METADATA_CACHE_PREFIX}:{name}"
+
+
+def _miss_ttl():
+    return settings.SIGNAGE_SETTINGS.get('MEDIA_METADATA_MISS_TTL', 60)
+
+
+def media_name_from_url(url):
+    """'/media/content_uploads/a.mp4' -> 'content_uploads/a.mp4', None jika bukan file media"""
+    if not url or not url.startswith(settings.MEDIA_URL):
+        return None
+    return url[len(settings.MEDIA_URL):]
+
+
+def media_kind_for(name):
+    ext = os.path.splitext(name)[1].lower()
+    if ext in IMAGE_EXTENSIONS:
+        return 'image'
+    if ext in VIDEO_EXTENSIONS:
+        return 'video'
+    return 'other'
+
+
+def is_optimized(media_kind, width, height):
+    """Resolusi mendekati resolusi layar umum atau aspect ratio layar (16:9, 4:3 untuk gambar)"""
+    if not width or not height:
+        return False
+
+    for res_width, res_height in COMMON_RESOLUTIONS:
+        if abs(width - res_width) <= 50 and abs(height - res_height) <= 50:
+            return True
+
+    aspect = width / height
+    aspects = [16 / 9, 4 / 3] if media_kind == 'image' else [16 / 9]
+    return any(abs(aspect - target) <= 0.1 for target in aspects)
+
+
+def _probe_image(full_path):
+    with Image.open(full_path) as img:
+        width, height = img.size
+    return {'width': width, 'height': height}
+
+
+def _probe_video(full_path):
+    cmd = [
+        'ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams',
+        full_path
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    if result.returncode != 0:
+        raise ValueError(f"ffprobe failed for {full_path}")
+
+    info = json.loads(result.stdout)
+    probed = {'has_audio': False}
+    for stream in info.get('streams', []):
+        if stream.get('codec_type') == 'video' and 'width' not in probed:
+            probed['width'] = stream.get('width')
+            probed['height'] = stream.get('height')
+            probed['video_codec'] = stream.get('codec_name', '')
+        elif stream.get('codec_type') == 'audio' and not probed['has_audio']:
+            probed['has_audio'] = True
+            probed['audio_codec'] = stream.get('codec_name', '')
+
+    fmt = info.get('format', {})
+    if fmt.get('duration'):
+        probed['duration'] = float(fmt['duration'])
+    if fmt.get('bit_rate'):
+        probed['bitrate'] = int(fmt['bit_rate'])
+    return probed
+
+
+def _as_dict(metadata):
+    return {field: getattr(metadata, field) for field in METADATA_FIELDS}
+
+
+def _stat_values(name, stat):
+    """Kolom yang bisa diisi tanpa probe"""
+    return {
+        'media_kind': media_kind_for(name),
+        'width': None,
+        'height': None,
+        'duration': None,
+        'video_codec': '',
+        'audio_codec': '',
+        'has_audio': False,
+        'bitrate': None,
+        'file_size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'content_hash': '',
+    }
+
+
+def refresh_metadata(name, force=False):
+    """
+    Pastikan MediaMetadata untuk file `name` (relatif terhadap MEDIA_ROOT)
+    up to date. Probe hanya dijalankan jika belum ada atau mtime/ukuran berubah.
+    Return dict metadata, atau None jika file tidak ada.
+    """
+    from .models import MediaMetadata
+    from .rendition_cache import rendition_cache
+
+    full_path = os.path.join(str(settings.MEDIA_ROOT), name)
+    try:
+        stat = os.stat(full_path)
+    except FileNotFoundError:
+        forget_metadata(name)
+        return None
+
+    metadata = MediaMetadata.objects.filter(path=name).first()
+    if (not force and metadata is not None
+            and metadata.mtime == stat.st_mtime and metadata.file_size == stat.st_size):
+        data = _as_dict(metadata)
+        cache.set(_cache_key(name), data)
+        return data
+
+    values = _stat_values(name, stat)
+    media_kind = values['media_kind']
+    try:
+        if media_kind == 'image':
+            values.update(_probe_image(full_path))
+        elif media_kind == 'video':
+            values.update(_probe_video(full_path))
+        values['content_hash'] = rendition_cache.source_hash(full_path)
+    except Exception as e:
+        logger.warning(f"[MEDIA_INFO] Probe failed for {name}: {str(e)}")
+    values['optimized'] = is_optimized(media_kind, values['width'], values['height'])
+
+    metadata, _ = MediaMetadata.objects.update_or_create(path=name, defaults=values)
+    sync_media_columns(name, values)
+    data = _as_dict(metadata)
+    cache.set(_cache_key(name), data)
+    logger.debug(f"[MEDIA_INFO] Refreshed {name}: {values['width']}x{values['height']}")
+    return data
+
+
+def sync_media_columns(name, values):
+    """Salin hasil probe ke kolom Content/Playlist yang memakai file `name`"""
+    from .models import Content, Playlist
+
+    columns = {
+        'size_bytes': values['file_size'],
+        'width': values['width'],
+        'height': values['height'],
+        'duration': values['duration'],
+    }
+    for model in (Content, Playlist):
+        model.objects.filter(file=name).update(**columns)
+
+
+def get_media_metadata(name):
+    """
+    Metadata untuk display: cache, lalu lookup DB (divalidasi dengan mtime).
+    Tidak pernah probe atau menulis ke database. File yang belum di-probe
+    atau sudah berubah mendapat data os.stat saja, file yang hilang None;
+    keduanya di-cache selama MEDIA_METADATA_MISS_TTL.
+    """
+    from .models import MediaMetadata
+
+    if not name:
+        return None
+
+    key = _cache_key(name)
+    data = cache.get(key)
+    if data is not None:
+        return None if data == MISSING else data
+
+    metadata = MediaMetadata.objects.filter(path=name).first()
+    try:
+        stat = os.stat(os.path.join(str(settings.MEDIA_ROOT), name))
+    except FileNotFoundError:
+        cache.set(key, MISSING, _miss_ttl())
+        return None
+
+    if metadata is None or metadata.mtime != stat.st_mtime or metadata.file_size != stat.st_size:
+        data = dict(_stat_values(name, stat), path=name, optimized=False)
+        cache.set(key, data, _miss_ttl())
+        return data
+
+    data = _as_dict(metadata)
+    cache.set(key, data)
+    return data
+
+
+def backfill_media_metadata(force=False):
+    """
+    Probe file Content, Playlist dan rendition yang belum punya metadata atau
+    sudah berubah (refresh_metadata melewati yang masih sama), lalu hapus
+    metadata untuk file yang sudah tidak ada. Return (jumlah file dicek,
+    jumlah file yang hilang).
+    """
+    from .models import Content, ContentRendition, MediaMetadata, Playlist
+
+    names = set()
+    for model in (Content, Playlist, ContentRendition):
+        names.update(model.objects.exclude(file='').exclude(file__isnull=True).values_list('file', flat=True))
+
+    checked = missing = 0
+    for name in sorted(names):
+        if refresh_metadata(name, force=force) is None:
+            missing += 1
+        else:
+            checked += 1
+
+    media_root = str(settings.MEDIA_ROOT)
+    orphans = [
+        path for path in MediaMetadata.objects.values_list('path', flat=True).iterator()
+        if not os.path.exists(os.path.join(media_root, path))
+    ]
+    forget_metadata(*orphans)
+    return checked, missing
+
+
+MEDIA_COLUMNS = ['size_bytes', 'media_kind', 'mime_type', 'width', 'height', 'duration']
+
+
+def backfill_media_columns(model, force=False, batch_size=500):
+    """
+    Isi kolom media Content/Playlist lama dari MediaMetadata (probe sekali
+    jika belum ada). Memakai bulk_update sehingga date_modified tidak berubah.
+    Return (jumlah baris di-update, jumlah file yang tidak ditemukan).
+    """
+    from django.db.models import Q
+    from .models import media_kind_from_name
+
+    rows = model.objects.order_by('pk').only('pk', 'file')
+    if not force:
+        rows = rows.filter(Q(size_bytes__isnull=True) | Q(media_kind=''))
+
+    updated = missing = 0
+    batch = []
+    for row in rows.iterator(chunk_size=batch_size):
+        name = row.file.name if row.file else ''
+        metadata = refresh_metadata(name) if name else None
+        if name and metadata is None:
+            missing += 1
+
+        row.media_kind = media_kind_from_name(name) if name else ''
+        row.mime_type = (mimetypes.guess_type(name)[0] or '') if name else ''
+        row.size_bytes = metadata['file_size'] if metadata else None
+        row.width = metadata['width'] if metadata else None
+        row.height = metadata['height'] if metadata else None
+        row.duration = metadata['duration'] if metadata else None
+        batch.append(row)
+
+        if len(batch) >= batch_size:
+            model.objects.bulk_update(batch, MEDIA_COLUMNS)
+            updated += len(batch)
+            batch = []
+
+    if batch:
+        model.objects.bulk_update(batch, MEDIA_COLUMNS)
+        updated += len(batch)
+    return updated, missing
+
+
+def forget_metadata(*names):
+    from .models import MediaMetadata
+
+    names = [name for name in names if name]
+    if not names:
+        return
+    MediaMetadata.objects.filter(path__in=names).delete()
+    cache.delete_many([_cache_key(name) for name in names])
+
+
+def build_media_info(metadata):
+    """Bentuk dict media_info yang dipakai template display"""
+    info = {
+        'dimensions': None,
+        'optimized': False,
+        'aspect_ratio': None,
+        'file_size': None
+    }
+    if not metadata:
+        return info
+
+    info['file_size'] = metadata['file_size']
+    info['optimized'] = metadata['optimized']
+    if metadata['width'] and metadata['height']:
+        info['dimensions'] = {'width': metadata['width'], 'height': metadata['height']}
+        info['aspect_ratio'] = metadata['width'] / metadata['height']
+    elif metadata['media_kind'] == 'video':
+        # ffprobe tidak tersedia saat probe: anggap resolusi video umum
+        info['dimensions'] = {'width': 1920, 'height': 1080}
+        info['aspect_ratio'] = 16 / 9
+        info['optimized'] = True
+    if metadata['media_kind'] == 'video':
+        info['duration'] = metadata['duration']
+        info['has_audio'] = metadata['has_audio']
+    return info
@@ -0,0 +1,203 @@
+"""
+View untuk melayani file di MEDIA_ROOT (pengganti ``static()``).
+
+Mendukung:
+- Range request tunggal (206) dan multi-range (multipart/byteranges), 416
+  untuk range yang tidak valid, serta If-Range.
+- ETag strong dari content hash MediaMetadata, Last-Modified, dan revalidasi
+  304 lewat If-None-Match / If-Modified-Since.
+- Cache-Control immutable untuk URL yang sudah di-versi (``?v=<hash>``) dan
+  file rendition cache yang namanya sudah berupa hash.
+- Zero-copy: response penuh memakai FileResponse (wsgi.file_wrapper /
+  sendfile), atau diserahkan ke web server lewat MEDIA_SENDFILE_HEADER
+  (mis. X-Accel-Redirect untuk nginx, X-Sendfile untuk Apache).
+"""
+import mimetypes
+import os
+import re
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from .media_metadata import get_media_metadata
+
+CHUNK_SIZE = 64 * 1024
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+RANGE_RE = re.compile(r'^\s*(\d*)\s*-\s*(\d*)\s*$')
+
+
+def _etag_for(name, stat):
+    """ETag strong: content hash jika ada, selain itu ukuran + mtime"""
+    metadata = get_media_metadata(name)
+    if metadata and metadata.get('content_hash') and metadata['mtime'] == stat.st_mtime:
+        return f'"{metadata["content_hash"]}"'
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def _is_immutable(request, name, etag):
+    version = request.GET.get('v')
+    if version and version == etag.strip('"'):
+        return True
+    return name.startswith('renditions/')
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return etag in [tag.strip().removeprefix('W/') for tag in header.split(',')]
+
+
+def parse_ranges(header, size):
+    """
+    Parse header Range menjadi list (start, end) inklusif.
+    Return None jika header tidak ada/tidak dikenali (kirim file penuh),
+    [] jika tidak ada range yang bisa dipenuhi (416).
+    """
+    if not header or not header.startswith('bytes='):
+        return None
+
+    ranges = []
+    for spec in header[len('bytes='):].split(','):
+        match = RANGE_RE.match(spec)
+        if not match:
+            return None
+        first, last = match.groups()
+        if first == '' and last == '':
+            return None
+        if first == '':
+            length = int(last)
+            if length == 0:
+                continue
+            start, end = max(0, size - length), size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+            if start > end or start >= size:
+                continue
+        ranges.append((start, end))
+    return ranges
+
+
+def _read_range(path, start, end):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _multipart_ranges(path, ranges, size, content_type, boundary):
+    for start, end in ranges:
+        yield (
+            f"\r\n--{boundary}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        ).encode()
+        yield from _read_range(path, start, end)
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+
+def _sendfile_response(name, content_type):
+    header = settings.SIGNAGE_SETTINGS.get('MEDIA_SENDFILE_HEADER')
+    if not header:
+        return None
+    response = HttpResponse(content_type=content_type)
+    if header.lower() == 'x-accel-redirect':
+        prefix = settings.SIGNAGE_SETTINGS.get('MEDIA_SENDFILE_PREFIX', '/protected-media/')
+        response[header] = prefix + name
+    else:
+        response[header] = os.path.join(str(settings.MEDIA_ROOT), name)
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """Layani satu file media dengan dukungan Range, ETag dan 304"""
+    try:
+        full_path = safe_join(str(settings.MEDIA_ROOT), path)
+    except (SuspiciousFileOperation, ValueError):
+        raise Http404("Invalid media path")
+    if not os.path.isfile(full_path):
+        raise Http404("Media file not found")
+
+    name = os.path.relpath(full_path, str(settings.MEDIA_ROOT)).replace(os.sep, '/')
+    stat = os.stat(full_path)
+    size = stat.st_size
+    etag = _etag_for(name, stat)
+    last_modified = http_date(stat.st_mtime)
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+
+    cache_control = (
+        f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+        if _is_immutable(request, name, etag) else 'public, max-age=0, must-revalidate'
+    )
+
+    def finish(response):
+        response['ETag'] = etag
+        response['Last-Modified'] = last_modified
+        response['Cache-Control'] = cache_control
+        response['Accept-Ranges'] = 'bytes'
+        return response
+
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        if _etag_matches(if_none_match, etag):
+            return finish(HttpResponseNotModified())
+    else:
+        since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        if since is not None and int(stat.st_mtime) <= since:
+            return finish(HttpResponseNotModified())
+
+    ranges = parse_ranges(request.META.get('HTTP_RANGE'), size)
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if ranges is not None and if_range:
+        if if_range.startswith('"') or if_range.startswith('W/'):
+            range_valid = if_range == etag
+        else:
+            range_valid = parse_http_date_safe(if_range) == int(stat.st_mtime)
+        if not range_valid:
+            ranges = None
+
+    if ranges is None:
+        sendfile = _sendfile_response(name, content_type)
+        if sendfile is not None:
+            return finish(sendfile)
+        if request.method == 'HEAD':
+            response = HttpResponse(content_type=content_type)
+        else:
+            response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+        response['Content-Length'] = str(size)
+        return finish(response)
+
+    if not ranges:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return finish(response)
+
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        body = _read_range(full_path, start, end) if request.method != 'HEAD' else iter(())
+        response = StreamingHttpResponse(body, status=206, content_type=content_type)
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(end - start + 1)
+        return finish(response)
+
+    boundary = uuid.uuid4().hex
+    body = _multipart_ranges(full_path, ranges, size, content_type, boundary)
+    response = StreamingHttpResponse(
+        body if request.method != 'HEAD' else iter(()),
+        status=206,
+        content_type=f'multipart/byteranges; boundary={boundary}'
+    )
+    return finish(response)
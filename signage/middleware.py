@@ -1,7 +1,8 @@
+from django.conf import settings
 from django.utils import timezone
 from django.http import JsonResponse
-from django.db import transaction
-from datetime import timedelta
+from .heartbeat import heartbeat_buffer
+from .sweeper import offline_sweeper
 from .models import Device, Schedule 
 import re
 import logging
@@ -78,10 +79,10 @@ class DigitalSignageMiddleware:
         now_time = timezone.localtime().time()
         today_date = timezone.localtime().date()
         
-        active_schedules = Schedule.objects.filter(
-            publish_to__group=device.group,
+        active_schedules = Schedule.objects.for_groups(
+            [device.group_id], today_date, today_date
+        ).with_recurring_ids(today_date, today_date).filter(
             publish_status='Published',
-            playback_date=today_date,
             playback_start__lte=now_time,
             playback_end__gte=now_time
         ).select_related('content', 'playlist').order_by('-playback_start')
@@ -92,7 +93,7 @@ class DigitalSignageMiddleware:
             
             return {
                 'name': schedule.schedule_name,
-                'date': schedule.playback_date.strftime("%Y-%m-%d"),
+                'date': today_date.strftime("%Y-%m-%d"),
                 'start_time': schedule.playback_start.strftime("%H:%M:%S"),
                 'end_time': schedule.playback_end.strftime("%H:%M:%S"),
                 'file_path': file_path,
@@ -109,10 +110,10 @@ class DigitalSignageMiddleware:
         now_time = timezone.localtime().time()
         today_date = timezone.localtime().date()
         
-        next_schedules = Schedule.objects.filter(
-            publish_to__group=device.group,
+        next_schedules = Schedule.objects.for_groups(
+            [device.group_id], today_date, today_date
+        ).with_recurring_ids(today_date, today_date).filter(
             publish_status='Published',
-            playback_date=today_date,
             playback_start__gt=now_time
         ).select_related('content', 'playlist').order_by('playback_start')
         
@@ -151,7 +152,6 @@ class DeviceTrackerMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
         self.ping_interval = 30 
-        self.offline_threshold = 60
         self.inject_paths = [
             '/device/',
             '/login/', 
@@ -165,6 +165,10 @@ class DeviceTrackerMiddleware:
     def __call__(self, request):
         start_time = timezone.now()
         
+        # Dinyalakan di sini (bukan AppConfig.ready) agar tidak jalan di management command
+        if settings.SIGNAGE_SETTINGS.get('OFFLINE_SWEEP_IN_PROCESS'):
+            offline_sweeper.start()
+        
         if request.path == '/device/ping/':
             return self._handle_ping_request(request)
         
@@ -175,10 +179,8 @@ class DeviceTrackerMiddleware:
         
         if self._should_inject_script(request.path, response):
             self._inject_script(response)
-        
-        if hash(request.path) % 10 == 0:
-            self._mark_offline_devices()
-            
+
+
         logger.debug(f"Request to {request.path} processed in {(timezone.now() - start_time).total_seconds():.3f}s")
         return response
 
@@ -198,29 +200,19 @@ class DeviceTrackerMiddleware:
         return any(path.startswith(p) for p in excluded_paths)
 
     def _handle_ping_request(self, request):
-        """Handle ping requests with thread safety"""
+        """Handle ping requests through the write-behind heartbeat buffer"""
         ip_address = request.META.get('REMOTE_ADDR', '0.0.0.0')
+        resolution = self._get_screen_resolution(request)
         
         try:
-            with transaction.atomic():
-                device, created = Device.objects.select_for_update().get_or_create(
-                    ip_address=ip_address,
-                    defaults={
-                        'last_updated': timezone.now(),
-                        'is_online': True
-                    }
-                )
-                
-                if not created:
-                    if (timezone.now() - device.last_updated).seconds >= self.ping_interval:
-                        device.last_updated = timezone.now()
-                        device.is_online = True
-                        device.save()
-                        logger.info(f"Ping from {ip_address} (updated)")
-                    else:
-                        logger.debug(f"Ping from {ip_address} (skipped, too frequent)")
-                else:
-                    logger.info(f"New device ping from {ip_address}")
+            created = heartbeat_buffer.record(
+                ip_address,
+                resolution=resolution if resolution != 'Unknown' else None,
+            )
+            if created:
+                logger.info(f"New device ping from {ip_address}")
+            else:
+                logger.debug(f"Ping from {ip_address} (buffered)")
                     
             return JsonResponse({'status': 'success', 'interval': self.ping_interval})
             
@@ -235,36 +227,11 @@ class DeviceTrackerMiddleware:
         user_agent = request.META.get('HTTP_USER_AGENT', 'Unknown')[:200]
         
         try:
-            with transaction.atomic():
-                device, created = Device.objects.select_for_update().get_or_create(
-                    ip_address=ip_address,
-                    defaults={
-                        'user_agent': user_agent,
-                        'name': f"Device-{ip_address.replace('.', '-')}",
-                        'resolution': resolution,
-                        'last_updated': timezone.now(),
-                        'is_online': True,
-                    }
-                )
-                
-                if not created:
-                    update_fields = {
-                        'last_updated': timezone.now(),
-                        'is_online': True
-                    }
-                    
-                    if resolution != 'Unknown' and device.resolution != resolution:
-                        update_fields['resolution'] = resolution
-                        logger.debug(f"Updated resolution for {ip_address} to {resolution}")
-                    
-                    if user_agent != device.user_agent:
-                        if len(user_agent) > 20 or user_agent.split()[0] != device.user_agent.split()[0]:
-                            update_fields['user_agent'] = user_agent
-                            logger.debug(f"Updated user agent for {ip_address}")
-                    
-                    if len(update_fields) > 2:
-                        Device.objects.filter(pk=device.pk).update(**update_fields)
-                        
+            heartbeat_buffer.record(
+                ip_address,
+                resolution=resolution if resolution != 'Unknown' else None,
+                user_agent=user_agent if user_agent != 'Unknown' else None,
+            )
         except Exception as e:
             logger.error(f"Error tracking device {ip_address}: {str(e)}")
 
@@ -358,18 +325,3 @@ class DeviceTrackerMiddleware:
                 )
             except Exception as e:
                 logger.error(f"Error injecting script: {str(e)}")
-
-    def _mark_offline_devices(self):
-        """Mark devices as offline if no ping received within threshold"""
-        try:
-            threshold = timezone.now() - timedelta(seconds=self.offline_threshold)
-            offline_count = Device.objects.filter(
-                last_updated__lt=threshold,
-                is_online=True
-            ).update(is_online=False)
-            
-            if offline_count > 0:
-                logger.info(f"Marked {offline_count} devices as offline")
-                
-        except Exception as e:
-            logger.error(f"Error marking offline devices: {str(e)}")
\ No newline at end of file
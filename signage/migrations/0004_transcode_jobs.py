@@ -0,0 +1,47 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signage', '0003_alter_content_supported_device_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='content',
+            name='status',
+            field=models.CharField(choices=[('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], db_index=True, default='ready', help_text='Status encode file (processing selama transcode job berjalan)', max_length=12),
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='status',
+            field=models.CharField(choices=[('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], db_index=True, default='ready', help_text='Status encode file (processing selama transcode job berjalan)', max_length=12),
+        ),
+        migrations.CreateModel(
+            name='TranscodeJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('content', 'Content'), ('playlist', 'Playlist')], max_length=10)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('progress', models.PositiveSmallIntegerField(default=0, help_text='Progress dalam persen')),
+                ('source_path', models.CharField(blank=True, help_text='File sumber sementara (untuk content)', max_length=500)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('content', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='transcode_jobs', to='signage.content')),
+                ('playlist', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='transcode_jobs', to='signage.playlist')),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='signage_tra_status_3f9ba6_idx')],
+            },
+        ),
+    ]
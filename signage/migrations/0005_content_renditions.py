@@ -0,0 +1,29 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signage', '0004_transcode_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentRendition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('file', models.FileField(upload_to='content_renditions/')),
+                ('date_created', models.DateTimeField(auto_now_add=True)),
+                ('content', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='renditions', to='signage.content')),
+            ],
+            options={
+                'ordering': ['width', 'height'],
+                'constraints': [models.UniqueConstraint(fields=('content', 'width', 'height'), name='unique_content_rendition')],
+            },
+        ),
+    ]
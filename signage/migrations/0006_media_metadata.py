@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signage', '0005_content_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaMetadata',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(help_text='Nama file relatif terhadap MEDIA_ROOT', max_length=500, unique=True)),
+                ('media_kind', models.CharField(choices=[('image', 'Image'), ('video', 'Video'), ('other', 'Other')], default='other', max_length=10)),
+                ('width', models.PositiveIntegerField(blank=True, null=True)),
+                ('height', models.PositiveIntegerField(blank=True, null=True)),
+                ('duration', models.FloatField(blank=True, help_text='Durasi dalam detik', null=True)),
+                ('video_codec', models.CharField(blank=True, max_length=30)),
+                ('audio_codec', models.CharField(blank=True, max_length=30)),
+                ('has_audio', models.BooleanField(default=False)),
+                ('bitrate', models.PositiveIntegerField(blank=True, help_text='Bitrate dalam bit/detik', null=True)),
+                ('file_size', models.BigIntegerField(default=0)),
+                ('mtime', models.FloatField(default=0)),
+                ('content_hash', models.CharField(blank=True, db_index=True, max_length=64)),
+                ('optimized', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Media Metadata',
+                'verbose_name_plural': 'Media Metadata',
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:41
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_recurrence_end(apps, schema_editor):
+    Schedule = apps.get_model('signage', 'Schedule')
+    Schedule.objects.update(recurrence_end=F('playback_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signage', '0006_media_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schedule',
+            name='recurrence',
+            field=models.CharField(blank=True, default='', help_text='RRULE pengulangan (kosong = sekali tayang pada playback_date)', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='schedule',
+            name='recurrence_end',
+            field=models.DateField(blank=True, editable=False, help_text='Tanggal kemunculan terakhir (sama dengan playback_date jika tidak berulang)', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['recurrence_end'], name='signage_sch_recurre_1c8a39_idx'),
+        ),
+        migrations.RunPython(fill_recurrence_end, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:47
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signage', '0007_schedule_recurrence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='content',
+            index=models.Index(fields=['date_modified', 'id'], name='signage_con_date_mo_91e688_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='content',
+            index=models.Index(fields=['content_name', 'id'], name='signage_con_content_3329bb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='content',
+            index=models.Index(fields=['expiration_date', 'id'], name='signage_con_expirat_67b58b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(fields=['is_online', 'last_updated', 'id'], name='signage_dev_is_onli_1b2982_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(fields=['name', 'id'], name='signage_dev_name_60003c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='device',
+            index=models.Index(fields=['last_updated', 'id'], name='signage_dev_last_up_1c38a6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playlist',
+            index=models.Index(fields=['date_modified', 'id'], name='signage_pla_date_mo_556354_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playlist',
+            index=models.Index(fields=['playlist_name', 'id'], name='signage_pla_playlis_01ed2a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playlist',
+            index=models.Index(fields=['expiration_date', 'id'], name='signage_pla_expirat_d4466b_idx'),
+        ),
+    ]
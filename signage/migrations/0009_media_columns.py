@@ -0,0 +1,91 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signage', '0008_listing_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='content',
+            name='duration',
+            field=models.FloatField(blank=True, db_index=True, editable=False, help_text='Durasi dalam detik', null=True),
+        ),
+        migrations.AddField(
+            model_name='content',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='content',
+            name='media_kind',
+            field=models.CharField(blank=True, choices=[('image', 'Image'), ('video', 'Video'), ('other', 'Other')], db_index=True, editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='content',
+            name='mime_type',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='content',
+            name='size_bytes',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='content',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='duration',
+            field=models.FloatField(blank=True, db_index=True, editable=False, help_text='Durasi dalam detik', null=True),
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='media_kind',
+            field=models.CharField(blank=True, choices=[('image', 'Image'), ('video', 'Video'), ('other', 'Other')], db_index=True, editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='mime_type',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='size_bytes',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='playlist',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='content',
+            index=models.Index(fields=['size_bytes', 'id'], name='signage_con_size_by_3d6746_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='content',
+            index=models.Index(fields=['width', 'height'], name='signage_con_width_a30b8b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playlist',
+            index=models.Index(fields=['size_bytes', 'id'], name='signage_pla_size_by_d235aa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playlist',
+            index=models.Index(fields=['width', 'height'], name='signage_pla_width_83f562_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signage', '0009_media_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FolderUsage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('folder', models.CharField(max_length=255, unique=True)),
+                ('size_bytes', models.BigIntegerField(default=0)),
+                ('file_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Folder Usage',
+                'verbose_name_plural': 'Folder Usage',
+            },
+        ),
+    ]
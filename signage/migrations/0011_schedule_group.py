@@ -0,0 +1,65 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+SCHEDULE_COLUMNS = ('playback_date', 'playback_start', 'playback_end', 'recurrence_end', 'publish_status')
+
+
+def fill_schedule_groups(apps, schema_editor):
+    Schedule = apps.get_model('signage', 'Schedule')
+    ScheduleGroup = apps.get_model('signage', 'ScheduleGroup')
+    through = Schedule.publish_to.through
+
+    pairs = through.objects.filter(device__group__isnull=False).values_list(
+        'schedule_id', 'device__group_id'
+    ).distinct().order_by('schedule_id')
+    batch = []
+    for schedule_id, group_id in pairs.iterator(chunk_size=2000):
+        batch.append((schedule_id, group_id))
+        if len(batch) >= 2000:
+            _insert(Schedule, ScheduleGroup, batch)
+            batch = []
+    _insert(Schedule, ScheduleGroup, batch)
+
+
+def _insert(Schedule, ScheduleGroup, pairs):
+    if not pairs:
+        return
+    columns = {
+        row.pop('id'): row for row in Schedule.objects.filter(
+            pk__in={schedule_id for schedule_id, _ in pairs}
+        ).values('id', *SCHEDULE_COLUMNS)
+    }
+    ScheduleGroup.objects.bulk_create([
+        ScheduleGroup(schedule_id=schedule_id, group_id=group_id, **columns[schedule_id])
+        for schedule_id, group_id in pairs
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signage', '0010_folder_usage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleGroup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('playback_date', models.DateField(blank=True, null=True)),
+                ('playback_start', models.TimeField(blank=True, null=True)),
+                ('playback_end', models.TimeField(blank=True, null=True)),
+                ('recurrence_end', models.DateField(blank=True, null=True)),
+                ('publish_status', models.CharField(choices=[('Draft', 'Draft'), ('Published', 'Published')], default='Draft', max_length=10)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_links', to='signage.devicegroup')),
+                ('schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='group_links', to='signage.schedule')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['group', 'playback_date', 'playback_start'], name='schedgroup_group_date_idx'), models.Index(fields=['group', 'recurrence_end'], name='schedgroup_group_end_idx')],
+                'constraints': [models.UniqueConstraint(fields=('schedule', 'group'), name='unique_schedule_group')],
+            },
+        ),
+        migrations.RunPython(fill_schedule_groups, migrations.RunPython.noop),
+    ]
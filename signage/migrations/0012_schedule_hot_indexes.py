@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signage', '0011_schedule_group'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='schedule',
+            name='signage_sch_publish_6db536_idx',
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['publish_status', 'playback_date', 'playback_start'], name='schedule_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('publish_status', 'Published')), fields=['playback_date', 'playback_start', 'playback_end'], name='schedule_published_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('recurrence', ''), _negated=True), fields=['recurrence_end', 'playback_date'], name='schedule_recurring_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedulegroup',
+            index=models.Index(condition=models.Q(('publish_status', 'Published')), fields=['group', 'playback_date', 'playback_start'], name='schedgroup_published_idx'),
+        ),
+    ]
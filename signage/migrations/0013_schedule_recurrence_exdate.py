@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('signage', '0012_schedule_hot_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='schedule',
+            name='recurrence',
+            field=models.TextField(blank=True, default='', help_text='RRULE pengulangan plus EXDATE opsional (kosong = sekali tayang pada playback_date)'),
+        ),
+    ]
@@ -1,11 +1,11 @@
+import mimetypes
 import os
 from django.contrib.auth.models import User
-from django.db import models
-from django.db.models.signals import post_save, post_delete
+from django.db import models, transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
 from django.dispatch import receiver
 from django.utils import timezone
 from datetime import timedelta
-from django.utils.timezone import now, timedelta
 
 def content_file_path(instance, filename):
     ext = os.path.splitext(filename)[1].lower()
@@ -30,9 +30,85 @@ def content_file_path(instance, filename):
     
     return os.path.join('content_uploads', new_filename)
 
-class Content(models.Model):
+MEDIA_STATUS_CHOICES = [
+    ('processing', 'Processing'),
+    ('ready', 'Ready'),
+    ('failed', 'Failed'),
+]
+
+MEDIA_KIND_CHOICES = [
+    ('image', 'Image'),
+    ('video', 'Video'),
+    ('other', 'Other'),
+]
+
+MEDIA_KIND_LABELS = {'image': 'Image', 'video': 'Video'}
+
+def media_kind_from_name(name):
+    """Jenis media dari ekstensi file, sama seperti file_type_content/file_type_playlist"""
+    ext = name.split('.')[-1].lower() if name else ''
+    if ext in ['jpg', 'jpeg', 'png', 'gif', 'webp']:
+        return 'image'
+    elif ext in ['mp4', 'mov', 'avi', 'webm']:
+        return 'video'
+    return 'other'
+
+
+class MediaColumnsMixin:
+    """
+    Kolom size_bytes/media_kind/mime_type diisi saat file berubah (upload,
+    transcode); width/height/duration diisi setelah probe di
+    media_metadata.refresh_metadata. Listing, export dan admin membaca kolom
+    ini tanpa os.stat per baris.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'file' in instance.__dict__:
+            instance._loaded_file_name = instance.__dict__['file']
+        return instance
+
+    def sync_media_columns(self):
+        name = self.file.name if self.file else ''
+        if name == getattr(self, '_loaded_file_name', None) and self.size_bytes is not None:
+            return
+        old_name, old_size = getattr(self, '_loaded_file_name', None), self.size_bytes
+        self.media_kind = media_kind_from_name(name) if name else ''
+        self.mime_type = (mimetypes.guess_type(name)[0] or '') if name else ''
+        try:
+            self.size_bytes = self.file.size if name else None
+        except (FileNotFoundError, OSError):
+            self.size_bytes = None
+        self.width = self.height = self.duration = None
+        if name != old_name:
+            # Nama final (upload_to) baru ada setelah save; lihat update_storage_usage_on_save
+            self._storage_change = (old_name, old_size)
+
+    def media_label(self):
+        kind = self.media_kind or media_kind_from_name(self.file.name if self.file else '')
+        return MEDIA_KIND_LABELS.get(kind, 'Unknown')
+
+    def file_size_kb(self):
+        """Return file size in KB"""
+        if self.size_bytes is not None:
+            return f"{round(self.size_bytes / 1024)} KB"
+        if not self.file or self.media_kind:
+            # media_kind terisi tapi size kosong: file tidak ada di disk
+            return "0 KB"
+        return f"{round(self.file.size / 1024)} KB"
+    file_size_kb.admin_order_field = 'size_bytes'
+
+class Content(MediaColumnsMixin, models.Model):
     content_name = models.CharField(max_length=100)
     file = models.FileField(upload_to=content_file_path)
+    status = models.CharField(
+        max_length=12,
+        choices=MEDIA_STATUS_CHOICES,
+        default='ready',
+        db_index=True,
+        help_text="Status encode file (processing selama transcode job berjalan)"
+    )
     supported_device = models.CharField(
         max_length=200,  
         blank=True,
@@ -48,23 +124,30 @@ class Content(models.Model):
     creator = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     expiration_date = models.DateTimeField(blank=True, null=True)
     date_modified = models.DateTimeField(auto_now=True)
+    size_bytes = models.BigIntegerField(null=True, blank=True, editable=False)
+    media_kind = models.CharField(max_length=10, choices=MEDIA_KIND_CHOICES, blank=True, editable=False, db_index=True)
+    mime_type = models.CharField(max_length=100, blank=True, editable=False, db_index=True)
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    duration = models.FloatField(null=True, blank=True, editable=False, db_index=True, help_text="Durasi dalam detik")
+
+    class Meta:
+        # Keyset pagination listing (signage.listing): kolom sort + id
+        indexes = [
+            models.Index(fields=['date_modified', 'id']),
+            models.Index(fields=['content_name', 'id']),
+            models.Index(fields=['expiration_date', 'id']),
+            models.Index(fields=['size_bytes', 'id']),
+            models.Index(fields=['width', 'height']),
+        ]
 
     def __str__(self):
         return self.content_name
 
     def file_type_content(self):
         """Determine the file type of the content"""
-        ext = self.file.name.split('.')[-1].lower() if self.file else ''
-        if ext in ['jpg', 'jpeg', 'png', 'gif', 'webp']:
-            return 'Image'
-        elif ext in ['mp4', 'mov', 'avi', 'webm']:
-            return 'Video'
-        else:
-            return 'Unknown'
-
-    def file_size_kb(self):
-        """Return file size in KB"""
-        return f"{round(self.file.size / 1024)} KB" if self.file else "0 KB"
+        return self.media_label()
+    file_type_content.admin_order_field = 'media_kind'
 
     def file_details(self):
         """Return combined file type and size information"""
@@ -94,12 +177,51 @@ class Content(models.Model):
         else:
             self.supported_device = ""
 
+        if kwargs.get('update_fields') is None:
+            self.sync_media_columns()
         super().save(*args, **kwargs)
+        self._loaded_file_name = self.file.name if self.file else ''
+
 
+class ContentRendition(models.Model):
+    """
+    File Content yang di-encode untuk satu resolusi layar. Layar mengambil
+    rendition yang paling dekat dengan resolusinya (lihat renditions.pick_rendition).
+    """
+    content = models.ForeignKey(
+        Content,
+        on_delete=models.CASCADE,
+        related_name='renditions'
+    )
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    file = models.FileField(upload_to='content_renditions/')
+    date_created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['width', 'height']
+        constraints = [
+            models.UniqueConstraint(fields=['content', 'width', 'height'], name='unique_content_rendition'),
+        ]
+
+    def __str__(self):
+        return f"{self.content.content_name} ({self.resolution})"
 
-class Playlist(models.Model):
+    @property
+    def resolution(self):
+        return f"{self.width}x{self.height}"
+
+
+class Playlist(MediaColumnsMixin, models.Model):
     playlist_name = models.CharField(max_length=100)
     file = models.FileField(upload_to='playlist_uploads/')
+    status = models.CharField(
+        max_length=12,
+        choices=MEDIA_STATUS_CHOICES,
+        default='ready',
+        db_index=True,
+        help_text="Status encode file (processing selama transcode job berjalan)"
+    )
     supported_device = models.CharField(
         max_length=200,  
         blank=True,
@@ -115,23 +237,30 @@ class Playlist(models.Model):
     creator = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     expiration_date = models.DateTimeField(blank=True, null=True)
     date_modified = models.DateTimeField(auto_now=True)
+    size_bytes = models.BigIntegerField(null=True, blank=True, editable=False)
+    media_kind = models.CharField(max_length=10, choices=MEDIA_KIND_CHOICES, blank=True, editable=False, db_index=True)
+    mime_type = models.CharField(max_length=100, blank=True, editable=False, db_index=True)
+    width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    duration = models.FloatField(null=True, blank=True, editable=False, db_index=True, help_text="Durasi dalam detik")
+
+    class Meta:
+        # Keyset pagination listing (signage.listing): kolom sort + id
+        indexes = [
+            models.Index(fields=['date_modified', 'id']),
+            models.Index(fields=['playlist_name', 'id']),
+            models.Index(fields=['expiration_date', 'id']),
+            models.Index(fields=['size_bytes', 'id']),
+            models.Index(fields=['width', 'height']),
+        ]
 
     def __str__(self):
         return self.playlist_name
 
     def file_type_playlist(self):
         """Determine the file type of the playlist file"""
-        ext = self.file.name.split('.')[-1].lower() if self.file else ''
-        if ext in ['jpg', 'jpeg', 'png', 'gif', 'webp']:
-            return 'Image'
-        elif ext in ['mp4', 'mov', 'avi', 'webm']:
-            return 'Video'
-        else:
-            return 'Unknown'
-
-    def file_size_kb(self):
-        """Return file size in KB"""
-        return f"{round(self.file.size / 1024)} KB" if self.file else "0 KB"
+        return self.media_label()
+    file_type_playlist.admin_order_field = 'media_kind'
 
     def file_details(self):
         """Return combined file type and size information"""
@@ -161,7 +290,10 @@ class Playlist(models.Model):
         else:
             self.supported_device = ""
 
+        if kwargs.get('update_fields') is None:
+            self.sync_media_columns()
         super().save(*args, **kwargs)
+        self._loaded_file_name = self.file.name if self.file else ''
 
 class DeviceGroup(models.Model):
     """
@@ -204,7 +336,10 @@ class DeviceGroup(models.Model):
         return f"{self.name} ({self.device_count} devices, {self.schedule_count} schedules)"
 
     def update_device_count(self):
-        """Update counter jumlah perangkat"""
+        """
+        Hitung ulang counter jumlah perangkat. Counter normal dipelihara
+        incremental oleh signage.counters; ini untuk perbaikan manual.
+        """
         count = self.devices.count()
         if self.device_count != count:
             self.device_count = count
@@ -212,10 +347,7 @@ class DeviceGroup(models.Model):
 
     def update_schedule_count(self):
         """Update counter jumlah schedule"""
-        from django.db.models import Count
-        count = Schedule.objects.filter(
-            publish_to__group=self
-        ).distinct().count()
+        count = ScheduleGroup.objects.filter(group=self).count()
         if self.schedule_count != count:
             self.schedule_count = count
             self.save(update_fields=['schedule_count'])
@@ -267,35 +399,66 @@ class Device(models.Model):
             models.Index(fields=['ip_address']),
             models.Index(fields=['is_online']),
             models.Index(fields=['group']),
+            models.Index(fields=['is_online', 'last_updated', 'id']),
+            models.Index(fields=['name', 'id']),
+            models.Index(fields=['last_updated', 'id']),
         ]
 
     def __str__(self):
         group_name = self.group.name if self.group else 'No Group'
         return f"{self.name} ({self.ip_address}) - {group_name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Simpan nilai awal agar save() tidak perlu SELECT ulang
+        instance._loaded_values = {
+            field: getattr(instance, field)
+            for field in ('group_id', 'ip_address') if field in instance.__dict__
+        }
+        return instance
+
+    def _original_values(self):
+        loaded = getattr(self, '_loaded_values', {})
+        if 'group_id' in loaded and 'ip_address' in loaded:
+            return loaded['group_id'], loaded['ip_address']
+        original = Device.objects.filter(pk=self.pk).values('group_id', 'ip_address').first()
+        if original is None:
+            return None, None
+        return original['group_id'], original['ip_address']
+
     def save(self, *args, **kwargs):
         """
         Override save untuk handle perubahan grup
         """
-        old_group = None
-        if self.pk:  
-            old_group = Device.objects.get(pk=self.pk).group
-        
+        from .counters import group_counters
+        from .timeline import invalidate_device_snapshot, invalidate_group_timeline
+
+        created = self._state.adding
+        old_group_id = None
+        old_ip = None
+        if not created and self.pk:
+            old_group_id, old_ip = self._original_values()
+
         super().save(*args, **kwargs)
-        
-        if old_group and old_group != self.group:
-            old_group.update_device_count()
-        if self.group:
-            self.group.update_device_count()
+        self._loaded_values = {'group_id': self.group_id, 'ip_address': self.ip_address}
 
-    def delete(self, *args, **kwargs):
-        """
-        Override delete untuk update counter
-        """
-        group = self.group
-        super().delete(*args, **kwargs)
-        if group:
-            group.update_device_count()
+        if created:
+            group_counters.device_added(self.pk, self.group_id, created=True)
+        else:
+            group_counters.device_moved(self.pk, old_group_id, self.group_id)
+            if old_group_id != self.group_id:
+                from .schedule_groups import schedule_groups
+                schedule_groups.device_moved(self.pk)
+
+        invalidate_device_snapshot(old_ip, self.ip_address)
+        if old_group_id != self.group_id:
+            from .calendar_data import invalidate_calendar
+            invalidate_calendar()
+            invalidate_group_timeline(old_group_id, self.group_id)
+            if old_group_id:
+                from .schedule_index import schedule_index
+                schedule_index.clear()
 
     def current_schedule(self):
         """
@@ -306,13 +469,88 @@ class Device(models.Model):
         now_time = localtime().time()
         today_date = localtime().date()
         
-        return self.published_schedules.filter(
+        return self.published_schedules.with_recurring_ids(today_date, today_date).filter(
             playback_start__lte=now_time,
             playback_end__gte=now_time,
-            playback_date=today_date,
             publish_status='Published'
         ).select_related('content', 'playlist').first()
 
+class ScheduleQuerySet(models.QuerySet):
+    """Filter tanggal yang memperhitungkan schedule berulang (RRULE)"""
+
+    def recurring_candidates(self, start, end):
+        """Schedule berulang yang rentangnya beririsan dengan [start, end] (index schedule_recurring_idx)"""
+        return self.filter(
+            playback_date__lte=end, recurrence_end__gte=start
+        ).exclude(recurrence='')
+
+    def spanning(self, start, end):
+        """
+        Schedule yang rentang [playback_date, recurrence_end]-nya beririsan
+        dengan [start, end]. Lazy dan murni SQL; schedule berulang bisa tidak
+        punya kemunculan di rentang itu, jadi caller yang iterate menyaring
+        dengan expand_occurrences() atau schedule.occurs_on().
+        """
+        return self.filter(playback_date__lte=end, recurrence_end__gte=start)
+
+    def with_recurring_ids(self, start, end):
+        """
+        Schedule yang punya minimal satu kemunculan dalam [start, end], exact.
+        Query kandidat RRULE langsung dieksekusi dan di-expand di Python menjadi
+        pk__in; pakai hanya jika caller butuh queryset exact (first/exists/
+        slice/subquery), selain itu spanning().
+        """
+        from .recurrence import recurring_ids
+
+        candidates = self.recurring_candidates(start, end).values_list('id', 'playback_date', 'recurrence')
+        return self.filter(
+            models.Q(recurrence='', playback_date__gte=start, playback_date__lte=end)
+            | models.Q(pk__in=recurring_ids(candidates, start, end))
+        )
+
+    def overlap_dates(self, dates, start, end, groups=None, exclude=None):
+        """
+        Tanggal dari `dates` yang punya schedule Published bertabrakan dengan
+        [start, end). Langsung mengeksekusi query (satu untuk seluruh rentang)
+        dan tidak memakai schedule_index, yang bisa tertinggal di proses lain.
+        """
+        dates = set(dates)
+        if not dates:
+            return []
+        first, last = min(dates), max(dates)
+        schedules = self
+        if groups:
+            schedules = schedules.for_groups(groups, first, last)
+        schedules = schedules.spanning(first, last).filter(
+            publish_status='Published',
+            playback_start__lt=end,
+            playback_end__gt=start,
+        )
+        if exclude is not None:
+            schedules = schedules.exclude(pk=exclude)
+
+        found = set()
+        for schedule in schedules.only('id', 'playback_date', 'recurrence'):
+            found.update(day for day in schedule.occurrences(first, last) if day in dates)
+        return sorted(found)
+
+    def active_from(self, day):
+        """Schedule yang masih punya kemunculan pada/sesudah `day`"""
+        return self.filter(recurrence_end__gte=day)
+
+    def for_groups(self, group_ids, start=None, end=None):
+        """
+        Schedule yang dipublish ke salah satu grup, lewat ScheduleGroup
+        (semi-join tanpa join device dan tanpa distinct). start/end
+        mempersempit ke schedule yang mungkin tayang dalam rentang itu.
+        """
+        links = ScheduleGroup.objects.filter(group_id__in=group_ids)
+        if start is not None:
+            links = links.filter(recurrence_end__gte=start)
+        if end is not None:
+            links = links.filter(playback_date__lte=end)
+        return self.filter(pk__in=links.values('schedule_id'))
+
 class Schedule(models.Model):
     """
     Model schedule dengan relasi ke DeviceGroup via Device
@@ -342,40 +580,114 @@ class Schedule(models.Model):
     playback_end = models.TimeField(null=True, blank=True)
     publish_to = models.ManyToManyField(Device, related_name='published_schedules', blank=True)
     description = models.TextField(blank=True, null=True)
+    recurrence = models.TextField(
+        blank=True,
+        default='',
+        help_text="RRULE pengulangan plus EXDATE opsional (kosong = sekali tayang pada playback_date)"
+    )
+    recurrence_end = models.DateField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Tanggal kemunculan terakhir (sama dengan playback_date jika tidak berulang)"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ScheduleQuerySet.as_manager()
+
     class Meta:
+        # Dicek oleh command check_query_plans
         indexes = [
-            models.Index(fields=['publish_status']),
             models.Index(fields=['playback_date']),
+            models.Index(fields=['recurrence_end']),
+            models.Index(
+                fields=['publish_status', 'playback_date', 'playback_start'],
+                name='schedule_status_date_idx',
+            ),
+            models.Index(
+                fields=['playback_date', 'playback_start', 'playback_end'],
+                condition=models.Q(publish_status='Published'),
+                name='schedule_published_day_idx',
+            ),
+            models.Index(
+                fields=['recurrence_end', 'playback_date'],
+                condition=~models.Q(recurrence=''),
+                name='schedule_recurring_idx',
+            ),
         ]
 
     def __str__(self):
         return self.schedule_name
 
-    def get_related_groups(self):
-        """Dapatkan semua grup yang menerima schedule ini"""
-        return DeviceGroup.objects.filter(
-            devices__in=self.publish_to.all()
-        ).distinct()
+    def refresh_recurrence_end(self):
+        from .recurrence import last_occurrence
+        self.recurrence_end = last_occurrence(self.playback_date, self.recurrence)
 
     def save(self, *args, **kwargs):
+        self.refresh_recurrence_end()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'playback_date', 'recurrence'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'recurrence_end'}
+        super().save(*args, **kwargs)
+
+    def occurrences(self, start=None, end=None):
+        """Tanggal kemunculan schedule dalam [start, end]"""
+        from .recurrence import occurrence_dates
+        return occurrence_dates(self.playback_date, self.recurrence, start, end)
+
+    def occurs_on(self, day):
+        return bool(self.occurrences(day, day))
+
+    def exclude_occurrence(self, day):
         """
-        Override save untuk update counter grup
+        Hapus satu kemunculan lewat EXDATE. Schedule sekali tayang, atau seri
+        yang tidak punya kemunculan tersisa, dihapus. Return True jika baris
+        schedule masih ada.
         """
-        super().save(*args, **kwargs)
-        for group in self.get_related_groups():
-            group.update_schedule_count()
+        from .recurrence import exclude_date
 
-    def delete(self, *args, **kwargs):
+        if self.recurrence:
+            self.recurrence = exclude_date(self.recurrence, day)
+            if self.occurrences():
+                self.save()
+                return True
+        self.delete()
+        return False
+
+    def split_occurrence(self, day, **changes):
         """
-        Override delete untuk update counter grup
+        Pisahkan kemunculan `day` menjadi schedule sekali tayang dengan
+        `changes`, lalu keluarkan dari seri. Schedule sekali tayang cukup
+        di-update. Return schedule untuk kemunculan tersebut.
         """
-        groups = list(self.get_related_groups())
-        super().delete(*args, **kwargs)
-        for group in groups:
-            group.update_schedule_count()
+        if not self.recurrence:
+            for field, value in changes.items():
+                setattr(self, field, value)
+            self.save()
+            return self
+
+        fields = {
+            'schedule_name': self.schedule_name,
+            'schedule_type': 'None',
+            'publish_status': self.publish_status,
+            'content_id': self.content_id,
+            'playlist_id': self.playlist_id,
+            'playback_date': day,
+            'playback_start': self.playback_start,
+            'playback_end': self.playback_end,
+            'description': self.description,
+        }
+        fields.update(changes)
+        with transaction.atomic():
+            occurrence = Schedule.objects.create(**fields)
+            occurrence.publish_to.set(self.publish_to.all())
+            self.exclude_occurrence(day)
+        return occurrence
+
+    def get_related_groups(self):
+        """Dapatkan semua grup yang menerima schedule ini"""
+        return DeviceGroup.objects.filter(schedule_links__schedule=self)
 
     @property
     def is_content(self):
@@ -385,29 +697,328 @@ class Schedule(models.Model):
     def is_playlist(self):
         return bool(self.playlist) and not self.content
 
+class ScheduleGroup(models.Model):
+    """
+    Pemetaan schedule -> grup yang didenormalisasi dari publish_to, beserta
+    salinan kolom tanggal/jam schedule (lihat signage.schedule_groups).
+    """
+    schedule = models.ForeignKey(Schedule, on_delete=models.CASCADE, related_name='group_links')
+    group = models.ForeignKey(DeviceGroup, on_delete=models.CASCADE, related_name='schedule_links')
+    playback_date = models.DateField(null=True, blank=True)
+    playback_start = models.TimeField(null=True, blank=True)
+    playback_end = models.TimeField(null=True, blank=True)
+    recurrence_end = models.DateField(null=True, blank=True)
+    publish_status = models.CharField(max_length=10, choices=Schedule.PUBLISH_STATUS_CHOICES, default='Draft')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['schedule', 'group'], name='unique_schedule_group'),
+        ]
+        indexes = [
+            models.Index(fields=['group', 'playback_date', 'playback_start'], name='schedgroup_group_date_idx'),
+            models.Index(fields=['group', 'recurrence_end'], name='schedgroup_group_end_idx'),
+            models.Index(
+                fields=['group', 'playback_date', 'playback_start'],
+                condition=models.Q(publish_status='Published'),
+                name='schedgroup_published_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.schedule_id} -> {self.group_id}"
+
+class TranscodeJob(models.Model):
+    """
+    Job transcode ffmpeg yang dikerjakan oleh worker lokal
+    (management command run_transcode_worker), bukan di dalam request.
+    """
+    KIND_CHOICES = [
+        ('content', 'Content'),
+        ('playlist', 'Playlist'),
+    ]
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Progress dalam persen")
+    content = models.ForeignKey(
+        Content,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='transcode_jobs'
+    )
+    playlist = models.ForeignKey(
+        Playlist,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='transcode_jobs'
+    )
+    source_path = models.CharField(max_length=500, blank=True, help_text="File sumber sementara (untuk content)")
+    params = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} job #{self.pk} ({self.status}, {self.progress}%)"
+
+    def set_progress(self, progress):
+        self.progress = max(0, min(100, int(progress)))
+        TranscodeJob.objects.filter(pk=self.pk).update(progress=self.progress, updated_at=timezone.now())
+
+class MediaMetadata(models.Model):
+    """
+    Hasil probe (PIL/ffprobe) satu file media, diisi saat upload/transcode dan
+    dianggap basi jika mtime atau ukuran file berubah.
+    """
+    path = models.CharField(max_length=500, unique=True, help_text="Nama file relatif terhadap MEDIA_ROOT")
+    media_kind = models.CharField(max_length=10, choices=MEDIA_KIND_CHOICES, default='other')
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    duration = models.FloatField(null=True, blank=True, help_text="Durasi dalam detik")
+    video_codec = models.CharField(max_length=30, blank=True)
+    audio_codec = models.CharField(max_length=30, blank=True)
+    has_audio = models.BooleanField(default=False)
+    bitrate = models.PositiveIntegerField(null=True, blank=True, help_text="Bitrate dalam bit/detik")
+    file_size = models.BigIntegerField(default=0)
+    mtime = models.FloatField(default=0)
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    optimized = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Media Metadata"
+        verbose_name_plural = "Media Metadata"
+
+    def __str__(self):
+        return f"{self.path} ({self.width}x{self.height})"
+
+class FolderUsage(models.Model):
+    """
+    Pemakaian storage per folder di MEDIA_ROOT (content_uploads, playlist_uploads),
+    dipelihara incremental dari event upload/hapus (lihat signage.storage_usage).
+    """
+    folder = models.CharField(max_length=255, unique=True)
+    size_bytes = models.BigIntegerField(default=0)
+    file_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Folder Usage"
+        verbose_name_plural = "Folder Usage"
+
+    def __str__(self):
+        return f"{self.folder} ({self.size_bytes} bytes, {self.file_count} files)"
+
+@receiver(pre_delete, sender=Device)
+def update_counters_on_device_delete(sender, instance, **kwargs):
+    from .calendar_data import invalidate_calendar
+    from .counters import group_counters
+    group_counters.device_removed(instance.pk, instance.group_id)
+    invalidate_calendar()
+
+@receiver(pre_delete, sender=Schedule)
+def update_counters_on_schedule_delete(sender, instance, **kwargs):
+    from .counters import group_counters
+    group_counters.schedule_removed(instance.pk)
+
+@receiver(m2m_changed, sender=Schedule.publish_to.through)
+def update_counters_on_publish_change(sender, instance, action, reverse, pk_set, **kwargs):
+    from .counters import group_counters
+    if reverse:
+        if action == 'post_add':
+            group_counters.device_schedules_added(instance.pk, instance.group_id, pk_set)
+        elif action == 'post_remove':
+            group_counters.device_schedules_removed(instance.pk, instance.group_id, pk_set)
+        elif action == 'pre_clear':
+            group_counters.device_schedules_cleared(instance.pk, instance.group_id)
+        return
+
+    if action == 'post_add' and pk_set:
+        group_counters.schedule_devices_added(instance.pk, pk_set)
+    elif action == 'pre_remove' and pk_set:
+        instance._counter_removed_groups = group_counters.schedule_groups(instance.pk, pk_set)
+    elif action == 'post_remove':
+        group_counters.schedule_devices_removed(instance.pk, getattr(instance, '_counter_removed_groups', set()))
+        instance._counter_removed_groups = set()
+    elif action == 'pre_clear':
+        group_counters.schedule_removed(instance.pk)
+
+@receiver(m2m_changed, sender=Schedule.publish_to.through)
+def sync_schedule_groups_on_publish_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Harus terdaftar sebelum receiver yang memakai get_related_groups()"""
+    from .schedule_groups import schedule_groups
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            schedule_groups.sync([instance.pk])
+    elif action in ('post_add', 'post_remove'):
+        schedule_groups.sync(pk_set)
+    elif action == 'pre_clear':
+        instance._cleared_schedule_ids = list(instance.published_schedules.values_list('id', flat=True))
+    elif action == 'post_clear':
+        schedule_groups.sync(instance.__dict__.pop('_cleared_schedule_ids', []))
+
+@receiver(post_save, sender=Schedule)
+def sync_schedule_group_columns_on_save(sender, instance, created, **kwargs):
+    from .schedule_groups import schedule_groups
+    if not created:
+        schedule_groups.refresh_columns(instance)
+
+@receiver(pre_delete, sender=Device)
+def remember_device_schedules_on_delete(sender, instance, **kwargs):
+    instance._deleted_schedule_ids = list(instance.published_schedules.values_list('id', flat=True))
+
+@receiver(post_delete, sender=Device)
+def sync_schedule_groups_on_device_delete(sender, instance, **kwargs):
+    from .schedule_groups import schedule_groups
+    if instance.group_id:
+        schedule_groups.sync(instance.__dict__.pop('_deleted_schedule_ids', []))
+
 @receiver(post_save, sender=Device)
-def update_device_count_on_save(sender, instance, **kwargs):
-    if instance.group:
-        instance.group.update_device_count()
-    if kwargs.get('old_group'):
-        kwargs['old_group'].update_device_count()
+def forget_heartbeat_mapping_on_device_save(sender, instance, created, **kwargs):
+    """IP device bisa diganti; mapping IP -> id di heartbeat buffer harus dicek ulang"""
+    from .heartbeat import heartbeat_buffer
+    heartbeat_buffer.forget(instance.ip_address, None if created else instance.pk)
 
 @receiver(post_delete, sender=Device)
-def update_device_count_on_delete(sender, instance, **kwargs):
-    if instance.group:
-        instance.group.update_device_count()
+def invalidate_timeline_on_device_delete(sender, instance, **kwargs):
+    from .heartbeat import heartbeat_buffer
+    from .timeline import invalidate_device_snapshot, invalidate_group_timeline
+    heartbeat_buffer.forget(instance.ip_address, instance.pk)
+    invalidate_device_snapshot(instance.ip_address)
+    invalidate_group_timeline(instance.group_id)
+
+@receiver([post_save, post_delete], sender=DeviceGroup)
+def invalidate_timeline_on_group_change(sender, instance, **kwargs):
+    from .timeline import invalidate_group_timeline
+    invalidate_group_timeline(instance.pk)
+
+@receiver(post_save, sender=Schedule)
+@receiver(pre_delete, sender=Schedule)
+def invalidate_timeline_on_schedule_change(sender, instance, **kwargs):
+    from .timeline import invalidate_group_timeline
+    invalidate_group_timeline(*instance.get_related_groups().values_list('id', flat=True))
+
+@receiver(m2m_changed, sender=Schedule.publish_to.through)
+def invalidate_timeline_on_publish_change(sender, instance, action, reverse, pk_set, **kwargs):
+    from .timeline import invalidate_group_timeline
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        invalidate_group_timeline(instance.group_id)
+    elif pk_set:
+        invalidate_group_timeline(*Device.objects.filter(pk__in=pk_set).values_list('group_id', flat=True))
+    else:
+        invalidate_group_timeline(*instance.get_related_groups().values_list('id', flat=True))
+
+@receiver(post_save, sender=Schedule)
+def update_schedule_index_on_save(sender, instance, **kwargs):
+    from .schedule_index import schedule_index
+    schedule_index.upsert(instance)
+
+@receiver(pre_delete, sender=Schedule)
+def update_schedule_index_on_delete(sender, instance, **kwargs):
+    from .schedule_index import schedule_index
+    schedule_index.discard(instance.pk)
+
+@receiver(m2m_changed, sender=Schedule.publish_to.through)
+def update_schedule_index_on_publish_change(sender, instance, action, reverse, **kwargs):
+    from .schedule_index import schedule_index
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        schedule_index.clear()
+    else:
+        schedule_index.upsert(instance)
 
 @receiver([post_save, post_delete], sender=Schedule)
-def update_schedule_count_on_change(sender, instance, **kwargs):
-    for group in instance.get_related_groups():
-        group.update_schedule_count()
+@receiver([post_save, post_delete], sender=Content)
+@receiver([post_save, post_delete], sender=Playlist)
+def invalidate_calendar_on_change(sender, instance, **kwargs):
+    from .calendar_data import invalidate_calendar
+    invalidate_calendar()
+
+@receiver(m2m_changed, sender=Schedule.publish_to.through)
+def invalidate_calendar_on_publish_change(sender, action, **kwargs):
+    from .calendar_data import invalidate_calendar
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_calendar()
+
+@receiver([post_save, pre_delete], sender=Content)
+@receiver([post_save, pre_delete], sender=Playlist)
+def invalidate_timeline_on_media_change(sender, instance, **kwargs):
+    from .timeline import invalidate_group_timeline
+    lookup = 'content' if sender is Content else 'playlist'
+    invalidate_group_timeline(*ScheduleGroup.objects.filter(**{f"schedule__{lookup}": instance}).values_list(
+        'group_id', flat=True
+    ).distinct())
+
+@receiver([post_save, post_delete], sender=ContentRendition)
+def invalidate_timeline_on_rendition_change(sender, instance, **kwargs):
+    from .timeline import invalidate_group_timeline
+    invalidate_group_timeline(*ScheduleGroup.objects.filter(schedule__content_id=instance.content_id).values_list(
+        'group_id', flat=True
+    ).distinct())
+
+@receiver(post_delete, sender=ContentRendition)
+def delete_rendition_file(sender, instance, **kwargs):
+    if instance.file:
+        instance.file.delete(save=False)
+
+@receiver(post_save, sender=Content)
+@receiver(post_save, sender=ContentRendition)
+@receiver(post_save, sender=Playlist)
+def refresh_media_metadata_on_save(sender, instance, **kwargs):
+    """Probe file sekali setelah disimpan, bukan pada setiap render display"""
+    from .media_metadata import refresh_metadata
+    if instance.file and getattr(instance, 'status', 'ready') == 'ready':
+        name = instance.file.name
+        transaction.on_commit(lambda: refresh_metadata(name), robust=True)
+
+@receiver(post_delete, sender=Content)
+@receiver(post_delete, sender=ContentRendition)
+@receiver(post_delete, sender=Playlist)
+def forget_media_metadata_on_delete(sender, instance, **kwargs):
+    from .media_metadata import forget_metadata
+    if instance.file:
+        forget_metadata(instance.file.name)
+
+@receiver(post_save, sender=Content)
+@receiver(post_save, sender=Playlist)
+def update_storage_usage_on_save(sender, instance, **kwargs):
+    from .storage_usage import storage_usage
+    change = instance.__dict__.pop('_storage_change', None)
+    if change:
+        new_name = instance.file.name if instance.file else ''
+        storage_usage.file_replaced(*change, new_name, instance.size_bytes)
+
+@receiver(post_delete, sender=Content)
+@receiver(post_delete, sender=Playlist)
+def update_storage_usage_on_delete(sender, instance, **kwargs):
+    from .storage_usage import storage_usage
+    if instance.file:
+        storage_usage.file_removed(instance.file.name, instance.size_bytes)
 
 def mark_offline_devices():
     """
-    Menandai perangkat offline yang tidak update dalam 1 menit
+    Menandai perangkat offline yang tidak update melewati DEVICE_OFFLINE_THRESHOLD
     """
-    timeout_limit = now() - timedelta(minutes=1)
-    Device.objects.filter(
-        last_updated__lt=timeout_limit,
-        is_online=True
-    ).update(is_online=False)
\ No newline at end of file
+    from .sweeper import sweep_offline_devices
+    return sweep_offline_devices()
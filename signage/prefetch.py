@@ -0,0 +1,87 @@
+"""
+Manifest prefetch per device untuk layar signage.
+
+Manifest berisi semua slot timeline group device dalam PREFETCH_HORIZON_HOURS
+ke depan beserta URL media (rendition yang sesuai resolusi device), ukuran
+dan hash file. Service worker di display.html memakai manifest ini untuk
+mengunduh media lebih awal dan melayaninya dari cache, termasuk saat server
+tidak bisa dihubungi.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.utils import timezone
+
+from .media_metadata import get_media_metadata, media_name_from_url
+from .timeline import DEFAULT_MEDIA, entry_file_path, get_group_timeline
+
+
+def _horizon_hours():
+    return settings.SIGNAGE_SETTINGS.get('PREFETCH_HORIZON_HOURS', 6)
+
+
+def _media_entry(url, media_type):
+    name = media_name_from_url(url)
+    metadata = get_media_metadata(name) if name else None
+    content_hash = metadata['content_hash'] if metadata else ''
+    return {
+        'path': url,
+        'src': f"{url}?v={content_hash}" if content_hash else url,
+        'type': media_type,
+        'size': metadata['file_size'] if metadata else None,
+        'hash': content_hash,
+    }
+
+
+def build_prefetch_manifest(device, horizon_hours=None):
+    """Manifest media untuk device: slot terurut berdasarkan waktu mulai dan daftar file unik"""
+    horizon_hours = horizon_hours or _horizon_hours()
+    now_ts = timezone.now().timestamp()
+    until_ts = now_ts + horizon_hours * 3600
+
+    timeline = get_group_timeline(device.group_id) if device and device.group_id else None
+    resolution = device.resolution if device else None
+
+    items = []
+    media = {}
+    for entry in (timeline['entries'] if timeline else []):
+        if entry['end_timestamp'] <= now_ts or entry['start_timestamp'] >= until_ts:
+            continue
+        url = entry_file_path(entry, resolution)
+        if url not in media:
+            media[url] = _media_entry(url, entry['media_type'])
+        items.append({
+            'schedule_id': entry['schedule_id'],
+            'name': entry['name'],
+            'url': url,
+            'type': entry['media_type'],
+            'start': entry['start_timestamp'],
+            'end': entry['end_timestamp'],
+            'size': media[url]['size'],
+            'hash': media[url]['hash'],
+        })
+
+    default_url, default_type = DEFAULT_MEDIA
+    if default_url not in media:
+        media[default_url] = _media_entry(default_url, default_type)
+
+    media_list = sorted(media.values(), key=lambda item: item['path'])
+    version = hashlib.sha1(json.dumps(
+        [items, media_list], sort_keys=True, default=str
+    ).encode()).hexdigest()
+
+    return {
+        'version': version,
+        'generated_at': now_ts,
+        'horizon_hours': horizon_hours,
+        'device': {
+            'id': device.id,
+            'name': device.name,
+            'resolution': resolution,
+        } if device else None,
+        'group_id': device.group_id if device else None,
+        'items': items,
+        'media': media_list,
+        'total_bytes': sum(item['size'] or 0 for item in media_list),
+    }
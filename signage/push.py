@@ -0,0 +1,109 @@
+"""
+Hub fan-out in-process untuk push Server-Sent Events ke layar signage.
+
+Setiap koneksi ``/signage/stream/`` subscribe ke DeviceGroup milik device-nya.
+Saat timeline grup di-invalidate (lihat ``timeline.invalidate_group_timeline``)
+hub membangunkan semua subscriber grup tersebut supaya mereka mengirim event
+"switch ke media X pada timestamp T" yang baru. Signal Django berjalan di
+thread sync, jadi publish memakai ``call_soon_threadsafe`` ke event loop
+masing-masing subscriber.
+"""
+import asyncio
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+CHANGED = 'changed'
+CLOSED = 'closed'
+
+
+class Subscription:
+    def __init__(self, group_id, device_key):
+        self.group_id = group_id
+        self.device_key = device_key
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=1)
+
+    def offer(self, event):
+        """Taruh event ke queue; event yang belum dibaca cukup digabung jadi satu"""
+        if event == CLOSED and self.queue.full():
+            self.queue.get_nowait()
+        if not self.queue.full():
+            self.queue.put_nowait(event)
+
+
+class GroupEventHub:
+    """Registry subscriber per DeviceGroup, satu koneksi aktif per device"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._groups = {}
+        self._devices = {}
+
+    def subscribe(self, group_id, device_key):
+        subscription = Subscription(group_id, device_key)
+        with self._lock:
+            previous = self._devices.get(device_key)
+            self._devices[device_key] = subscription
+            self._groups.setdefault(group_id, set()).add(subscription)
+        if previous is not None:
+            self._remove(previous)
+            previous.loop.call_soon_threadsafe(previous.offer, CLOSED)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if self._devices.get(subscription.device_key) is subscription:
+                del self._devices[subscription.device_key]
+        self._remove(subscription)
+
+    def _remove(self, subscription):
+        with self._lock:
+            subscribers = self._groups.get(subscription.group_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._groups[subscription.group_id]
+
+    def publish(self, *group_ids):
+        """Bangunkan semua subscriber dari grup-grup yang timeline-nya berubah"""
+        with self._lock:
+            targets = [
+                subscription
+                for group_id in set(group_ids)
+                for subscription in self._groups.get(group_id, ())
+            ]
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, CHANGED)
+            except RuntimeError:
+                self.unsubscribe(subscription)
+
+    def subscriber_count(self, group_id=None):
+        with self._lock:
+            if group_id is None:
+                return len(self._devices)
+            return len(self._groups.get(group_id, ()))
+
+
+hub = GroupEventHub()
+
+
+def format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def compact_slot(schedule_info):
+    """Ringkas schedule_info menjadi instruksi switch media pada timestamp tertentu"""
+    if not schedule_info:
+        return None
+    return {
+        'id': schedule_info['schedule_id'],
+        'name': schedule_info['name'],
+        'url': schedule_info['file_path'],
+        'type': schedule_info['media_type'],
+        'at': schedule_info.get('start_timestamp'),
+        'until': schedule_info.get('end_timestamp'),
+    }
@@ -0,0 +1,229 @@
+"""
+Pemeriksaan query plan untuk query Schedule yang paling sering dijalankan.
+
+Setiap entry HOT_QUERIES membangun queryset yang sama dengan yang dipakai
+display middleware, SchedulesView, kalender, skip_schedule dan timeline grup.
+``check()`` menjalankan EXPLAIN untuk masing-masing dan melaporkan tabel
+schedule yang dibaca dengan sequential scan. Di Postgres ``enable_seqscan``
+dimatikan selama pemeriksaan: planner tetap memilih Seq Scan hanya jika tidak
+ada index yang bisa dipakai, sehingga hasilnya tidak bergantung pada ukuran
+data seed. Dipakai oleh command ``check_query_plans``.
+"""
+import json
+import logging
+import re
+from datetime import datetime, time, timedelta
+
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+WATCHED_TABLES = ('signage_schedule', 'signage_schedulegroup', 'signage_schedule_publish_to')
+
+
+def _display_current(group_id, today, now):
+    """middleware._get_current_schedule"""
+    from .models import Schedule
+
+    return Schedule.objects.for_groups([group_id], today, today).with_recurring_ids(today, today).filter(
+        publish_status='Published',
+        playback_start__lte=now,
+        playback_end__gte=now
+    ).select_related('content', 'playlist').order_by('-playback_start')
+
+
+def _display_next(group_id, today, now):
+    """middleware._get_next_schedule"""
+    from .models import Schedule
+
+    return Schedule.objects.for_groups([group_id], today, today).with_recurring_ids(today, today).filter(
+        publish_status='Published',
+        playback_start__gt=now
+    ).select_related('content', 'playlist').order_by('playback_start')
+
+
+def _schedules_today(group_id, today, now):
+    """SchedulesView.get: jendela 10 schedule mulai dari cursor"""
+    from .schedule_cursor import todays_schedules
+
+    return todays_schedules(today, now, [group_id]).filter(
+        Q(playback_start__gt=now) | Q(playback_start=now, id__gte=0)
+    ).select_related('content', 'playlist').order_by('playback_start', 'id')[:10]
+
+
+def _schedules_today_all(group_id, today, now):
+    """SchedulesView.get tanpa filter grup"""
+    from .schedule_cursor import todays_schedules
+
+    return todays_schedules(today, now).select_related('content', 'playlist').order_by('playback_start', 'id')[:10]
+
+
+def _recurring_candidates(group_id, today, now):
+    """Kandidat RRULE di dalam with_recurring_ids (dieksekusi terpisah)"""
+    from .models import Schedule
+
+    return Schedule.objects.recurring_candidates(today, today).values_list('id', 'playback_date', 'recurrence')
+
+
+def _monthly(group_id, today, now):
+    """SchedulesView.get_monthly_schedules (calendar_data.build_month)"""
+    from .calendar_data import month_rows
+
+    first_day = today.replace(day=1)
+    return month_rows(first_day, first_day + timedelta(days=30), [group_id])
+
+
+def _skip_schedule(group_id, today, now):
+    """SchedulesView.skip_schedule"""
+    from .models import Schedule
+
+    return Schedule.objects.with_recurring_ids(today, today).filter(
+        publish_status='Published'
+    ).exclude(id=0).order_by('playback_end')
+
+
+def _group_timeline(group_id, today, now):
+    """timeline.get_group_timeline"""
+    from .models import Schedule
+    from .timeline import _timeline_days
+
+    last_day = today + timedelta(days=_timeline_days())
+    return Schedule.objects.for_groups([group_id], today, last_day).spanning(today, last_day).filter(
+        publish_status='Published',
+        playback_start__isnull=False,
+        playback_end__isnull=False,
+    ).select_related('content', 'playlist')
+
+
+HOT_QUERIES = {
+    'display_current': _display_current,
+    'display_next': _display_next,
+    'schedules_today': _schedules_today,
+    'schedules_today_all': _schedules_today_all,
+    'recurring_candidates': _recurring_candidates,
+    'monthly': _monthly,
+    'skip_schedule': _skip_schedule,
+    'group_timeline': _group_timeline,
+}
+
+
+class PlanResult:
+    def __init__(self, name, sql, plan, seq_scans):
+        self.name = name
+        self.sql = sql
+        self.plan = plan
+        self.seq_scans = seq_scans
+
+    @property
+    def ok(self):
+        return not self.seq_scans
+
+
+def _postgres_plan(queryset):
+    plan = json.loads(queryset.explain(format='json'))[0]['Plan']
+    scans = []
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop()
+        if node.get('Node Type') == 'Seq Scan' and node.get('Relation Name') in WATCHED_TABLES:
+            scans.append(node['Relation Name'])
+        nodes.extend(node.get('Plans', []))
+    return json.dumps(plan, indent=2), scans
+
+
+SQLITE_SCAN = re.compile(r'\bSCAN (\w+)(?: AS \w+)?(?! USING)\s*$')
+
+
+def _sqlite_plan(queryset):
+    plan = queryset.explain()
+    scans = []
+    for line in plan.splitlines():
+        match = SQLITE_SCAN.search(line)
+        if match and match.group(1) in WATCHED_TABLES:
+            scans.append(match.group(1))
+    return plan, scans
+
+
+def explain(queryset):
+    """(teks plan, list tabel yang di-seq scan)"""
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        return _postgres_plan(queryset)
+    if vendor == 'sqlite':
+        return _sqlite_plan(queryset)
+    raise NotImplementedError(f"EXPLAIN check not supported for {vendor}")
+
+
+def check(names=None, group_id=None, today=None, now=None):
+    """Jalankan EXPLAIN untuk HOT_QUERIES; return list PlanResult"""
+    from .models import DeviceGroup
+
+    today = today or timezone.localdate()
+    now = now or time(12, 0)
+    if group_id is None:
+        group_id = DeviceGroup.objects.values_list('id', flat=True).first() or 0
+
+    connection = connections['default']
+    results = []
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        for name, build in HOT_QUERIES.items():
+            if names and name not in names:
+                continue
+            queryset = build(group_id, today, now)
+            plan, scans = explain(queryset)
+            results.append(PlanResult(name, str(queryset.query), plan, scans))
+    return results
+
+
+def seed(schedules_per_group=2000, groups=5, devices_per_group=4):
+    """
+    Data sintetis untuk pemeriksaan plan: schedule sekali tayang tersebar
+    setahun ke depan dan sebagian kecil schedule berulang, dipublish per grup
+    lewat bulk_create_schedules. Panggil di dalam transaksi yang di-rollback.
+    """
+    from .models import Device, DeviceGroup, Schedule
+    from .recurrence import build_rule
+    from .schedule_builder import bulk_create_schedules
+
+    today = timezone.localdate()
+    rules = ('Daily', 'Weekly', 'Monthly')
+    for group_index in range(groups):
+        group = DeviceGroup.objects.create(name=f"plan-check-{group_index}")
+        devices = Device.objects.bulk_create([
+            Device(
+                name=f"plan-check-{group_index}-{device_index}",
+                ip_address=f"10.{200 + group_index}.0.{device_index + 1}",
+                user_agent='check_query_plans',
+                group=group,
+            )
+            for device_index in range(devices_per_group)
+        ])
+
+        schedules = []
+        for index in range(schedules_per_group):
+            playback_date = today + timedelta(days=index % 365)
+            start = datetime.combine(playback_date, time(0)) + timedelta(minutes=(index * 7) % (23 * 60))
+            recurring = index % 20 == 0
+            schedules.append(Schedule(
+                schedule_name=f"plan-check {group_index}-{index}",
+                schedule_type=rules[index % 3] if recurring else 'None',
+                publish_status='Published' if index % 4 else 'Draft',
+                playback_date=playback_date,
+                playback_start=start.time(),
+                playback_end=(start + timedelta(minutes=30)).time(),
+                recurrence=build_rule(rules[index % 3], playback_date) if recurring else '',
+            ))
+        bulk_create_schedules(schedules, devices)
+
+    connection = connections['default']
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            for table in WATCHED_TABLES:
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(table)}')
+        elif connection.vendor == 'sqlite':
+            cursor.execute('ANALYZE')
+    logger.debug(f"[QUERY_PLANS] Seeded {groups * schedules_per_group} schedules")
@@ -0,0 +1,134 @@
+"""
+Aturan pengulangan schedule (RRULE, RFC 5545) lewat python-dateutil.
+
+Schedule Daily/Weekly/Monthly/List disimpan sebagai satu baris: playback_date
+adalah tanggal pertama (DTSTART), ``recurrence`` berisi RRULE dan
+``recurrence_end`` tanggal kemunculan terakhir. Kemunculan per tanggal hanya
+di-expand untuk jendela yang dibutuhkan (kalender, timeline display, index
+interval, export), sehingga jumlah baris dan join M2M sebanding dengan
+jumlah schedule logis, bukan jumlah kemunculan.
+
+Satu kemunculan yang di-skip/dihapus dikeluarkan dari seri lewat baris
+``EXDATE:YYYYMMDD,...`` di bawah RRULE (lihat ``exclude_date``), sehingga
+kemunculan lain tidak ikut berubah.
+"""
+import copy
+from calendar import monthrange
+from datetime import datetime, time
+from functools import lru_cache
+
+from dateutil.rrule import rrulestr
+
+SCHEDULE_RULES = {
+    'Daily': 'FREQ=DAILY;COUNT=7',
+    'Monthly': 'FREQ=MONTHLY;COUNT=12',
+    'List': 'FREQ=DAILY;COUNT=365',
+}
+
+
+def build_rule(schedule_type, base_date):
+    """RRULE untuk schedule_type dari form; '' untuk schedule sekali tayang"""
+    if schedule_type == 'Weekly':
+        last_day = base_date.replace(day=monthrange(base_date.year, base_date.month)[1])
+        return f"FREQ=WEEKLY;UNTIL={last_day:%Y%m%d}"
+    rule = SCHEDULE_RULES.get(schedule_type, '')
+    if schedule_type == 'Monthly' and base_date.day > 28:
+        # Sama seperti relativedelta: tanggal 29-31 jatuh ke hari terakhir bulan pendek
+        days = ','.join(str(day) for day in range(28, base_date.day + 1))
+        rule += f";BYMONTHDAY={days};BYSETPOS=-1"
+    return rule
+
+
+def split_rule(rule):
+    """(baris RRULE, set tanggal EXDATE) dari nilai Schedule.recurrence"""
+    rrule_line, _, exdate_line = rule.partition('\nEXDATE:')
+    exdates = {datetime.strptime(value, '%Y%m%d').date() for value in exdate_line.split(',') if value}
+    return rrule_line, exdates
+
+
+def exclude_date(rule, day):
+    """Rule yang sama tanpa kemunculan pada `day`"""
+    rrule_line, exdates = split_rule(rule)
+    exdates.add(day)
+    return f"{rrule_line}\nEXDATE:{','.join(f'{exdate:%Y%m%d}' for exdate in sorted(exdates))}"
+
+
+@lru_cache(maxsize=1024)
+def _parse(rule, dtstart):
+    return rrulestr(rule, dtstart=datetime.combine(dtstart, time.min))
+
+
+def occurrence_dates(first_date, rule, start=None, end=None):
+    """Tanggal kemunculan dalam [start, end] (inklusif, None = tanpa batas)"""
+    if not first_date:
+        return []
+    if not rule:
+        if (start is None or first_date >= start) and (end is None or first_date <= end):
+            return [first_date]
+        return []
+
+    parsed = _parse(rule, first_date)
+    lower = datetime.combine(max(start, first_date) if start else first_date, time.min)
+    if end is None:
+        return [occurrence.date() for occurrence in parsed.xafter(lower, inc=True)]
+    return [
+        occurrence.date()
+        for occurrence in parsed.between(lower, datetime.combine(end, time.min), inc=True)
+    ]
+
+
+def last_occurrence(first_date, rule):
+    if not first_date or not rule:
+        return first_date
+    last = None
+    for last in _parse(rule, first_date):
+        pass
+    return last.date() if last else first_date
+
+
+def occurs_on(schedule, day):
+    return bool(occurrence_dates(schedule.playback_date, schedule.recurrence, day, day))
+
+
+def expand_occurrences(schedules, start, end):
+    """
+    Expand schedule menjadi satu instance per kemunculan dalam [start, end].
+    Instance adalah salinan dangkal dengan playback_date = tanggal kemunculan,
+    sehingga kode yang membaca schedule.playback_date tetap bekerja.
+    """
+    occurrences = []
+    for schedule in schedules:
+        for day in occurrence_dates(schedule.playback_date, schedule.recurrence, start, end):
+            if day == schedule.playback_date:
+                occurrences.append(schedule)
+                continue
+            occurrence = copy.copy(schedule)
+            occurrence.playback_date = day
+            occurrences.append(occurrence)
+    occurrences.sort(key=lambda s: (s.playback_date, s.playback_start or time.min, s.pk))
+    return occurrences
+
+
+def recurring_ids(rows, start, end):
+    """Id dari (id, playback_date, recurrence) yang punya kemunculan di [start, end]"""
+    return [
+        schedule_id for schedule_id, first_date, rule in rows
+        if occurrence_dates(first_date, rule, start, end)
+    ]
+
+
+def describe(rule):
+    """Teks singkat untuk export/admin, mis. 'FREQ=DAILY;COUNT=7' -> 'Daily x7'"""
+    if not rule:
+        return '-'
+    rule, exdates = split_rule(rule)
+    parts = dict(part.split('=', 1) for part in rule.split(';') if '=' in part)
+    text = parts.get('FREQ', '').capitalize()
+    if 'COUNT' in parts:
+        text += f" x{parts['COUNT']}"
+    if 'UNTIL' in parts:
+        until = parts['UNTIL'][:8]
+        text += f" until {until[:4]}-{until[4:6]}-{until[6:8]}"
+    if exdates:
+        text += f", {len(exdates)} excluded"
+    return text
@@ -0,0 +1,193 @@
+"""
+Cache rendition hasil encode ffmpeg berbasis isi file (content-addressed).
+
+Key rendition dibentuk dari hash SHA-256 file sumber, resolusi target,
+durasi/trim, dan quality settings yang dipakai encoder. Jika key yang sama
+pernah di-encode, hasilnya cukup di-copy ke output tanpa menjalankan ffmpeg
+lagi. File disimpan di MEDIA_ROOT/renditions dan dibuang berdasarkan LRU
+(mtime) ketika total ukurannya melewati RENDITION_CACHE_MAX_BYTES.
+
+Selalu copy, bukan hardlink: output akhirnya dipindah ke MEDIA_ROOT, dan
+os.utime() saat cache hit tidak boleh mengubah mtime media yang sudah
+dipublish (MediaMetadata dan ETag media_server bergantung padanya).
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Setting yang tidak mengubah isi hasil encode, tidak ikut membentuk key
+IGNORED_QUALITY_KEYS = {'threads'}
+
+
+class RenditionCache:
+    def __init__(self, root=None, max_bytes=None):
+        self._root = root
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hashes = {}
+        self._total_bytes = None
+        self.counters = {'hits': 0, 'misses': 0, 'evicted': 0}
+
+    @property
+    def root(self):
+        root = self._root or settings.SIGNAGE_SETTINGS.get('RENDITION_CACHE_DIR') \
+            or os.path.join(str(settings.MEDIA_ROOT), 'renditions')
+        os.makedirs(root, exist_ok=True)
+        return root
+
+    @property
+    def max_bytes(self):
+        if self._max_bytes is not None:
+            return self._max_bytes
+        return settings.SIGNAGE_SETTINGS.get('RENDITION_CACHE_MAX_BYTES', 5 * 1024 ** 3)
+
+    def source_hash(self, path):
+        """SHA-256 isi file, di-memo per (path, size, mtime) supaya tidak dihitung ulang"""
+        stat = os.stat(path)
+        memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._hashes.get(memo_key)
+        if digest is not None:
+            return digest
+
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        with self._lock:
+            self._hashes[memo_key] = digest
+        return digest
+
+    def make_key(self, source_path, kind, width, height, duration=None, quality_settings=None):
+        quality = {
+            key: value for key, value in (quality_settings or {}).items()
+            if key not in IGNORED_QUALITY_KEYS
+        }
+        payload = json.dumps({
+            'source': self.source_hash(source_path),
+            'kind': kind,
+            'size': [width, height],
+            'duration': duration,
+            'quality': quality,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.mp4")
+
+    def lookup(self, key):
+        """Path rendition jika ada (dan tandai baru dipakai untuk LRU)"""
+        path = self._path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.counters['misses'] += 1
+            return None
+        with self._lock:
+            self.counters['hits'] += 1
+        return path
+
+    def store(self, key, produced_path):
+        """Simpan salinan hasil encode ke cache; file asli tetap di tempatnya"""
+        path = self._path(key)
+        if os.path.exists(path):
+            return path
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        staging = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        try:
+            shutil.copyfile(produced_path, staging)
+            os.replace(staging, path)
+        except OSError as e:
+            logger.warning(f"Could not store rendition {key}: {str(e)}")
+            if os.path.exists(staging):
+                os.remove(staging)
+            return None
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += os.path.getsize(path)
+        self.evict()
+        return path
+
+    def fetch_or_encode(self, key, output_path, encode):
+        """
+        Isi output_path dari cache jika key sudah ada; jika belum, jalankan
+        encode(output_path) lalu simpan hasilnya ke cache. encode boleh
+        return False jika hasilnya tidak dibuat dengan setting yang membentuk
+        key (mis. fallback encoder), sehingga tidak disimpan.
+        Return True jika hasil diambil dari cache.
+        """
+        cached = self.lookup(key)
+        if cached is not None:
+            try:
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+                shutil.copyfile(cached, output_path)
+                logger.info(f"Rendition cache hit {key[:12]} -> {output_path}")
+                return True
+            except OSError as e:
+                logger.warning(f"Could not reuse rendition {key}: {str(e)}")
+
+        cacheable = encode(output_path)
+        if cacheable is not False and os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            self.store(key, output_path)
+        return False
+
+    def _scan(self):
+        entries = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if not filename.endswith('.mp4'):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self):
+        """Hapus rendition yang paling lama tidak dipakai sampai total <= max_bytes"""
+        with self._lock:
+            if self._total_bytes is not None and self._total_bytes <= self.max_bytes:
+                return 0
+
+            entries = self._scan()
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+
+            self._total_bytes = total
+            self.counters['evicted'] += removed
+
+        if removed:
+            logger.info(f"Evicted {removed} renditions from cache")
+        return removed
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counters, total_bytes=self._total_bytes, max_bytes=self.max_bytes)
+
+
+rendition_cache = RenditionCache()
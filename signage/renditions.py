@@ -0,0 +1,76 @@
+"""
+Rendition Content per resolusi layar.
+
+Satu upload di-encode ke beberapa resolusi (RENDITION_LADDER ditambah semua
+resolusi yang benar-benar ada di Device.resolution). Saat display meminta
+media, dipilih rendition terkecil yang masih menutupi layar device, sehingga
+file 4K tidak dikirim ke layar 720p.
+"""
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LADDER = [(1280, 720), (1920, 1080), (3840, 2160)]
+
+
+def parse_resolution(value):
+    """'1920x1080' -> (1920, 1080), None jika tidak valid"""
+    if not value or value == 'Unknown':
+        return None
+    try:
+        width, height = map(int, str(value).lower().split('x'))
+    except (TypeError, ValueError):
+        return None
+    if width <= 0 or height <= 0:
+        return None
+    return width, height
+
+
+def rendition_targets(source_size=None):
+    """
+    Daftar resolusi yang perlu dibuat untuk satu Content. Resolusi di atas
+    ukuran sumber dilewati (tidak ada gunanya upscale), kecuali tidak ada
+    target lain yang tersisa.
+    """
+    from .models import Device
+
+    ladder = settings.SIGNAGE_SETTINGS.get('RENDITION_LADDER', DEFAULT_LADDER)
+    targets = {tuple(size) for size in ladder}
+    for resolution in Device.objects.exclude(resolution='Unknown').values_list('resolution', flat=True).distinct():
+        size = parse_resolution(resolution)
+        if size:
+            targets.add(size)
+
+    targets = sorted(targets, key=lambda size: (size[0] * size[1], size))
+    if source_size:
+        source_long, source_short = max(source_size), min(source_size)
+        fitting = [size for size in targets if max(size) <= source_long and min(size) <= source_short]
+        targets = fitting or targets[:1]
+    return targets
+
+
+def _covers(size, screen):
+    """Apakah rendition `size` cukup besar untuk layar, tanpa peduli orientasi"""
+    return max(size) >= max(screen) and min(size) >= min(screen)
+
+
+def pick_rendition(renditions, resolution):
+    """
+    Pilih rendition untuk layar dengan `resolution`. `renditions` berisi
+    (width, height, url). Prioritas: ukuran persis, lalu rendition terkecil
+    yang menutupi layar, lalu rendition terbesar. None jika tidak ada.
+    """
+    screen = parse_resolution(resolution)
+    if not renditions or screen is None:
+        return None
+
+    by_area = sorted(renditions, key=lambda item: item[0] * item[1])
+    for width, height, url in by_area:
+        if (width, height) == screen:
+            return url
+    for width, height, url in by_area:
+        if _covers((width, height), screen):
+            return url
+    return by_area[-1][2]
@@ -0,0 +1,74 @@
+"""
+Pembuatan schedule secara massal.
+
+``create_schedules`` dulu memanggil ``publish_to.set()`` per schedule (SELECT
++ INSERT per baris, 365x untuk tipe List). Di sini semua baris through table
+``Schedule.publish_to`` dibangun di memory lalu di-insert dengan satu
+``bulk_create`` per chunk. Karena bulk insert tidak mengirim m2m_changed,
+counter grup, ScheduleGroup, schedule index, timeline dan cache kalender
+di-update sekali untuk seluruh batch.
+"""
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+from .recurrence import build_rule, occurrence_dates
+
+logger = logging.getLogger(__name__)
+
+
+def _batch_size():
+    return settings.SIGNAGE_SETTINGS.get('SCHEDULE_BULK_BATCH_SIZE', 2000)
+
+
+def expand_dates(schedule_type, base_date):
+    """Tanggal tayang untuk satu submit form berdasarkan schedule_type"""
+    return occurrence_dates(base_date, build_rule(schedule_type, base_date))
+
+
+def bulk_create_schedules(schedules, devices, batch_size=None):
+    """
+    Simpan schedule baru dan publish ke `devices` dengan bulk insert.
+    Return list schedule yang sudah punya pk.
+    """
+    from .calendar_data import invalidate_calendar
+    from .counters import group_counters
+    from .models import Schedule
+    from .schedule_groups import schedule_groups
+    from .schedule_index import schedule_index
+    from .timeline import invalidate_group_timeline
+
+    batch_size = batch_size or _batch_size()
+    through = Schedule.publish_to.through
+    device_ids = [device.pk for device in devices]
+    group_ids = {device.group_id for device in devices if device.group_id}
+
+    for schedule in schedules:
+        schedule.refresh_recurrence_end()
+
+    with transaction.atomic():
+        created = Schedule.objects.bulk_create(schedules, batch_size=batch_size)
+
+        through.objects.bulk_create([
+            through(schedule_id=schedule.pk, device_id=device_id)
+            for schedule in created for device_id in device_ids
+        ], batch_size=batch_size, ignore_conflicts=True)
+        schedule_groups.schedules_created(created, group_ids)
+
+        # Schedule baru belum mencakup grup mana pun, jadi setiap grup +len(created)
+        for group_id in group_ids:
+            group_counters.add(group_id, 'schedule_count', len(created))
+
+        def _update_index():
+            for schedule in created:
+                schedule_index.upsert(schedule, groups=group_ids)
+
+        transaction.on_commit(_update_index)
+        invalidate_group_timeline(*group_ids)
+        invalidate_calendar()
+
+    logger.debug(
+        f"[SCHEDULES] Bulk created {len(created)} schedules x {len(device_ids)} devices"
+    )
+    return created
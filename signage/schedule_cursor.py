@@ -0,0 +1,90 @@
+"""
+Navigasi prev/next schedule hari ini dengan keyset cursor.
+
+Cursor adalah pasangan (playback_start, id) dari schedule yang sedang
+ditampilkan. Tetangganya diambil dengan satu query keyset
+``(playback_start, id) > cursor ORDER BY playback_start, id LIMIT 2``
+(atau kebalikannya untuk prev) yang sekaligus memproyeksikan file
+content/playlist, sehingga biaya per klik konstan berapapun jumlah schedule
+hari itu.
+"""
+from datetime import time
+
+from django.db.models import Q
+
+from .calendar_data import resolve_media
+
+NAV_FIELDS = (
+    'id', 'schedule_name', 'playback_start', 'playback_end',
+    'content_id', 'content__file', 'playlist_id', 'playlist__file',
+)
+
+
+def encode_cursor(playback_start, schedule_id):
+    if playback_start is None or schedule_id is None:
+        return ''
+    return f"{playback_start.isoformat()}|{schedule_id}"
+
+
+def decode_cursor(cursor):
+    """'08:00:00|12' -> (time(8, 0), 12); ValueError jika format salah"""
+    start, _, schedule_id = (cursor or '').partition('|')
+    return time.fromisoformat(start), int(schedule_id)
+
+
+def todays_schedules(day, now_time, group_ids=()):
+    """Schedule Published yang tayang hari ini dan belum selesai"""
+    from .models import Schedule
+
+    schedules = Schedule.objects.all()
+    if group_ids:
+        schedules = schedules.for_groups(group_ids, day, day)
+    return schedules.with_recurring_ids(day, day).filter(
+        publish_status='Published',
+        playback_start__isnull=False,
+        playback_end__gte=now_time,
+    )
+
+
+def serialize(row):
+    media_url, media_type = resolve_media(
+        row['content_id'], row['content__file'], row['playlist_id'], row['playlist__file']
+    )
+    return {
+        'id': row['id'],
+        'name': row['schedule_name'],
+        'schedule_name': row['schedule_name'],
+        'start_time': row['playback_start'].strftime('%H:%M') if row['playback_start'] else '',
+        'end_time': row['playback_end'].strftime('%H:%M') if row['playback_end'] else '',
+        'media_url': media_url,
+        'media_type': media_type,
+        'cursor': encode_cursor(row['playback_start'], row['id']),
+    }
+
+
+def neighbour(schedules, cursor, direction):
+    """
+    Schedule setelah ('next') atau sebelum ('prev') cursor.
+    Return (dict schedule atau None, masih ada schedule lain di arah itu).
+    """
+    start, schedule_id = cursor
+    if direction == 'next':
+        rows = schedules.filter(
+            Q(playback_start__gt=start) | Q(playback_start=start, id__gt=schedule_id)
+        ).order_by('playback_start', 'id')
+    elif direction == 'prev':
+        rows = schedules.filter(
+            Q(playback_start__lt=start) | Q(playback_start=start, id__lt=schedule_id)
+        ).order_by('-playback_start', '-id')
+    else:
+        raise ValueError(f"Invalid direction: {direction}")
+
+    rows = list(rows.values(*NAV_FIELDS)[:2])
+    if not rows:
+        return None, False
+    return serialize(rows[0]), len(rows) > 1
+
+
+def first(schedules):
+    row = schedules.order_by('playback_start', 'id').values(*NAV_FIELDS).first()
+    return serialize(row) if row else None
@@ -0,0 +1,124 @@
+"""
+Pemeliharaan tabel ScheduleGroup (schedule -> grup yang didenormalisasi).
+
+Query "schedule untuk grup G" dulu selalu join Schedule -> through table
+publish_to -> Device -> DeviceGroup dan butuh ``.distinct()``. ScheduleGroup
+menyimpan satu baris per (schedule, grup) beserta salinan playback_date,
+playback_start, playback_end, recurrence_end dan publish_status, sehingga
+"schedule grup G pada tanggal D" cukup satu range scan index
+``(group, playback_date, playback_start)`` (lihat
+``Schedule.objects.for_groups``).
+
+Baris di-sync di transaksi yang sama dari m2m_changed publish_to, perpindahan
+grup device (Device.save, dipakai device_update), penghapusan device dan
+``bulk_create_schedules``. ``rebuild()`` (command ``rebuild_schedule_groups``)
+membandingkan tabel dengan through table untuk memperbaiki drift, misalnya
+setelah ``QuerySet.update`` atau SQL manual yang melewati signal.
+"""
+import logging
+
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_COLUMNS = ('playback_date', 'playback_start', 'playback_end', 'recurrence_end', 'publish_status')
+
+
+def _batch_size():
+    return settings.SIGNAGE_SETTINGS.get('SCHEDULE_BULK_BATCH_SIZE', 2000)
+
+
+def _chunks(values, size):
+    values = list(values)
+    for offset in range(0, len(values), size):
+        yield values[offset:offset + size]
+
+
+class ScheduleGroups:
+
+    def _link(self, schedule_id, group_id, columns):
+        from .models import ScheduleGroup
+
+        return ScheduleGroup(schedule_id=schedule_id, group_id=group_id, **columns)
+
+    def _sync_chunk(self, schedule_ids):
+        """Samakan baris ScheduleGroup untuk `schedule_ids`; return (ditambah, dihapus)"""
+        from .models import Schedule, ScheduleGroup
+
+        wanted = set(Schedule.publish_to.through.objects.filter(
+            schedule_id__in=schedule_ids, device__group__isnull=False
+        ).values_list('schedule_id', 'device__group_id').distinct())
+        existing = set(ScheduleGroup.objects.filter(
+            schedule_id__in=schedule_ids
+        ).values_list('schedule_id', 'group_id'))
+
+        stale_by_group = {}
+        for schedule_id, group_id in existing - wanted:
+            stale_by_group.setdefault(group_id, []).append(schedule_id)
+        for group_id, stale_ids in stale_by_group.items():
+            ScheduleGroup.objects.filter(group_id=group_id, schedule_id__in=stale_ids).delete()
+
+        missing = wanted - existing
+        if missing:
+            schedules = {
+                row.pop('id'): row for row in Schedule.objects.filter(
+                    pk__in={schedule_id for schedule_id, _ in missing}
+                ).values('id', *SCHEDULE_COLUMNS)
+            }
+            ScheduleGroup.objects.bulk_create([
+                self._link(schedule_id, group_id, schedules[schedule_id])
+                for schedule_id, group_id in missing if schedule_id in schedules
+            ], ignore_conflicts=True)
+        return len(missing), len(existing - wanted)
+
+    def sync(self, schedule_ids):
+        added = removed = 0
+        for chunk in _chunks(set(schedule_ids), _batch_size()):
+            chunk_added, chunk_removed = self._sync_chunk(chunk)
+            added += chunk_added
+            removed += chunk_removed
+        return added, removed
+
+    def device_moved(self, device_id):
+        """Device pindah grup: sync semua schedule yang dipublish ke device itu"""
+        from .models import Schedule
+
+        self.sync(Schedule.publish_to.through.objects.filter(
+            device_id=device_id
+        ).values_list('schedule_id', flat=True))
+
+    def schedules_created(self, schedules, group_ids):
+        """Schedule baru dari bulk_create_schedules yang dipublish ke semua device grup"""
+        from .models import ScheduleGroup
+
+        ScheduleGroup.objects.bulk_create([
+            self._link(schedule.pk, group_id, {column: getattr(schedule, column) for column in SCHEDULE_COLUMNS})
+            for schedule in schedules for group_id in group_ids
+        ], batch_size=_batch_size())
+
+    def refresh_columns(self, schedule):
+        from .models import ScheduleGroup
+
+        ScheduleGroup.objects.filter(schedule_id=schedule.pk).update(
+            **{column: getattr(schedule, column) for column in SCHEDULE_COLUMNS}
+        )
+
+    def rebuild(self):
+        """
+        Sync semua schedule dan samakan kolom salinan dengan Schedule.
+        Return (baris ditambah, baris dihapus).
+        """
+        from .models import Schedule, ScheduleGroup
+
+        added, removed = self.sync(Schedule.objects.values_list('id', flat=True))
+        source = Schedule.objects.filter(pk=OuterRef('schedule_id'))
+        ScheduleGroup.objects.update(**{
+            column: Subquery(source.values(column)[:1]) for column in SCHEDULE_COLUMNS
+        })
+        if added or removed:
+            logger.warning(f"[SCHEDULE_GROUPS] Rebuilt: {added} rows added, {removed} rows removed")
+        return added, removed
+
+
+schedule_groups = ScheduleGroups()
@@ -0,0 +1,221 @@
+"""
+Index interval in-process untuk schedule Published.
+
+Interval (playback_start, playback_end) dikelompokkan per tanggal kemunculan
+(schedule berulang masuk ke setiap tanggal RRULE-nya), lalu
+disimpan terurut berdasarkan waktu mulai bersama prefix max dari waktu selesai.
+Dengan begitu lookup ``at()`` ("apa yang tayang pada jam T") dan
+``next_start()`` ("schedule berikutnya setelah T") cukup binary search pada
+satu hari saja, tidak peduli seberapa panjang kalender.
+
+Index dibangun dari database pada pemakaian pertama dan di-update secara
+incremental dari signal Schedule. Karena setiap proses worker punya salinan
+sendiri, setiap perubahan menaikkan versi bersama di cache (setelah commit);
+proses yang melihat versi berbeda membangun ulang index-nya. Dengan cache
+per-proses (LocMemCache) versi itu tidak terlihat proses lain, sehingga
+batasnya tetap SCHEDULE_INDEX_TTL detik. Pengecekan konflik sebelum
+menyimpan schedule tidak memakai index ini, melainkan
+``Schedule.objects.overlap_dates()`` yang selalu membaca database.
+"""
+from bisect import bisect_right, insort
+from collections import namedtuple
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .recurrence import occurrence_dates
+
+logger = logging.getLogger(__name__)
+
+Interval = namedtuple('Interval', ['start', 'end', 'schedule_id', 'groups'])
+
+VERSION_KEY = 'signage:schedule-index-version'
+
+
+class _DayBucket:
+    """Interval satu tanggal, terurut berdasarkan (start, schedule_id)"""
+
+    def __init__(self):
+        self.intervals = []
+        self._starts = None
+        self._max_ends = None
+
+    def add(self, interval):
+        insort(self.intervals, interval, key=lambda i: (i.start, i.schedule_id))
+        self._starts = self._max_ends = None
+
+    def remove(self, schedule_id):
+        self.intervals = [i for i in self.intervals if i.schedule_id != schedule_id]
+        self._starts = self._max_ends = None
+
+    def _ensure_arrays(self):
+        if self._starts is None:
+            self._starts = [i.start for i in self.intervals]
+            self._max_ends = []
+            running_max = None
+            for interval in self.intervals:
+                running_max = interval.end if running_max is None else max(running_max, interval.end)
+                self._max_ends.append(running_max)
+
+    def covering(self, point):
+        """Interval dengan start <= point <= end, terurut berdasarkan start"""
+        self._ensure_arrays()
+        found = []
+        idx = bisect_right(self._starts, point) - 1
+        while idx >= 0 and self._max_ends[idx] >= point:
+            interval = self.intervals[idx]
+            if interval.end >= point:
+                found.append(interval)
+            idx -= 1
+        found.reverse()
+        return found
+
+    def starting_after(self, point):
+        self._ensure_arrays()
+        return self.intervals[bisect_right(self._starts, point):]
+
+
+class ScheduleIntervalIndex:
+    """Index interval schedule Published per tanggal, dengan filter grup"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._buckets = {}
+        self._dates = {}
+        self._built_at = None
+        self._floor_date = None
+        self._version = None
+
+    def _ttl(self):
+        return settings.SIGNAGE_SETTINGS.get('SCHEDULE_INDEX_TTL', 300)
+
+    def _ensure_built(self):
+        if (self._built_at is None
+                or time.monotonic() - self._built_at > self._ttl()
+                or self._floor_date != timezone.localdate()
+                or self._version != cache.get(VERSION_KEY, 0)):
+            self.rebuild()
+
+    def _bump_version(self):
+        """Tandai index proses lain basi; salinan proses ini sudah di-update langsung"""
+        try:
+            version = cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.add(VERSION_KEY, 1, timeout=None)
+            version = cache.get(VERSION_KEY, 0)
+        with self._lock:
+            if self._version is not None and self._version == version - 1:
+                self._version = version
+
+    def _changed(self):
+        transaction.on_commit(self._bump_version, robust=True)
+
+    def rebuild(self):
+        """Bangun ulang index dari schedule Published mulai hari ini"""
+        from .models import Schedule, ScheduleGroup
+
+        floor_date = timezone.localdate()
+        # Versi dibaca sebelum query: perubahan selama build memicu build berikutnya
+        version = cache.get(VERSION_KEY, 0)
+        rows = list(Schedule.objects.active_from(floor_date).filter(
+            publish_status='Published',
+            playback_start__isnull=False,
+            playback_end__isnull=False,
+        ).values_list('id', 'playback_date', 'recurrence', 'playback_start', 'playback_end'))
+
+        groups_by_schedule = {}
+        memberships = ScheduleGroup.objects.filter(
+            publish_status='Published',
+            recurrence_end__gte=floor_date,
+        ).values_list('schedule_id', 'group_id')
+        for schedule_id, group_id in memberships:
+            groups_by_schedule.setdefault(schedule_id, set()).add(group_id)
+
+        buckets = {}
+        dates = {}
+        for schedule_id, playback_date, rule, start, end in rows:
+            interval = Interval(start, end, schedule_id, frozenset(groups_by_schedule.get(schedule_id, ())))
+            dates[schedule_id] = occurrence_dates(playback_date, rule, floor_date)
+            for day in dates[schedule_id]:
+                buckets.setdefault(day, _DayBucket()).add(interval)
+
+        with self._lock:
+            self._buckets = buckets
+            self._dates = dates
+            self._floor_date = floor_date
+            self._built_at = time.monotonic()
+            self._version = version
+        logger.debug(f"[SCHEDULE_INDEX] Rebuilt with {len(rows)} schedules")
+
+    def clear(self):
+        with self._lock:
+            self._buckets = {}
+            self._dates = {}
+            self._built_at = None
+        self._changed()
+
+    def _discard(self, schedule_id):
+        for playback_date in self._dates.pop(schedule_id, ()):
+            self._buckets[playback_date].remove(schedule_id)
+
+    def discard(self, schedule_id):
+        with self._lock:
+            self._discard(schedule_id)
+        self._changed()
+
+    def upsert(self, schedule, groups=None):
+        """Update index untuk satu schedule; groups di-query jika tidak diberikan"""
+        self._changed()
+        with self._lock:
+            if self._built_at is None:
+                return
+            self._discard(schedule.pk)
+            if (schedule.publish_status != 'Published' or not schedule.playback_date
+                    or not schedule.playback_start or not schedule.playback_end):
+                return
+            days = occurrence_dates(schedule.playback_date, schedule.recurrence, self._floor_date)
+            if not days:
+                return
+            if groups is None:
+                groups = schedule.get_related_groups().values_list('id', flat=True)
+            interval = Interval(schedule.playback_start, schedule.playback_end, schedule.pk, frozenset(groups))
+            for day in days:
+                self._buckets.setdefault(day, _DayBucket()).add(interval)
+            self._dates[schedule.pk] = days
+
+    def _filter(self, intervals, groups, exclude):
+        if groups:
+            groups = set(groups)
+            intervals = [i for i in intervals if i.groups & groups]
+        if exclude is not None:
+            intervals = [i for i in intervals if i.schedule_id != int(exclude)]
+        return intervals
+
+    def at(self, playback_date, point, groups=None, exclude=None):
+        """Schedule yang tayang pada jam `point`, terurut berdasarkan jam mulai"""
+        with self._lock:
+            self._ensure_built()
+            bucket = self._buckets.get(playback_date)
+            if bucket is None:
+                return []
+            return self._filter(bucket.covering(point), groups, exclude)
+
+    def next_start(self, playback_date, point, groups=None, exclude=None):
+        """Schedule pertama pada tanggal tersebut yang dimulai setelah `point`"""
+        with self._lock:
+            self._ensure_built()
+            bucket = self._buckets.get(playback_date)
+            if bucket is None:
+                return None
+            for interval in bucket.starting_after(point):
+                if self._filter([interval], groups, exclude):
+                    return interval
+            return None
+
+
+schedule_index = ScheduleIntervalIndex()
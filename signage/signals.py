@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Dikirim dengan sender=Device, device_ids=[...] dan is_online=True/False
+# setiap kali status koneksi sekumpulan device berubah.
+device_status_changed = Signal()
@@ -0,0 +1,117 @@
+"""
+Pemakaian storage per folder upload tanpa os.walk per request.
+
+Setiap upload/penggantian/penghapusan file Content dan Playlist menerapkan
+delta ``size_bytes`` dan ``file_count`` ke baris FolderUsage folder tersebut
+(``UPDATE ... SET x = x + delta`` setelah commit). Folder yang belum punya
+baris di-scan sekali; ``rescan()`` (command ``rescan_storage_usage``)
+menghitung ulang dari disk untuk memperbaiki drift akibat file yang
+diubah di luar aplikasi.
+"""
+import logging
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_FOLDERS = ('content_uploads', 'playlist_uploads')
+SOURCE_SIZE_CACHE_PREFIX = 'signage:source-size'
+
+
+def folder_for(name):
+    """'content_uploads/a.mp4' -> 'content_uploads'"""
+    return name.replace('\\', '/').split('/', 1)[0] if name and '/' in name else ''
+
+
+def walk_size(path):
+    """(total bytes, jumlah file) di bawah `path`"""
+    total_size = file_count = 0
+    for dirpath, dirnames, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total_size += os.path.getsize(os.path.join(dirpath, filename))
+                file_count += 1
+            except OSError:
+                pass
+    return total_size, file_count
+
+
+def source_tree_size(path):
+    """Ukuran folder source code; hanya berubah saat deploy, jadi di-cache lama"""
+    key = f"{SOURCE_SIZE_CACHE_PREFIX}:{path}"
+    size = cache.get(key)
+    if size is None:
+        size, _ = walk_size(path)
+        cache.set(key, size, settings.SIGNAGE_SETTINGS.get('SOURCE_SIZE_CACHE_TTL', 60 * 60))
+    return size
+
+
+class StorageUsage:
+
+    def rescan(self, *folders):
+        from .models import FolderUsage
+
+        usage = {}
+        for folder in folders or UPLOAD_FOLDERS:
+            size, count = walk_size(os.path.join(str(settings.MEDIA_ROOT), folder))
+            FolderUsage.objects.update_or_create(
+                folder=folder, defaults={'size_bytes': size, 'file_count': count}
+            )
+            usage[folder] = size
+            logger.debug(f"[STORAGE] Rescanned {folder}: {size} bytes, {count} files")
+        return usage
+
+    def _apply(self, folder, size_delta, count_delta):
+        from .models import FolderUsage
+
+        if not folder:
+            return
+        updated = FolderUsage.objects.filter(folder=folder).update(
+            size_bytes=Greatest(F('size_bytes') + Value(size_delta), Value(0)),
+            file_count=Greatest(F('file_count') + Value(count_delta), Value(0)),
+        )
+        if not updated:
+            # Belum pernah dihitung: scan sekali, hasilnya sudah termasuk perubahan ini
+            self.rescan(folder)
+
+    def file_replaced(self, old_name, old_size, new_name, new_size):
+        """File baru disimpan (upload/transcode); file lama dihitung keluar jika sudah dihapus"""
+        def _update():
+            if new_name and new_size is not None:
+                self._apply(folder_for(new_name), new_size, 1)
+            if old_name and old_name != new_name:
+                self._forget(old_name, old_size)
+
+        transaction.on_commit(_update, robust=True)
+
+    def file_removed(self, name, size):
+        transaction.on_commit(lambda: self._forget(name, size), robust=True)
+
+    def _forget(self, name, size):
+        from django.core.files.storage import default_storage
+
+        # Record dihapus tanpa menghapus file: file masih memakai storage
+        if size is None or default_storage.exists(name):
+            return
+        self._apply(folder_for(name), -size, -1)
+
+    def usage(self, *folders):
+        """{folder: size_bytes}; folder yang belum punya baris di-scan sekali"""
+        from .models import FolderUsage
+
+        folders = folders or UPLOAD_FOLDERS
+        usage = dict(
+            FolderUsage.objects.filter(folder__in=folders).values_list('folder', 'size_bytes')
+        )
+        missing = [folder for folder in folders if folder not in usage]
+        if missing:
+            usage.update(self.rescan(*missing))
+        return usage
+
+
+storage_usage = StorageUsage()
@@ -0,0 +1,102 @@
+"""
+Sweeper offline device yang berjalan di luar jalur request.
+
+Secara default (``SIGNAGE_SETTINGS['OFFLINE_SWEEP_IN_PROCESS'] = True``)
+sweeper berjalan sebagai thread daemon di setiap proses web, dinyalakan oleh
+DeviceTrackerMiddleware pada request pertama. Deployment multi-worker bisa
+mematikannya dan menjalankan management command ``sweep_offline_devices
+--loop`` sebagai satu proses terpisah.
+"""
+from datetime import timedelta
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .signals import device_status_changed
+
+logger = logging.getLogger(__name__)
+
+
+def offline_threshold():
+    return settings.SIGNAGE_SETTINGS.get('DEVICE_OFFLINE_THRESHOLD', 60)
+
+
+def sweep_offline_devices(threshold=None, batch_size=500):
+    """
+    Tandai device yang tidak mengirim heartbeat dalam `threshold` detik
+    sebagai offline, per batch. Return jumlah device yang berubah status.
+
+    Baris dikunci (SELECT ... FOR UPDATE SKIP LOCKED) sebelum di-update, jadi
+    heartbeat yang di-flush bersamaan tidak tertimpa dan signal hanya dikirim
+    untuk device yang benar-benar diubah sweep ini.
+    """
+    from .heartbeat import heartbeat_buffer
+    from .models import Device
+
+    heartbeat_buffer.flush()
+    threshold = offline_threshold() if threshold is None else threshold
+    limit = timezone.now() - timedelta(seconds=threshold)
+    total = 0
+
+    while True:
+        with transaction.atomic():
+            ids = list(Device.objects.select_for_update(skip_locked=True).filter(
+                is_online=True,
+                last_updated__lt=limit
+            ).order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if ids:
+                Device.objects.filter(pk__in=ids).update(is_online=False)
+        if not ids:
+            break
+
+        device_status_changed.send(sender=Device, device_ids=ids, is_online=False)
+        total += len(ids)
+
+        if len(ids) < batch_size:
+            break
+
+    if total:
+        logger.info(f"Marked {total} devices as offline")
+    return total
+
+
+class OfflineSweeper:
+    """Thread daemon yang menjalankan sweep secara periodik"""
+
+    def __init__(self):
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def run_forever(self, interval=None, threshold=None, batch_size=500):
+        interval = interval or settings.SIGNAGE_SETTINGS.get('OFFLINE_SWEEP_INTERVAL', 30)
+        while not self._stop.is_set():
+            try:
+                sweep_offline_devices(threshold=threshold, batch_size=batch_size)
+            except Exception as e:
+                logger.error(f"Error marking offline devices: {str(e)}")
+            finally:
+                close_old_connections()
+            self._stop.wait(interval)
+
+    def start(self, **kwargs):
+        """Idempotent; aman dipanggil di setiap request"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self.run_forever, kwargs=kwargs, name='offline-sweeper', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+offline_sweeper = OfflineSweeper()
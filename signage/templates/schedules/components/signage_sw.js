@@ -0,0 +1,160 @@
+// Service worker layar signage: prefetch media dari manifest device dan
+// melayani /media/ dari cache (cache-first, termasuk Range request) agar
+// pemutaran tetap berjalan saat server tidak bisa dihubungi.
+const MEDIA_CACHE = 'signage-media-v1';
+const PAGE_CACHE = 'signage-page-v1';
+const DISPLAY_PATH = '{% url "signage_display" %}';
+const MEDIA_PREFIX = '{{ MEDIA_URL|default:"/media/" }}';
+
+let prefetchRunning = null;
+let pendingManifest = null;
+
+self.addEventListener('install', (event) => {
+    self.skipWaiting();
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil(
+        caches.keys()
+            .then((keys) => Promise.all(
+                keys.filter((key) => key.startsWith('signage-') && key !== MEDIA_CACHE && key !== PAGE_CACHE)
+                    .map((key) => caches.delete(key))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('message', (event) => {
+    const data = event.data || {};
+    if (data.type === 'prefetch' && data.manifest) {
+        event.waitUntil(queuePrefetch(data.manifest));
+    }
+});
+
+function queuePrefetch(manifest) {
+    // Satu prefetch berjalan pada satu waktu; manifest terbaru menggantikan yang menunggu
+    pendingManifest = manifest;
+    if (!prefetchRunning) {
+        prefetchRunning = (async () => {
+            while (pendingManifest) {
+                const next = pendingManifest;
+                pendingManifest = null;
+                await prefetch(next);
+            }
+            prefetchRunning = null;
+        })();
+    }
+    return prefetchRunning;
+}
+
+async function prefetch(manifest) {
+    const cache = await caches.open(MEDIA_CACHE);
+    const wanted = new Set((manifest.media || []).map((item) => item.path));
+
+    // Urutkan media sesuai slot yang paling dulu diputar
+    const order = [];
+    (manifest.items || []).forEach((item) => {
+        if (!order.includes(item.url)) order.push(item.url);
+    });
+    const media = (manifest.media || []).slice().sort((a, b) => {
+        const ia = order.indexOf(a.path), ib = order.indexOf(b.path);
+        return (ia === -1 ? order.length : ia) - (ib === -1 ? order.length : ib);
+    });
+
+    for (const item of media) {
+        const cached = await cache.match(item.path);
+        if (cached && (!item.hash || cached.headers.get('ETag') === `"${item.hash}"`)) {
+            continue;
+        }
+        try {
+            const response = await fetch(item.src, { cache: 'no-store', credentials: 'same-origin' });
+            if (response.status === 200) {
+                await cache.put(item.path, response);
+            }
+        } catch (error) {
+            // Offline: hentikan dan coba lagi pada manifest berikutnya
+            return;
+        }
+    }
+
+    const keys = await cache.keys();
+    await Promise.all(keys
+        .filter((request) => !wanted.has(new URL(request.url).pathname))
+        .map((request) => cache.delete(request)));
+}
+
+function parseRange(header, size) {
+    const match = /^bytes=(\d*)-(\d*)$/.exec((header || '').trim());
+    if (!match || (match[1] === '' && match[2] === '')) return null;
+    let start, end;
+    if (match[1] === '') {
+        start = Math.max(0, size - parseInt(match[2], 10));
+        end = size - 1;
+    } else {
+        start = parseInt(match[1], 10);
+        end = match[2] === '' ? size - 1 : Math.min(parseInt(match[2], 10), size - 1);
+    }
+    return start <= end && start < size ? [start, end] : null;
+}
+
+async function serveMedia(request, pathname) {
+    const cache = await caches.open(MEDIA_CACHE);
+    const cached = await cache.match(pathname);
+    if (!cached) {
+        return fetch(request);
+    }
+
+    const rangeHeader = request.headers.get('Range');
+    if (!rangeHeader) {
+        return cached;
+    }
+
+    // Video meminta Range: potong dari blob yang sudah di-cache
+    const blob = await cached.blob();
+    const range = parseRange(rangeHeader, blob.size);
+    if (!range) {
+        return new Response(null, {
+            status: 416,
+            headers: { 'Content-Range': `bytes */${blob.size}` }
+        });
+    }
+    const [start, end] = range;
+    return new Response(blob.slice(start, end + 1), {
+        status: 206,
+        headers: {
+            'Content-Type': cached.headers.get('Content-Type') || blob.type,
+            'Content-Range': `bytes ${start}-${end}/${blob.size}`,
+            'Content-Length': String(end - start + 1),
+            'Accept-Ranges': 'bytes'
+        }
+    });
+}
+
+async function serveDisplay(request) {
+    const cache = await caches.open(PAGE_CACHE);
+    try {
+        const response = await fetch(request);
+        if (response.ok) {
+            await cache.put(DISPLAY_PATH, response.clone());
+        }
+        return response;
+    } catch (error) {
+        const cached = await cache.match(DISPLAY_PATH);
+        if (cached) return cached;
+        throw error;
+    }
+}
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+
+    if (url.pathname.startsWith(MEDIA_PREFIX)) {
+        event.respondWith(serveMedia(request, url.pathname));
+    } else if (request.mode === 'navigate' && url.pathname === DISPLAY_PATH) {
+        event.respondWith(serveDisplay(request));
+    }
+});
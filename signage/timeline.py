@@ -0,0 +1,235 @@
+"""
+Timeline playback per DeviceGroup yang dikompilasi dan disimpan di cache.
+
+Setiap layar yang polling ``/signage/display/`` cukup membaca timeline grupnya
+dari cache lalu mencari slot aktif / berikutnya dengan binary search, sehingga
+tidak ada query database selama timeline belum di-invalidate.
+"""
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import timedelta
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .recurrence import expand_occurrences
+from .renditions import pick_rendition
+
+logger = logging.getLogger(__name__)
+
+TIMELINE_CACHE_PREFIX = 'signage:timeline'
+DEVICE_CACHE_PREFIX = 'signage:device'
+DEFAULT_MEDIA = ('/media/assets/loading.MP4', 'video')
+
+DeviceSnapshot = namedtuple('DeviceSnapshot', ['id', 'name', 'ip_address', 'group_id', 'resolution'])
+
+
+def _timeline_days():
+    return settings.SIGNAGE_SETTINGS.get('TIMELINE_DAYS', 7)
+
+
+def _timeline_key(group_id):
+    return f"{TIMELINE_CACHE_PREFIX}:{group_id}"
+
+
+def _device_key(ip_address):
+    return f"{DEVICE_CACHE_PREFIX}:{ip_address}"
+
+
+def resolve_renditions(schedule):
+    """Rendition Content milik schedule sebagai [width, height, url]"""
+    if not schedule.content:
+        return []
+    return [
+        [rendition.width, rendition.height, rendition.file.url]
+        for rendition in schedule.content.renditions.all() if rendition.file
+    ]
+
+
+def resolve_file_info(schedule, resolution=None):
+    """
+    Mendapatkan file path dan media type dari schedule. Jika `resolution`
+    diberikan, dipilih rendition yang paling dekat dengan resolusi layar.
+    """
+    file_obj = None
+    media_type = 'unknown'
+
+    if schedule.content:
+        file_obj = schedule.content.file
+        media_type = schedule.content.file_type_content().lower()
+    elif schedule.playlist:
+        file_obj = schedule.playlist.file
+        media_type = schedule.playlist.file_type_playlist().lower()
+
+    if file_obj:
+        url = pick_rendition(resolve_renditions(schedule), resolution) if resolution else None
+        return url or file_obj.url, media_type
+    return DEFAULT_MEDIA
+
+
+def entry_file_path(entry, resolution=None):
+    """File path entry timeline untuk layar dengan `resolution`"""
+    return pick_rendition(entry.get('renditions'), resolution) or entry['file_path']
+
+
+def _group_info(group):
+    return {
+        'name': group.name,
+        'id': group.id,
+        'device_count': group.device_count,
+        'schedule_count': group.schedule_count,
+        'description': group.description
+    }
+
+
+def build_group_timeline(group_id):
+    """
+    Compile semua schedule Published milik grup untuk hari ini sampai
+    TIMELINE_DAYS ke depan menjadi interval terurut berdasarkan waktu mulai.
+    Schedule berulang menghasilkan satu entry per kemunculan.
+    """
+    from .models import DeviceGroup, Schedule
+
+    today = timezone.localdate()
+    group = DeviceGroup.objects.filter(pk=group_id).first()
+    if group is None:
+        return None
+
+    last_day = today + timedelta(days=_timeline_days())
+    schedules = Schedule.objects.for_groups(
+        [group_id], today, last_day
+    ).spanning(today, last_day).filter(
+        publish_status='Published',
+        playback_start__isnull=False,
+        playback_end__isnull=False,
+    ).select_related('content', 'playlist').prefetch_related(
+        'content__renditions'
+    )
+
+    entries = []
+    for schedule in expand_occurrences(schedules, today, last_day):
+        file_path, media_type = resolve_file_info(schedule)
+        start = timezone.make_aware(timezone.datetime.combine(schedule.playback_date, schedule.playback_start))
+        end = timezone.make_aware(timezone.datetime.combine(schedule.playback_date, schedule.playback_end))
+        entries.append({
+            'schedule_id': schedule.id,
+            'name': schedule.schedule_name,
+            'date': schedule.playback_date.strftime("%Y-%m-%d"),
+            'start_time': schedule.playback_start.strftime("%H:%M"),
+            'end_time': schedule.playback_end.strftime("%H:%M"),
+            'content_type': 'Content' if schedule.content else 'Playlist' if schedule.playlist else 'None',
+            'file_path': file_path,
+            'renditions': resolve_renditions(schedule),
+            'media_type': media_type,
+            'start_timestamp': start.timestamp(),
+            'end_timestamp': end.timestamp(),
+        })
+
+    entries.sort(key=lambda entry: (entry['start_timestamp'], entry['schedule_id']))
+
+    max_ends = []
+    running_max = float('-inf')
+    for entry in entries:
+        running_max = max(running_max, entry['end_timestamp'])
+        max_ends.append(running_max)
+
+    return {
+        'date': today.isoformat(),
+        'group': _group_info(group),
+        'entries': entries,
+        'starts': [entry['start_timestamp'] for entry in entries],
+        'max_ends': max_ends,
+    }
+
+
+def get_group_timeline(group_id):
+    """Ambil timeline grup dari cache, rebuild jika belum ada atau sudah ganti hari"""
+    if not group_id:
+        return None
+
+    key = _timeline_key(group_id)
+    timeline = cache.get(key)
+    if timeline is None or timeline['date'] != timezone.localdate().isoformat():
+        timeline = build_group_timeline(group_id)
+        if timeline is not None:
+            cache.set(key, timeline)
+            logger.debug(f"[TIMELINE] Rebuilt group {group_id}: {len(timeline['entries'])} entries")
+    return timeline
+
+
+def invalidate_group_timeline(*group_ids):
+    """
+    Hapus timeline grup dari cache supaya di-rebuild pada request berikutnya.
+    Dihapus sekali lagi setelah commit agar rebuild yang terjadi di tengah
+    transaksi tidak menyimpan data lama, lalu layar yang subscribe diberi tahu.
+    """
+    from .push import hub
+
+    group_ids = {group_id for group_id in group_ids if group_id}
+    keys = [_timeline_key(group_id) for group_id in group_ids]
+    if not keys:
+        return
+
+    cache.delete_many(keys)
+
+    def _after_commit():
+        cache.delete_many(keys)
+        hub.publish(*group_ids)
+
+    transaction.on_commit(_after_commit)
+
+
+def find_current_entry(timeline, now_ts):
+    """
+    Slot yang sedang berjalan hari ini; jika beberapa overlap, pilih yang
+    paling akhir dimulai (sama seperti order_by('-playback_start')).
+    """
+    if not timeline:
+        return None
+
+    entries = timeline['entries']
+    max_ends = timeline['max_ends']
+    today = timeline['date']
+
+    idx = bisect_right(timeline['starts'], now_ts) - 1
+    while idx >= 0 and max_ends[idx] >= now_ts:
+        entry = entries[idx]
+        if entry['end_timestamp'] >= now_ts and entry['date'] == today:
+            return entry
+        idx -= 1
+    return None
+
+
+def find_next_entry(timeline, now_ts):
+    """Slot pertama yang dimulai setelah now_ts"""
+    if not timeline:
+        return None
+
+    idx = bisect_right(timeline['starts'], now_ts)
+    if idx < len(timeline['entries']):
+        return timeline['entries'][idx]
+    return None
+
+
+def get_device_snapshot(ip_address):
+    """Snapshot ringan Device berdasarkan IP, disimpan di cache"""
+    from .models import Device
+
+    key = _device_key(ip_address)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        device = Device.objects.filter(ip_address=ip_address).values(
+            'id', 'name', 'ip_address', 'group_id', 'resolution'
+        ).first()
+        snapshot = DeviceSnapshot(**device) if device else False
+        cache.set(key, snapshot)
+    return snapshot or None
+
+
+def invalidate_device_snapshot(*ip_addresses):
+    keys = [_device_key(ip_address) for ip_address in set(ip_addresses) if ip_address]
+    if keys:
+        cache.delete_many(keys)
@@ -0,0 +1,189 @@
+"""
+Antrian transcode berbasis database.
+
+Upload view hanya menyimpan file sumber, membuat Content/Playlist berstatus
+``processing`` dan sebuah TranscodeJob, lalu langsung selesai. Worker lokal
+(``python manage.py run_transcode_worker``) mengambil job satu per satu,
+menjalankan ffmpeg, mencatat progress, dan mengubah status media menjadi
+``ready`` (atau ``failed``) ketika selesai.
+"""
+from datetime import timedelta
+import logging
+import os
+import shutil
+import tempfile
+import traceback
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import TranscodeJob
+
+logger = logging.getLogger(__name__)
+
+
+def _spool_dir():
+    path = os.path.join(str(settings.FILE_UPLOAD_TEMP_DIR or tempfile.gettempdir()), 'transcode')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def spool_upload(uploaded_file):
+    """
+    Simpan file upload ke folder spool agar tetap ada setelah request selesai.
+    Upload yang sudah berupa temporary file cukup dipindahkan.
+    """
+    ext = os.path.splitext(uploaded_file.name)[1].lower()
+    path = os.path.join(_spool_dir(), f"{uuid.uuid4().hex}{ext}")
+
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        shutil.move(uploaded_file.temporary_file_path(), path)
+        uploaded_file.close()
+    else:
+        uploaded_file.seek(0)
+        with open(path, 'wb') as dest:
+            for chunk in uploaded_file.chunks():
+                dest.write(chunk)
+    return path
+
+
+def enqueue_content_transcode(content, source_path, target_resolution, original_name=None):
+    return TranscodeJob.objects.create(
+        kind='content',
+        content=content,
+        source_path=source_path,
+        params={
+            'original_name': original_name or os.path.basename(source_path),
+            'target_resolution': list(target_resolution),
+        },
+    )
+
+
+def enqueue_playlist_build(playlist, sequence_data, target_resolution):
+    return TranscodeJob.objects.create(
+        kind='playlist',
+        playlist=playlist,
+        params={
+            'sequence_data': sequence_data,
+            'target_resolution': list(target_resolution),
+        },
+    )
+
+
+def claim_next_job():
+    """Ambil job queued tertua dan tandai running (aman untuk beberapa worker)"""
+    with transaction.atomic():
+        job = TranscodeJob.objects.select_for_update(skip_locked=True).filter(
+            status='queued'
+        ).order_by('created_at').first()
+        if job is None:
+            return None
+        job.status = 'running'
+        job.started_at = timezone.now()
+        job.attempts += 1
+        job.save(update_fields=['status', 'started_at', 'attempts', 'updated_at'])
+        return job
+
+
+def requeue_stale_jobs(max_age_minutes=60):
+    """Kembalikan job running yang ditinggal worker yang mati ke antrian"""
+    limit = timezone.now() - timedelta(minutes=max_age_minutes)
+    return TranscodeJob.objects.filter(status='running', started_at__lt=limit).update(
+        status='queued', progress=0
+    )
+
+
+def run_job(job):
+    """Kerjakan satu job; error dicatat di job dan status media menjadi failed"""
+    try:
+        if job.kind == 'content':
+            _run_content_job(job)
+        elif job.kind == 'playlist':
+            _run_playlist_job(job)
+        else:
+            raise ValueError(f"Unknown job kind: {job.kind}")
+    except Exception as e:
+        logger.error(f"Transcode job {job.pk} failed: {str(e)}")
+        job.status = 'failed'
+        message = '; '.join(e.messages) if hasattr(e, 'messages') else str(e)
+        job.error = f"{message}\n{traceback.format_exc()}"
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
+        # Job failed tidak pernah di-retry, jadi file spool tidak dibutuhkan lagi
+        _discard_source(job)
+        media = job.content or job.playlist
+        if media is not None:
+            media.status = 'failed'
+            media.save()
+        return False
+
+    job.status = 'done'
+    job.progress = 100
+    job.error = ''
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'progress', 'error', 'finished_at', 'updated_at'])
+    return True
+
+
+def _run_content_job(job):
+    from .views import DiskBackedFile, UploadContent
+
+    content = job.content
+    if content is None:
+        raise ValueError("Content for this job no longer exists")
+
+    uploader = UploadContent()
+    width, height = job.params['target_resolution']
+    source = DiskBackedFile(job.source_path, job.params.get('original_name') or os.path.basename(job.source_path))
+    job.set_progress(5)
+
+    processed_file = None
+    try:
+        processed_file = uploader.process_file(source, (width, height))
+        job.set_progress(30)
+        content.file.save(processed_file.name, processed_file, save=False)
+        uploader.generate_renditions(
+            content, source, progress=lambda fraction: job.set_progress(30 + fraction * 65)
+        )
+        content.status = 'ready'
+        content.save()
+    finally:
+        source.close()
+        if isinstance(processed_file, DiskBackedFile):
+            processed_file.discard()
+    _discard_source(job)
+
+
+def _discard_source(job):
+    if job.source_path and os.path.exists(job.source_path):
+        try:
+            os.remove(job.source_path)
+        except OSError as e:
+            logger.warning(f"Could not remove spool file {job.source_path}: {str(e)}")
+
+
+def _run_playlist_job(job):
+    from .views import DiskBackedFile, UploadPlaylist
+
+    playlist = job.playlist
+    if playlist is None:
+        raise ValueError("Playlist for this job no longer exists")
+
+    builder = UploadPlaylist()
+    sequence_data = job.params['sequence_data']
+    target_resolution = tuple(job.params['target_resolution'])
+
+    video_file = builder._generate_playlist_video(
+        sequence_data, target_resolution,
+        progress=lambda fraction: job.set_progress(5 + fraction * 85)
+    )
+    try:
+        filename = builder._generate_playlist_filename(playlist.playlist_name)
+        playlist.file.save(filename, video_file, save=False)
+        playlist.status = 'ready'
+        playlist.save()
+    finally:
+        if isinstance(video_file, DiskBackedFile):
+            video_file.discard()
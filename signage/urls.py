@@ -1,6 +1,5 @@
-from django.urls import path
+from django.urls import path, re_path
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib.auth import views as auth_views
 from django.views.generic.base import RedirectView
 from django.urls import path
@@ -8,9 +7,11 @@ from .views import (
     DigitalSignageViews, SignUp,ResetPassword, device_group_create, device_group_delete, logout, DashboardView,
     content_view, UploadContent, content_recycle_bin_view, export_content, design_view, delete_expired_content, UploadDesign,
     playlist_view, UploadPlaylist, playlist_recycle_bin_view, export_playlist, delete_expired_playlists, content_playlist_combined_view,
+    transcode_job_status,
     SchedulesView, ManagePageView, SchedulesRecycleBinView, export_schedule,
     device_view, device_update, export_device,
 )
+from .media_server import serve_media
 
 urlpatterns = [
 #-------------------------Auth-----------------------------#
@@ -20,6 +21,9 @@ urlpatterns = [
     path('reset-password/', ResetPassword.as_view(), name='reset_password'),
     path('logout/', logout, name='logout'),
     path('signage/display/', DigitalSignageViews.signage_display, name='signage_display'),
+    path('signage/stream/', DigitalSignageViews.signage_stream, name='signage_stream'),
+    path('signage/manifest/', DigitalSignageViews.signage_manifest, name='signage_manifest'),
+    path('signage/sw.js', DigitalSignageViews.signage_service_worker, name='signage_service_worker'),
 #----------------------------------------------------------#
 
 #-----------------------dashboard--------------------------#
@@ -43,6 +47,7 @@ urlpatterns = [
     path('export-playlist/', export_playlist, name='export_playlist'),
     path('content-playlist/', content_playlist_combined_view, name='content_playlist_combined'),
     path('playlists/delete-expired/', delete_expired_playlists, name='delete_expired_playlists'),
+    path('transcode/jobs/<int:pk>/', transcode_job_status, name='transcode_job_status'),
 #----------------------------------------------------------#
 
 #------------------------schedules-------------------------#
@@ -59,4 +64,8 @@ urlpatterns = [
     path('devices/<int:pk>/update/', device_update, name='device_update'),
     path('devices/delete/<int:pk>/', device_group_delete, name='device_group_delete'),
 #----------------------------------------------------------#
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+#-------------------------media----------------------------#
+    re_path(rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>.*)$', serve_media, name='media'),
+#----------------------------------------------------------#
+]
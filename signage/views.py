@@ -1,5 +1,5 @@
 from django.template.loader import render_to_string
-from django.core.files.base import ContentFile
+from django.core.files.base import ContentFile, File
 from django.utils.timezone import now
 from django.db import transaction
 from django.shortcuts import render, redirect, get_object_or_404
@@ -7,14 +7,15 @@ from django.contrib.auth import logout as auth_logout
 from django.views.generic.edit import FormView
 from django.views.decorators.cache import never_cache
 from django.conf import settings
-from django.http import HttpResponse, JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse, reverse_lazy
 from django.contrib import messages
 from django.views.decorators.csrf import csrf_exempt
 from django.views.generic import View, TemplateView
 from django.db import transaction
-from django.db.models import Q, Count
+from django.db.models import Q, Count, Prefetch
 from django.views import View
 from django.core.exceptions import ValidationError
 from django.utils.decorators import method_decorator
@@ -22,21 +23,40 @@ from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.db import models
 from django.utils import timezone
 from email.utils import localtime
+from .dashboard_stats import dashboard_stats
+from .exports import Export, chunked, export_response
+from .calendar_data import build_month, month_payload, parse_group_ids
 from .forms import ContentForm, PlaylistForm, ResetPasswordForm, SignUpForm, ManageForm
-from .models import Content, Device, DeviceGroup,  Playlist, Schedule
-from datetime import datetime, timedelta, date
-from dateutil.relativedelta import relativedelta
+from .models import MEDIA_KIND_CHOICES, Content, ContentRendition, Device, DeviceGroup,  Playlist, Schedule, TranscodeJob
+from .listing import CONTENT_LISTING, DEVICE_LISTING, PLAYLIST_LISTING
+from .media_metadata import build_media_info, get_media_metadata, media_name_from_url
+from .prefetch import build_prefetch_manifest
+from .push import CLOSED, compact_slot, format_event, hub
+from .rendition_cache import rendition_cache
+from .renditions import parse_resolution, rendition_targets
+from .recurrence import build_rule, describe as describe_recurrence
+from . import schedule_cursor
+from .schedule_builder import bulk_create_schedules, expand_dates
+from .schedule_index import schedule_index
+from .transcode import enqueue_content_transcode, enqueue_playlist_build, spool_upload
+from .timeline import (
+    entry_file_path, find_current_entry, find_next_entry, get_device_snapshot, get_group_timeline,
+    resolve_file_info,
+)
+from datetime import datetime, timedelta
 from PIL import Image, ImageEnhance
+from asgiref.sync import sync_to_async
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
 import json
 import logging
 import os
 import shutil
 import subprocess
 import tempfile
-import xlwt
+import itertools
 import base64
 import io
-from io import BytesIO
 import os
 
 #------------------------Auth Views------------------------#
@@ -208,176 +228,16 @@ def logout(request):
 class DashboardView(TemplateView):
     template_name = 'dashboard.html'
     
-    def get_folder_size(self, folder_path):
-        """Calculate folder size in MB"""
-        total_size = 0
-        try:
-            for dirpath, dirnames, filenames in os.walk(folder_path):
-                for filename in filenames:
-                    filepath = os.path.join(dirpath, filename)
-                    try:
-                        total_size += os.path.getsize(filepath)
-                    except OSError:
-                        pass
-        except OSError:
-            pass
-        return round(total_size / (1024 * 1024), 2)
-    
-    def calculate_storage_percentage(self, size_mb, total_storage_mb=100):
-        if total_storage_mb == 0:
-            return 0
-        percentage = (size_mb / total_storage_mb) * 100
-        return min(round(percentage, 1), 100)
-    
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        
-        frontend_size = self.get_folder_size(os.path.join(settings.BASE_DIR, 'signage'))
-        backend_size = self.get_folder_size(os.path.join(settings.BASE_DIR, 'signage_project'))
-        content_uploads_size = self.get_folder_size(os.path.join(settings.BASE_DIR, 'media', 'content_uploads'))
-        playlist_uploads_size = self.get_folder_size(os.path.join(settings.BASE_DIR, 'media', 'playlist_uploads'))
-        
-        frontend_percentage = self.calculate_storage_percentage(frontend_size)
-        backend_percentage = self.calculate_storage_percentage(backend_size)
-        content_percentage = self.calculate_storage_percentage(content_uploads_size)
-        playlist_percentage = self.calculate_storage_percentage(playlist_uploads_size)
-
-        now = timezone.localtime(timezone.now())
-        today = now.date()
-        tomorrow = today + timedelta(days=1)
-
-        upcoming_schedules = Schedule.objects.filter(
-            Q(playback_date=today, playback_start__gt=now.time()) |
-            Q(playback_date=tomorrow),
-            publish_status='Published'
-        ).select_related('content', 'playlist').order_by('playback_date', 'playback_start')[:3]
-
-        total_content = Content.objects.count()
-        content_active = Content.objects.filter(
-            Q(expiration_date__isnull=True) | Q(expiration_date__gt=now)
-        ).count()
-        content_expired = Content.objects.filter(
-            expiration_date__lte=now
-        ).count()
-        
-        total_playlist = Playlist.objects.count()
-        playlist_active = Playlist.objects.filter(
-            Q(expiration_date__isnull=True) | Q(expiration_date__gt=now)
-        ).count()
-        playlist_expired = Playlist.objects.filter(
-            expiration_date__lte=now
-        ).count()
-
-        total_device = Device.objects.count()
-        online_device = Device.objects.filter(is_online=True).count()
-        offline_device = total_device - online_device
-        total_device_group = DeviceGroup.objects.count()
-
-        device_groups = []
-        for group in DeviceGroup.objects.all().prefetch_related('devices'):
-            group_devices = group.devices.all()
-            total_devices_in_group = group_devices.count()
-            
-            if total_devices_in_group == 0:
-                continue
-                
-            online_devices_in_group = group_devices.filter(is_online=True).count()
-            online_percentage = (online_devices_in_group / total_devices_in_group * 100) if total_devices_in_group > 0 else 0
-            
-            if online_percentage >= 75:
-                status_class = 'online'
-            elif online_percentage >= 25:
-                status_class = 'partial'
-            else:
-                status_class = 'offline'
-            
-            group_schedules = Schedule.objects.filter(
-                publish_to__group=group,
-                publish_status='Published'
-            ).distinct()
-            
-            total_schedules_in_group = group_schedules.count()
-            
-            if total_schedules_in_group == 0:
-                continue
-            
-            device_groups.append({
-                'name': group.name,
-                'total_devices': total_devices_in_group,
-                'online_devices': online_devices_in_group,
-                'online_percentage': round(online_percentage),
-                'status_class': status_class,
-                'total_schedules': total_schedules_in_group,
-            })
-
-        content_by_user = Content.objects.values('creator__username').annotate(
-            content_count=Count('id')
-        ).order_by('-content_count')
-        
-        playlist_by_user = Playlist.objects.values('creator__username').annotate(
-            playlist_count=Count('id')
-        ).order_by('-playlist_count')
-        
-        creator_stats = {}
-        for item in content_by_user:
-            username = item['creator__username']
-            if username and username not in creator_stats:
-                creator_stats[username] = {'content_count': 0, 'playlist_count': 0}
-            if username:
-                creator_stats[username]['content_count'] = item['content_count']
-        
-        for item in playlist_by_user:
-            username = item['creator__username']
-            if username and username not in creator_stats:
-                creator_stats[username] = {'content_count': 0, 'playlist_count': 0}
-            if username:
-                creator_stats[username]['playlist_count'] = item['playlist_count']
-        
-        top_creator_username = None
-        max_total = 0
-        for username, stats in creator_stats.items():
-            total = stats['content_count'] + stats['playlist_count']
-            if total > max_total:
-                max_total = total
-                top_creator_username = username
-        
-        top_creator = {
-            'username': top_creator_username or 'No creator',
-            'content_count': creator_stats.get(top_creator_username, {}).get('content_count', 0),
-            'playlist_count': creator_stats.get(top_creator_username, {}).get('playlist_count', 0)
-        }
+        context.update(dashboard_stats.snapshot())
 
         top_users = [
             {'username': 'admin', 'login_count': 42, 'usage_time': '15h 30m'},
             {'username': 'user1', 'login_count': 28, 'usage_time': '9h 45m'},
             {'username': 'user2', 'login_count': 19, 'usage_time': '6h 15m'}
         ]
-
-        context.update({
-            'frontend_size': frontend_size,
-            'backend_size': backend_size,
-            'content_uploads_size': content_uploads_size,
-            'playlist_uploads_size': playlist_uploads_size,
-            'frontend_percentage': frontend_percentage,
-            'backend_percentage': backend_percentage,
-            'content_percentage': content_percentage,
-            'playlist_percentage': playlist_percentage,
-            
-            'upcoming_schedules': upcoming_schedules,
-            'total_content': total_content,
-            'content_active': content_active,
-            'content_expired': content_expired,
-            'total_playlist': total_playlist,
-            'playlist_active': playlist_active,
-            'playlist_expired': playlist_expired,
-            'total_device': total_device,
-            'online_device': online_device,
-            'offline_device': offline_device,
-            'total_device_group': total_device_group,
-            'device_groups': device_groups,
-            'top_creator': top_creator,
-            'top_users': top_users,
-        })
+        context['top_users'] = top_users
         
         return context
 #----------------------------------------------------------#
@@ -385,28 +245,28 @@ class DashboardView(TemplateView):
 
 #------------------------Content---------------------------#
 def content_view(request):
-    sort = request.GET.get('sort', 'date_modified')
-    order = request.GET.get('order', 'desc')
     query = request.GET.get('q', '')
-
-    sort_field = f"-{sort}" if order == "desc" else sort
+    kind = request.GET.get('kind', '')
 
     now = timezone.localtime(timezone.now())
 
-    contents = Content.objects.select_related('device', 'device__group').filter(
+    contents = Content.objects.select_related('device', 'device__group', 'creator').filter(
         models.Q(expiration_date__isnull=True) | 
         models.Q(expiration_date__gt=now)
     )
     
     if query:
         contents = contents.filter(content_name__icontains=query)
+    if kind in dict(MEDIA_KIND_CHOICES):
+        contents = contents.filter(media_kind=kind)
 
-    contents = contents.order_by(sort_field)
+    page = CONTENT_LISTING.paginate(request, contents)
 
     context = {
-        'contents': contents,
-        'sort': sort,
-        'order': order,
+        'contents': page,
+        'page': page,
+        'sort': page.sort,
+        'order': page.order,
         'request': request,
         'now': now, 
         'table_config': {
@@ -422,28 +282,28 @@ def content_view(request):
     return render(request, 'content/content_page.html', context)
 
 def content_recycle_bin_view(request):
-    sort = request.GET.get('sort', 'date_modified')
-    order = request.GET.get('order', 'desc')
     query = request.GET.get('q', '')
-
-    sort_field = f"-{sort}" if order == "desc" else sort
+    kind = request.GET.get('kind', '')
 
     now = timezone.localtime(timezone.now())
 
-    contents = Content.objects.select_related('device', 'device__group').filter(
+    contents = Content.objects.select_related('device', 'device__group', 'creator').filter(
         expiration_date__isnull=False,
         expiration_date__lte=now
     )
     
     if query:
         contents = contents.filter(content_name__icontains=query)
+    if kind in dict(MEDIA_KIND_CHOICES):
+        contents = contents.filter(media_kind=kind)
 
-    contents = contents.order_by(sort_field)
+    page = CONTENT_LISTING.paginate(request, contents)
 
     context = {
-        'contents': contents,
-        'sort': sort,
-        'order': order,
+        'contents': page,
+        'page': page,
+        'sort': page.sort,
+        'order': page.order,
         'request': request,
         'now': now,
         'table_config': {
@@ -458,10 +318,30 @@ def content_recycle_bin_view(request):
     }
     return render(request, 'content/recycle_bin_page.html', context)
 
+class DiskBackedFile(File):
+    """
+    File hasil encode yang sudah ada di disk. FileSystemStorage memindahkan
+    file dengan `temporary_file_path()` memakai rename, bukan membaca isinya.
+    """
+    def __init__(self, path, name):
+        super().__init__(open(path, 'rb'), name=name)
+        self.size = os.path.getsize(path)
+        self._path = path
+
+    def temporary_file_path(self):
+        return self._path
+
+    def discard(self):
+        """Tutup dan hapus file sementara jika belum dipindahkan storage"""
+        self.close()
+        if os.path.exists(self._path):
+            os.remove(self._path)
+
 class UploadContent(View):
     form_class = ContentForm
     template_name = 'content/upload_page.html'
-    
+    TRANSCODE_EXTENSIONS = ['.mp4', '.mov', '.avi', '.webm']
+
     def get(self, request, *args, **kwargs):
         return render(request, self.template_name, {'form': self.form_class()})
     
@@ -471,6 +351,7 @@ class UploadContent(View):
         
         form = self.form_class(request.POST, request.FILES)
         if form.is_valid():
+            processed_file = None
             try:
                 uploaded_file = request.FILES.get('file')
                 if uploaded_file:
@@ -480,10 +361,13 @@ class UploadContent(View):
                 content = form.save(commit=False)
                 content.creator = request.user
                 
+                if uploaded_file and os.path.splitext(uploaded_file.name)[1].lower() in self.TRANSCODE_EXTENSIONS:
+                    return self.queue_transcode(request, content, uploaded_file)
+
                 if uploaded_file:
                     target_resolution = self.get_device_resolution(content.device)
                     logger.info(f"Target resolution: {target_resolution}")
-                    
+
                     processed_file = self.process_file(uploaded_file, target_resolution)
                     
                     if not processed_file:
@@ -501,6 +385,10 @@ class UploadContent(View):
                 
                 content.save()
                 logger.info(f"Content saved to database with ID: {content.id}")
+
+                if uploaded_file:
+                    renditions = self.generate_renditions(content, uploaded_file)
+                    logger.info(f"Created {len(renditions)} renditions for content {content.id}")
                 
                 if content.file and hasattr(content.file, 'url'):
                     logger.info(f"File saved at: {content.file.url}")
@@ -521,6 +409,9 @@ class UploadContent(View):
             except Exception as e:
                 logger.error(f"Unexpected error during upload: {str(e)}")
                 messages.error(request, f"An unexpected error occurred: {str(e)}")
+            finally:
+                if isinstance(processed_file, DiskBackedFile):
+                    processed_file.discard()
         else:
             logger.warning(f"Form validation failed: {form.errors}")
             for field, errors in form.errors.items():
@@ -528,7 +419,41 @@ class UploadContent(View):
                     messages.error(request, f"{field}: {error}")
         
         return render(request, self.template_name, {'form': form})
-    
+
+    def queue_transcode(self, request, content, uploaded_file):
+        """
+        Simpan video sumber, buat Content berstatus processing dan TranscodeJob,
+        lalu langsung kembali. Encode dikerjakan oleh run_transcode_worker.
+        """
+        target_resolution = self.get_device_resolution(content.device)
+        source_path = spool_upload(uploaded_file)
+        try:
+            with transaction.atomic():
+                content.file = ''
+                content.status = 'processing'
+                content.save()
+                job = enqueue_content_transcode(content, source_path, target_resolution, uploaded_file.name)
+        except Exception:
+            if os.path.exists(source_path):
+                os.remove(source_path)
+            raise
+
+        logger.info(f"Queued transcode job {job.id} for content {content.id}, target: {target_resolution}")
+
+        if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+            return JsonResponse({
+                'job_id': job.id,
+                'content_id': content.id,
+                'status': job.status,
+                'status_url': reverse('transcode_job_status', args=[job.id]),
+            }, status=202)
+
+        messages.success(
+            request,
+            f'Content "{content.content_name}" has been uploaded and is being processed.'
+        )
+        return redirect('content')
+
     def get_device_resolution(self, device):
         """Get target resolution from device, with fallback to Full HD"""
         if device and device.resolution and device.resolution != 'Unknown':
@@ -537,9 +462,64 @@ class UploadContent(View):
                 return (width, height)
             except:
                 pass
-        
+
         return (1920, 1080)
-    
+
+    def get_source_size(self, source_file):
+        """Resolusi asli file upload (width, height), None jika tidak bisa dibaca"""
+        ext = os.path.splitext(source_file.name)[1].lower()
+        try:
+            if ext in self.TRANSCODE_EXTENSIONS and hasattr(source_file, 'temporary_file_path'):
+                result = subprocess.run([
+                    'ffprobe', '-v', 'quiet', '-select_streams', 'v:0',
+                    '-show_entries', 'stream=width,height', '-of', 'csv=s=x:p=0',
+                    source_file.temporary_file_path()
+                ], capture_output=True, text=True, timeout=30)
+                return parse_resolution(result.stdout.strip()) if result.returncode == 0 else None
+
+            source_file.seek(0)
+            with Image.open(source_file) as img:
+                return img.size
+        except Exception as e:
+            logger.warning(f"Could not read source size of {source_file.name}: {e}")
+            return None
+        finally:
+            if hasattr(source_file, 'seek'):
+                source_file.seek(0)
+
+    def generate_renditions(self, content, source_file, progress=None):
+        """
+        Encode file sumber ke semua resolusi di rendition_targets() dan simpan
+        sebagai ContentRendition. Encode yang sama dengan file utama diambil
+        dari rendition cache. Rendition yang gagal dilewati.
+        """
+        targets = rendition_targets(self.get_source_size(source_file))
+        base = os.path.splitext(self.generate_filename(source_file.name))[0]
+
+        created = []
+        for index, (width, height) in enumerate(targets, start=1):
+            if content.renditions.filter(width=width, height=height).exists():
+                continue
+
+            processed_file = None
+            try:
+                source_file.seek(0)
+                processed_file = self.process_file(source_file, (width, height))
+                rendition = ContentRendition(content=content, width=width, height=height)
+                rendition.file.save(f"{base}_{width}x{height}{os.path.splitext(processed_file.name)[1]}", processed_file, save=False)
+                rendition.save()
+                created.append(rendition)
+            except Exception as e:
+                logger.warning(f"Failed to create {width}x{height} rendition for content {content.id}: {str(e)}")
+            finally:
+                if isinstance(processed_file, DiskBackedFile):
+                    processed_file.discard()
+
+            if progress:
+                progress(index / len(targets))
+
+        return created
+
     def process_file(self, uploaded_file, target_resolution):
         """Process file with resizing and compression based on target resolution"""
         import logging
@@ -657,67 +637,44 @@ class UploadContent(View):
             raise ValidationError(f"Failed to process image: {str(e)}")
 
     def process_video(self, video_file, new_filename, target_width, target_height):
-        """Process video file with highest quality settings"""
+        """
+        Process video file with highest quality settings.
+        Input dan output tetap di disk: upload besar sudah berupa temporary
+        file, hasil ffmpeg dikembalikan sebagai DiskBackedFile yang akan
+        di-rename ke MEDIA_ROOT oleh storage saat content disimpan.
+        """
         import logging
         logger = logging.getLogger(__name__)
         
         temp_input = None
         temp_output = None
+        owns_input = False
         
         try:
             ext = os.path.splitext(video_file.name)[1].lower()
-            timestamp = str(datetime.now().timestamp()).replace('.', '')
-            
-            temp_dir = tempfile.gettempdir()
-            temp_input = os.path.join(temp_dir, f"input_{timestamp}{ext}")
-            temp_output = os.path.join(temp_dir, f"output_{timestamp}.mp4")
+            temp_dir = str(settings.FILE_UPLOAD_TEMP_DIR or tempfile.gettempdir())
             
             logger.info(f"Processing video: {video_file.name}, size: {video_file.size} bytes")
             logger.info(f"Target resolution: {target_width}x{target_height}")
             
-            video_file.seek(0)  
-            with open(temp_input, 'wb') as dest:
-                for chunk in video_file.chunks():
-                    dest.write(chunk)
+            if hasattr(video_file, 'temporary_file_path'):
+                temp_input = video_file.temporary_file_path()
+            else:
+                owns_input = True
+                fd, temp_input = tempfile.mkstemp(prefix='input_', suffix=ext, dir=temp_dir)
+                video_file.seek(0)  
+                with os.fdopen(fd, 'wb') as dest:
+                    for chunk in video_file.chunks():
+                        dest.write(chunk)
+            
+            fd, temp_output = tempfile.mkstemp(prefix='output_', suffix='.mp4', dir=temp_dir)
+            os.close(fd)
             
             if not os.path.exists(temp_input) or os.path.getsize(temp_input) == 0:
                 raise ValidationError("Failed to save input video file")
             
             logger.info(f"Input file saved successfully: {os.path.getsize(temp_input)} bytes")
             
-            try:
-                probe_command = [
-                    'ffprobe', '-v', 'quiet', '-select_streams', 'v:0',
-                    '-show_entries', 'stream=width,height', '-of', 'csv=s=x:p=0', temp_input
-                ]
-                probe_result = subprocess.run(probe_command, capture_output=True, text=True, timeout=30)
-                if probe_result.returncode == 0 and 'x' in probe_result.stdout:
-                    dimensions = probe_result.stdout.strip().split('x')
-                    input_width = int(dimensions[0])
-                    input_height = int(dimensions[1])
-                    logger.info(f"Input video dimensions: {input_width}x{input_height}")
-                else:
-                    input_width = input_height = 0
-            except Exception as e:
-                logger.warning(f"Could not probe video dimensions: {e}")
-                input_width = input_height = 0
-            
-            has_audio = False
-            try:
-                audio_check = subprocess.run([
-                    'ffprobe', '-v', 'quiet', '-select_streams', 'a:0', 
-                    '-show_entries', 'stream=codec_name', '-of', 'csv=p=0', temp_input
-                ], capture_output=True, text=True, timeout=10)
-                
-                if audio_check.returncode == 0 and audio_check.stdout.strip():
-                    has_audio = True
-                    logger.info("Audio track detected")
-                else:
-                    logger.info("No audio track detected")
-            except Exception as e:
-                logger.warning(f"Could not check for audio: {e}")
-                has_audio = False
-            
             even_width = target_width if target_width % 2 == 0 else target_width - 1
             even_height = target_height if target_height % 2 == 0 else target_height - 1
             
@@ -726,74 +683,13 @@ class UploadContent(View):
             quality_settings = self.get_video_quality_settings(even_width, even_height)
             logger.info(f"Using quality settings: {quality_settings}")
             
-            command = [
-                'ffmpeg', '-y', '-i', temp_input,
-                '-vf', f'scale={even_width}:{even_height}:flags=lanczos',  
-                '-c:v', 'libx264', 
-                '-preset', quality_settings['preset'],
-                '-crf', str(quality_settings['crf']),
-                '-maxrate', quality_settings['bitrate'],
-                '-bufsize', '2M',  
-                '-profile:v', quality_settings['profile'],
-                '-tune', quality_settings['tune'],
-                '-pix_fmt', 'yuv420p',
-                '-movflags', '+faststart',
-                '-x264-params', 'ref=4:bframes=4:me=umh:subme=7:trellis=1'  
-            ]
-            
-            if has_audio:
-                command.extend([
-                    '-c:a', 'aac', 
-                    '-b:a', quality_settings['audio_bitrate'],
-                    '-ar', '48000', 
-                    '-ac', '2'       
-                ])
-            else:
-                command.extend(['-an'])  
-            
-            command.append(temp_output)
-            
-            logger.info(f"FFmpeg command: {' '.join(command)}")
-            
-            result = subprocess.run(command, capture_output=True, text=True, timeout=600)  
-            
-            logger.info(f"FFmpeg return code: {result.returncode}")
-            if result.stdout:
-                logger.debug(f"FFmpeg stdout: {result.stdout}")
-            if result.stderr:
-                logger.debug(f"FFmpeg stderr: {result.stderr}")
-            
-            if result.returncode != 0:
-                logger.warning("First attempt failed, trying fallback with medium preset")
-                
-                fallback_command = [
-                    'ffmpeg', '-y', '-i', temp_input,
-                    '-vf', f'scale={even_width}:{even_height}',
-                    '-c:v', 'libx264', 
-                    '-preset', 'medium', 
-                    '-crf', '20',        
-                    '-pix_fmt', 'yuv420p',
-                    '-profile:v', 'high',
-                    '-movflags', '+faststart'
-                ]
-                
-                if has_audio:
-                    fallback_command.extend(['-c:a', 'aac', '-b:a', '192k'])
-                else:
-                    fallback_command.extend(['-an'])
-                
-                fallback_command.append(temp_output)
-                
-                logger.info(f"Fallback FFmpeg command: {' '.join(fallback_command)}")
-                
-                fallback_result = subprocess.run(fallback_command, capture_output=True, text=True, timeout=300)
-                
-                if fallback_result.returncode != 0:
-                    error_message = fallback_result.stderr if fallback_result.stderr else "Unknown FFmpeg error"
-                    logger.error(f"Fallback FFmpeg failed: {error_message}")
-                    raise ValidationError("Video processing failed. The video format may not be supported or the file may be corrupted.")
-                
-                logger.info("Fallback processing succeeded")
+            cache_key = rendition_cache.make_key(
+                temp_input, 'content', even_width, even_height, quality_settings=quality_settings
+            )
+            rendition_cache.fetch_or_encode(
+                cache_key, temp_output,
+                lambda output_path: self.encode_video(temp_input, output_path, even_width, even_height, quality_settings)
+            )
             
             if not os.path.exists(temp_output) or os.path.getsize(temp_output) == 0:
                 raise ValidationError("Video processing did not produce a valid output file")
@@ -801,31 +697,15 @@ class UploadContent(View):
             output_size = os.path.getsize(temp_output)
             logger.info(f"Output file created successfully: {output_size} bytes")
             
-            with open(temp_output, 'rb') as f:
-                file_content = f.read()
-            
-            if not file_content or len(file_content) < 1000:  # Minimum reasonable file size
+            if output_size < 1000:  # Minimum reasonable file size
                 raise ValidationError("Output video file is too small or empty")
             
             new_filename_mp4 = os.path.splitext(new_filename)[0] + '.mp4'
             
-            logger.info(f"Creating InMemoryUploadedFile: {new_filename_mp4}, size: {len(file_content)} bytes")
-            
-            processed_file = InMemoryUploadedFile(
-                io.BytesIO(file_content),
-                'FileField',
-                new_filename_mp4,
-                'video/mp4',
-                len(file_content),
-                None
-            )
-            
-            processed_file.seek(0)
-            test_read = processed_file.read(1024) 
-            if not test_read:
-                raise ValidationError("Created file object is not readable")
+            logger.info(f"Creating DiskBackedFile: {new_filename_mp4}, size: {output_size} bytes")
             
-            processed_file.seek(0)  
+            processed_file = DiskBackedFile(temp_output, new_filename_mp4)
+            temp_output = None
             logger.info("Video processing completed successfully")
             
             return processed_file
@@ -839,7 +719,7 @@ class UploadContent(View):
             logger.error(f"Video processing error: {str(e)}")
             raise ValidationError(f"Video processing failed due to an unexpected error. Please try with a different video file.")
         finally:
-            for temp_file in [temp_input, temp_output]:
+            for temp_file in [temp_input if owns_input else None, temp_output]:
                 if temp_file and os.path.exists(temp_file):
                     try:
                         os.remove(temp_file)
@@ -848,58 +728,153 @@ class UploadContent(View):
                         logger.warning(f"Failed to cleanup {temp_file}: {cleanup_error}")
                         pass
     
+    def encode_video(self, temp_input, temp_output, even_width, even_height, quality_settings):
+        """
+        Jalankan ffmpeg untuk satu video (dengan fallback preset medium).
+        Return False jika hasilnya dari fallback, yang tidak boleh disimpan
+        di rendition cache di bawah key quality_settings.
+        """
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        try:
+            probe_command = [
+                'ffprobe', '-v', 'quiet', '-select_streams', 'v:0',
+                '-show_entries', 'stream=width,height', '-of', 'csv=s=x:p=0', temp_input
+            ]
+            probe_result = subprocess.run(probe_command, capture_output=True, text=True, timeout=30)
+            if probe_result.returncode == 0 and 'x' in probe_result.stdout:
+                dimensions = probe_result.stdout.strip().split('x')
+                input_width = int(dimensions[0])
+                input_height = int(dimensions[1])
+                logger.info(f"Input video dimensions: {input_width}x{input_height}")
+            else:
+                input_width = input_height = 0
+        except Exception as e:
+            logger.warning(f"Could not probe video dimensions: {e}")
+            input_width = input_height = 0
+        
+        has_audio = False
+        try:
+            audio_check = subprocess.run([
+                'ffprobe', '-v', 'quiet', '-select_streams', 'a:0', 
+                '-show_entries', 'stream=codec_name', '-of', 'csv=p=0', temp_input
+            ], capture_output=True, text=True, timeout=10)
+            
+            if audio_check.returncode == 0 and audio_check.stdout.strip():
+                has_audio = True
+                logger.info("Audio track detected")
+            else:
+                logger.info("No audio track detected")
+        except Exception as e:
+            logger.warning(f"Could not check for audio: {e}")
+            has_audio = False
+        
+        command = [
+            'ffmpeg', '-y', '-i', temp_input,
+            '-vf', f'scale={even_width}:{even_height}:flags=lanczos',  
+            '-c:v', 'libx264', 
+            '-preset', quality_settings['preset'],
+            '-crf', str(quality_settings['crf']),
+            '-maxrate', quality_settings['bitrate'],
+            '-bufsize', '2M',  
+            '-profile:v', quality_settings['profile'],
+            '-tune', quality_settings['tune'],
+            '-pix_fmt', 'yuv420p',
+            '-movflags', '+faststart',
+            '-x264-params', 'ref=4:bframes=4:me=umh:subme=7:trellis=1'  
+        ]
+        
+        if has_audio:
+            command.extend([
+                '-c:a', 'aac', 
+                '-b:a', quality_settings['audio_bitrate'],
+                '-ar', '48000', 
+                '-ac', '2'       
+            ])
+        else:
+            command.extend(['-an'])  
+        
+        command.append(temp_output)
+        
+        logger.info(f"FFmpeg command: {' '.join(command)}")
+        
+        result = subprocess.run(command, capture_output=True, text=True, timeout=600)  
+        
+        logger.info(f"FFmpeg return code: {result.returncode}")
+        if result.stdout:
+            logger.debug(f"FFmpeg stdout: {result.stdout}")
+        if result.stderr:
+            logger.debug(f"FFmpeg stderr: {result.stderr}")
+        
+        if result.returncode != 0:
+            logger.warning("First attempt failed, trying fallback with medium preset")
+            
+            fallback_command = [
+                'ffmpeg', '-y', '-i', temp_input,
+                '-vf', f'scale={even_width}:{even_height}',
+                '-c:v', 'libx264', 
+                '-preset', 'medium', 
+                '-crf', '20',        
+                '-pix_fmt', 'yuv420p',
+                '-profile:v', 'high',
+                '-movflags', '+faststart'
+            ]
+            
+            if has_audio:
+                fallback_command.extend(['-c:a', 'aac', '-b:a', '192k'])
+            else:
+                fallback_command.extend(['-an'])
+            
+            fallback_command.append(temp_output)
+            
+            logger.info(f"Fallback FFmpeg command: {' '.join(fallback_command)}")
+            
+            fallback_result = subprocess.run(fallback_command, capture_output=True, text=True, timeout=300)
+            
+            if fallback_result.returncode != 0:
+                error_message = fallback_result.stderr if fallback_result.stderr else "Unknown FFmpeg error"
+                logger.error(f"Fallback FFmpeg failed: {error_message}")
+                raise ValidationError("Video processing failed. The video format may not be supported or the file may be corrupted.")
+            
+            logger.info("Fallback processing succeeded")
+            return False
+        
+        return True
+    
     def validate_file_size(self, uploaded_file):
         """Validate file size doesn't exceed 10MB"""
         if uploaded_file and uploaded_file.size > 10 * 1024 * 1024:  
             raise ValidationError(f"File size exceeds maximum limit of 10MB. Your file: {uploaded_file.size/1024/1024:.1f}MB")
 
 def export_content(request):
-    wb = xlwt.Workbook()
-    ws = wb.add_sheet('Content List')
-
-    header_style = xlwt.easyxf(
-        'font: bold on; pattern: pattern solid, fore_colour gray25; align: horiz center'
-    )
-
-    active_style = xlwt.easyxf(
-        'pattern: pattern solid, fore_colour light_green'
-    )
+    now = timezone.now()
+    contents = Content.objects.select_related('creator').order_by('id')
 
-    expired_style = xlwt.easyxf(
-        'pattern: pattern solid, fore_colour red'
-    )
+    def rows():
+        for content in chunked(contents):
+            if content.expiration_date is None or content.expiration_date > now:
+                row_style = 'active'
+            else:
+                row_style = 'expired'
+            yield [
+                content.id,
+                content.content_name,
+                content.file.url if content.file else "",
+                content.file_type_content(),
+                content.file_size_kb(),
+                content.supported_device,
+                content.creator.username if content.creator else "-",
+                content.date_modified.strftime('%Y-%m-%d %H:%M'),
+                content.expiration_date.strftime('%Y-%m-%d %H:%M') if content.expiration_date else "-",
+            ], row_style
 
     headers = [
         "ID", "Content Name", "File Path", "File Type",
         "File Size", "Supported Device", "Creator",
         "Date Modified", "Expiration Date"
     ]
-    for col_num, header in enumerate(headers):
-        ws.write(0, col_num, header, header_style)
-
-    contents = Content.objects.select_related('creator', 'device', 'device__group').all()
-    now = timezone.now()
-
-    for row_num, content in enumerate(contents, start=1):
-        if content.expiration_date is None or content.expiration_date > now:
-            row_style = active_style  
-        else:
-            row_style = expired_style 
-
-        ws.write(row_num, 0, content.id, row_style)
-        ws.write(row_num, 1, content.content_name, row_style)
-        ws.write(row_num, 2, content.file.url if content.file else "", row_style)
-        ws.write(row_num, 3, content.file_type_content(), row_style)
-        ws.write(row_num, 4, content.file_size_kb(), row_style)
-        ws.write(row_num, 5, content.supported_device, row_style)  
-        ws.write(row_num, 6, content.creator.username if content.creator else "-", row_style)
-        ws.write(row_num, 7, content.date_modified.strftime('%Y-%m-%d %H:%M'), row_style)
-        ws.write(row_num, 8, content.expiration_date.strftime('%Y-%m-%d %H:%M') if content.expiration_date else "-", row_style)
-
-    response = HttpResponse(content_type='application/vnd.ms-excel')
-    response['Content-Disposition'] = 'attachment; filename=ContentList.xls'
-    wb.save(response)
-    return response
+    return export_response(request, Export('ContentList', 'Content List', headers, rows()))
 
 def delete_expired_content(request):
     if request.method == 'POST':
@@ -1190,28 +1165,28 @@ class UploadDesign(View):
 
 #-----------------------Playlist---------------------------#
 def playlist_view(request):
-    sort = request.GET.get('sort', 'date_modified')
-    order = request.GET.get('order', 'desc')
     query = request.GET.get('q', '')
-
-    sort_field = f"-{sort}" if order == 'desc' else sort
+    kind = request.GET.get('kind', '')
 
     now = timezone.localtime(timezone.now())
 
-    contents = Playlist.objects.select_related('device', 'device__group').filter(
+    contents = Playlist.objects.select_related('device', 'device__group', 'creator').filter(
         models.Q(expiration_date__isnull=True) | 
         models.Q(expiration_date__gt=now)
     )
     
     if query:
         contents = contents.filter(playlist_name__icontains=query)
+    if kind in dict(MEDIA_KIND_CHOICES):
+        contents = contents.filter(media_kind=kind)
 
-    contents = contents.order_by(sort_field)
+    page = PLAYLIST_LISTING.paginate(request, contents)
 
     context = {
-        'playlists': contents,
-        'sort': sort,
-        'order': order,
+        'playlists': page,
+        'page': page,
+        'sort': page.sort,
+        'order': page.order,
         'request': request,
         'now': now, 
         'table_config': {
@@ -1228,28 +1203,28 @@ def playlist_view(request):
     return render(request, 'playlist/playlist_page.html', context)
 
 def playlist_recycle_bin_view(request):
-    sort = request.GET.get('sort', 'date_modified')
-    order = request.GET.get('order', 'desc')
     query = request.GET.get('q', '')
-
-    sort_field = f"-{sort}" if order == 'desc' else sort
+    kind = request.GET.get('kind', '')
 
     now = timezone.localtime(timezone.now())
 
-    contents = Playlist.objects.select_related('device', 'device__group').filter(
+    contents = Playlist.objects.select_related('device', 'device__group', 'creator').filter(
         expiration_date__isnull=False,
         expiration_date__lte=now
     )
     
     if query:
         contents = contents.filter(playlist_name__icontains=query)
+    if kind in dict(MEDIA_KIND_CHOICES):
+        contents = contents.filter(media_kind=kind)
 
-    contents = contents.order_by(sort_field)
+    page = PLAYLIST_LISTING.paginate(request, contents)
 
     context = {
-        'playlists': contents,
-        'sort': sort,
-        'order': order,
+        'playlists': page,
+        'page': page,
+        'sort': page.sort,
+        'order': page.order,
         'request': request,
         'now': now,  
         'table_config': {
@@ -1266,50 +1241,31 @@ def playlist_recycle_bin_view(request):
     return render(request, 'playlist/recycle_bin_page.html', context)
 
 def export_playlist(request):
-    wb = xlwt.Workbook()
-    ws = wb.add_sheet('Playlist List')
-
-    header_style = xlwt.easyxf(
-        'font: bold on; pattern: pattern solid, fore_colour gray25; align: horiz center'
-    )
-
-    active_style = xlwt.easyxf(
-        'pattern: pattern solid, fore_colour light_green'
-    )
+    now = timezone.now()
+    playlists = Playlist.objects.select_related('creator').order_by('id')
 
-    expired_style = xlwt.easyxf(
-        'pattern: pattern solid, fore_colour red'
-    )
+    def rows():
+        for playlist in chunked(playlists):
+            if playlist.expiration_date is None or playlist.expiration_date > now:
+                row_style = 'active'
+            else:
+                row_style = 'expired'
+            yield [
+                playlist.id,
+                playlist.playlist_name,
+                playlist.file.url if playlist.file else "",
+                playlist.supported_device,
+                playlist.creator.username if playlist.creator else "-",
+                playlist.date_modified.strftime('%Y-%m-%d %H:%M'),
+                playlist.expiration_date.strftime('%Y-%m-%d %H:%M') if playlist.expiration_date else "-",
+            ], row_style
 
     headers = [
         "ID", "Playlist Name", "File Path", 
         "Supported Device", "Creator",
         "Date Modified", "Expiration Date"
     ]
-    for col_num, header in enumerate(headers):
-        ws.write(0, col_num, header, header_style)
-
-    playlists = Playlist.objects.select_related('creator', 'device', 'device__group').all()
-    now = timezone.now()
-
-    for row_num, playlist in enumerate(playlists, start=1):
-        if playlist.expiration_date is None or playlist.expiration_date > now:
-            row_style = active_style  
-        else:
-            row_style = expired_style  
-
-        ws.write(row_num, 0, playlist.id, row_style)
-        ws.write(row_num, 1, playlist.playlist_name, row_style)
-        ws.write(row_num, 2, playlist.file.url if playlist.file else "", row_style)
-        ws.write(row_num, 3, playlist.supported_device, row_style) 
-        ws.write(row_num, 4, playlist.creator.username if playlist.creator else "-", row_style)
-        ws.write(row_num, 5, playlist.date_modified.strftime('%Y-%m-%d %H:%M'), row_style)
-        ws.write(row_num, 6, playlist.expiration_date.strftime('%Y-%m-%d %H:%M') if playlist.expiration_date else "-", row_style)
-
-    response = HttpResponse(content_type='application/vnd.ms-excel')
-    response['Content-Disposition'] = 'attachment; filename=PlaylistList.xls'
-    wb.save(response)
-    return response
+    return export_response(request, Export('PlaylistList', 'Playlist List', headers, rows()))
 
 logger = logging.getLogger(__name__)
 
@@ -1360,16 +1316,25 @@ class UploadPlaylist(View):
             playlist.creator = request.user
             
             target_resolution = self.get_device_resolution(playlist.device)
-            
-            video_file = self._generate_playlist_video(sequence_data, target_resolution)
-            
-            filename = self._generate_playlist_filename(playlist.playlist_name)
-            playlist.file.save(filename, ContentFile(video_file.read()), save=False)
-            
-            playlist.save()
-            
-            messages.success(request, f'Playlist "{playlist.playlist_name}" created successfully!')
-            
+
+            with transaction.atomic():
+                playlist.file = ''
+                playlist.status = 'processing'
+                playlist.save()
+                job = enqueue_playlist_build(playlist, sequence_data, target_resolution)
+
+            logger.info(f"Queued playlist build job {job.id} for playlist {playlist.id}")
+
+            if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+                return JsonResponse({
+                    'job_id': job.id,
+                    'playlist_id': playlist.id,
+                    'status': job.status,
+                    'status_url': reverse('transcode_job_status', args=[job.id]),
+                }, status=202)
+
+            messages.success(request, f'Playlist "{playlist.playlist_name}" is being processed.')
+
             return redirect('playlist')
             
         except Exception as e:
@@ -1495,11 +1460,16 @@ class UploadPlaylist(View):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         return f"playlist_{safe_name}_{timestamp}.mp4"
 
-    def _generate_playlist_video(self, sequence_data, target_resolution):
-        """Generate the final playlist video with proper resizing and compression"""
+    def _generate_playlist_video(self, sequence_data, target_resolution, progress=None):
+        """
+        Generate the final playlist video with proper resizing and compression.
+        Item di-encode paralel (lihat _encode_sequence_items), lalu digabung
+        dengan stream copy jika semua segmen identik formatnya.
+        Hasil dikembalikan sebagai DiskBackedFile; `progress` (opsional)
+        dipanggil dengan nilai 0..1 setiap satu item selesai di-encode.
+        """
         temp_dir = tempfile.mkdtemp()
         concat_list = os.path.join(temp_dir, 'concat_list.txt')
-        temp_files = []
         output_path = os.path.join(temp_dir, 'final_output.mp4')
         
         try:
@@ -1509,53 +1479,112 @@ class UploadPlaylist(View):
             even_height = target_height if target_height % 2 == 0 else target_height - 1
             
             quality_settings = self.get_video_quality_settings(even_width, even_height)
-            target_crf = quality_settings['crf']
+            
+            temp_files = self._encode_sequence_items(
+                sequence_data, temp_dir, even_width, even_height, quality_settings, progress
+            )
             
             with open(concat_list, 'w') as f:
-                for item in sequence_data:
-                    temp_file = os.path.join(temp_dir, f"temp_{item['sequence']}.mp4")
-                    temp_files.append(temp_file)
-                    
-                    try:
-                        self._process_sequence_item(
-                            input_path=item['file_path'],
-                            output_path=temp_file,
-                            duration=item['duration'],
-                            is_video=item['is_video'],
-                            target_width=even_width,
-                            target_height=even_height,
-                            quality_settings=quality_settings
-                        )
-                        f.write(f"file '{temp_file}'\n")
-                    except Exception as e:
-                        raise Exception(f"Failed to process item {item['content_name']}: {str(e)}")
+                for temp_file in temp_files:
+                    f.write(f"file '{temp_file}'\n")
             
             try:
-                self._concatenate_with_compression(
-                    concat_list, output_path, 
-                    even_width, even_height, quality_settings
-                )
+                if self._segments_match(temp_files):
+                    self._concatenate_stream_copy(concat_list, output_path)
+                else:
+                    self._concatenate_with_compression(
+                        concat_list, output_path, 
+                        even_width, even_height, quality_settings
+                    )
             except Exception as e:
                 raise Exception(f"Failed to concatenate and compress videos: {str(e)}")
             
-            with open(output_path, 'rb') as f:
-                file_content = f.read()
-            
-            if not file_content or len(file_content) < 1000:
+            if not os.path.exists(output_path) or os.path.getsize(output_path) < 1000:
                 raise Exception("Output video file is too small or empty")
-            
-            return BytesIO(file_content)
+
+            if progress:
+                progress(1)
+
+            upload_dir = str(settings.FILE_UPLOAD_TEMP_DIR or tempfile.gettempdir())
+            fd, final_path = tempfile.mkstemp(prefix='playlist_', suffix='.mp4', dir=upload_dir)
+            os.close(fd)
+            shutil.move(output_path, final_path)
+            return DiskBackedFile(final_path, os.path.basename(final_path))
                 
         finally:
             shutil.rmtree(temp_dir, ignore_errors=True)
 
+    def _encode_workers(self, item_count):
+        """Jumlah encode paralel: PLAYLIST_ENCODE_WORKERS atau jumlah core, maksimal jumlah item"""
+        workers = settings.SIGNAGE_SETTINGS.get('PLAYLIST_ENCODE_WORKERS') or os.cpu_count() or 1
+        return max(1, min(workers, item_count))
+
+    def _encode_sequence_items(self, sequence_data, temp_dir, target_width, target_height, quality_settings, progress=None):
+        """
+        Encode semua item sekaligus dengan pool terbatas. Kerja berat ada di
+        proses ffmpeg, jadi thread pool cukup untuk menjalankan beberapa
+        proses ffmpeg bersamaan tanpa fork proses Django. Core dibagi rata
+        lewat -threads supaya encode paralel tidak saling berebut CPU.
+        Return path segmen sesuai urutan sequence_data.
+        """
+        workers = self._encode_workers(len(sequence_data))
+        item_settings = dict(quality_settings, threads=max(1, (os.cpu_count() or 1) // workers))
+        temp_files = [os.path.join(temp_dir, f"temp_{item['sequence']}.mp4") for item in sequence_data]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    self._process_sequence_item,
+                    input_path=item['file_path'],
+                    output_path=temp_file,
+                    duration=item['duration'],
+                    is_video=item['is_video'],
+                    target_width=target_width,
+                    target_height=target_height,
+                    quality_settings=item_settings
+                ): item
+                for item, temp_file in zip(sequence_data, temp_files)
+            }
+            
+            done_count = 0
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    for pending in futures:
+                        pending.cancel()
+                    raise Exception(f"Failed to process item {item['content_name']}: {str(e)}")
+                
+                done_count += 1
+                if progress:
+                    progress(done_count / (len(sequence_data) + 1))
+        
+        return temp_files
+
     def _process_sequence_item(self, input_path, output_path, duration, is_video, target_width, target_height, quality_settings):
-        """Process individual sequence item with precise duration control"""
+        """
+        Process individual sequence item with precise duration control.
+        Item yang sama (file, resolusi, durasi, quality) diambil dari rendition cache.
+        """
         input_path = os.path.normpath(input_path)
         
         if not os.path.exists(input_path):
             raise Exception(f"Input file not found: {input_path}")
         
+        cache_key = rendition_cache.make_key(
+            input_path, 'sequence_item', target_width, target_height,
+            duration=duration, quality_settings=quality_settings
+        )
+        rendition_cache.fetch_or_encode(
+            cache_key, output_path,
+            lambda path: self._encode_sequence_item(
+                input_path, path, duration, target_width, target_height, quality_settings
+            )
+        )
+
+    def _encode_sequence_item(self, input_path, output_path, duration, target_width, target_height, quality_settings):
+        """Encode satu item sequence (loop, potong, atau gambar statis) dengan ffmpeg"""
         file_extension = os.path.splitext(input_path)[1].lower()
         actual_is_video = file_extension in ['.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.wmv']
         
@@ -1620,6 +1649,7 @@ class UploadPlaylist(View):
                 '-pix_fmt', 'yuv420p',
                 '-movflags', '+faststart',
                 '-r', '30',
+                '-threads', str(quality_settings.get('threads', 0)),
                 output_path
             ]
             
@@ -1651,6 +1681,7 @@ class UploadPlaylist(View):
             '-pix_fmt', 'yuv420p',
             '-movflags', '+faststart',
             '-r', '30',
+            '-threads', str(quality_settings.get('threads', 0)),
             output_path
         ]
         
@@ -1678,6 +1709,7 @@ class UploadPlaylist(View):
             '-pix_fmt', 'yuv420p',
             '-movflags', '+faststart',
             '-r', '30',
+            '-threads', str(quality_settings.get('threads', 0)),
             output_path
         ]
         
@@ -1704,6 +1736,7 @@ class UploadPlaylist(View):
             '-pix_fmt', 'yuv420p',
             '-movflags', '+faststart',
             '-r', '30',
+            '-threads', str(quality_settings.get('threads', 0)),
             output_path
         ]
         
@@ -1726,6 +1759,43 @@ class UploadPlaylist(View):
         except (subprocess.CalledProcessError, ValueError, subprocess.TimeoutExpired):
             return 0
 
+    def _probe_segment(self, video_path):
+        """Ringkasan format stream segmen (codec, resolusi, framerate, audio) dari FFprobe"""
+        try:
+            cmd = [
+                'ffprobe', '-v', 'quiet', '-show_entries',
+                'stream=codec_type,codec_name,profile,width,height,pix_fmt,r_frame_rate,sample_rate,channels',
+                '-of', 'json', video_path
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=30)
+            streams = json.loads(result.stdout).get('streams', [])
+        except (subprocess.CalledProcessError, ValueError, subprocess.TimeoutExpired):
+            return None
+        
+        return tuple(sorted(
+            tuple(sorted((key, str(value)) for key, value in stream.items()))
+            for stream in streams
+        ))
+
+    def _segments_match(self, segment_paths):
+        """True jika semua segmen punya codec, resolusi, framerate dan audio yang sama"""
+        signatures = {self._probe_segment(path) for path in segment_paths}
+        return len(signatures) == 1 and None not in signatures
+
+    def _concatenate_stream_copy(self, concat_list, output_path):
+        """Gabungkan segmen yang formatnya sama tanpa encode ulang"""
+        cmd = [
+            'ffmpeg', '-y', '-f', 'concat', '-safe', '0',
+            '-i', concat_list, '-c', 'copy', '-movflags', '+faststart', output_path
+        ]
+        
+        try:
+            subprocess.run(cmd, check=True, capture_output=True, text=True, timeout=300)
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Stream copy concatenation failed: {e.stderr}")
+        except subprocess.TimeoutExpired:
+            raise Exception("Concatenation processing timed out")
+
     def _concatenate_with_compression(self, concat_list, output_path, target_width, target_height, quality_settings):
         """Concatenate videos with optimized compression settings"""
         temp_concat = output_path.replace('.mp4', '_temp_concat.mp4')
@@ -1847,6 +1917,23 @@ def delete_expired_playlists(request):
     else:
         messages.error(request, 'Invalid request method.')
         return redirect('playlist_recycle_bin')
+
+def transcode_job_status(request, pk):
+    """Status dan progress TranscodeJob untuk polling dari halaman upload"""
+    job = get_object_or_404(TranscodeJob.objects.select_related('content', 'playlist'), pk=pk)
+    media = job.content or job.playlist
+
+    return JsonResponse({
+        'job_id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'progress': job.progress,
+        'error': job.error.splitlines()[0] if job.error else '',
+        'content_id': job.content_id,
+        'playlist_id': job.playlist_id,
+        'media_status': media.status if media else None,
+        'file_url': media.file.url if media and media.file else None,
+    })
 #----------------------------------------------------------#
 
 
@@ -1859,42 +1946,32 @@ class SchedulesView(View):
     def get(self, request):
         if request.GET.get('action') == 'calendar':
             return self.get_calendar_data(request)
+        if request.GET.get('action') == 'check_current':
+            return self.check_current_schedule(request)
 
         today = timezone.localtime(timezone.now()).date()
         now = timezone.localtime(timezone.now()).time()
 
         group_filter = request.GET.get('group', '')
+        group_ids = parse_group_ids(group_filter)
         
-        todays_schedules = Schedule.objects.filter(
-            playback_date=today,
-            publish_status='Published',
-            playback_end__gte=now  
-        )
-        
-        if group_filter:
-            group_ids = [int(id) for id in group_filter.split(',') if id.isdigit()]
-            todays_schedules = todays_schedules.filter(
-                publish_to__group__id__in=group_ids
-            ).distinct()
-        
-        todays_schedules = todays_schedules.order_by('playback_start')
+        todays = schedule_cursor.todays_schedules(today, now, group_ids)
+        current_schedule = self._current_schedule(todays, today, now, group_ids)
 
-        current_schedule = None
-        for schedule in todays_schedules:
-            if schedule.playback_start and schedule.playback_end:
-                if schedule.playback_start <= now <= schedule.playback_end:
-                    current_schedule = schedule
-                    break
-
-        schedules_to_display = []
+        current_index = 0
+        window = todays
         if current_schedule:
-            try:
-                idx = list(todays_schedules).index(current_schedule)
-                schedules_to_display = list(todays_schedules)[idx:idx+10]
-            except ValueError:
-                schedules_to_display = list(todays_schedules)[:10]
-        else:
-            schedules_to_display = list(todays_schedules)[:10]
+            start, schedule_id = current_schedule.playback_start, current_schedule.id
+            window = todays.filter(
+                Q(playback_start__gt=start) | Q(playback_start=start, id__gte=schedule_id)
+            )
+            current_index = todays.filter(
+                Q(playback_start__lt=start) | Q(playback_start=start, id__lt=schedule_id)
+            ).count()
+        schedules_to_display = list(
+            window.select_related('content', 'playlist').order_by('playback_start', 'id')[:10]
+        )
+        total_schedules = todays.count()
 
         current_media_url = None
         current_media_type = None
@@ -1906,15 +1983,10 @@ class SchedulesView(View):
                 current_media_url = current_schedule.playlist.file.url
                 current_media_type = current_schedule.playlist.file_type_playlist().lower()
 
-        all_schedules = list(todays_schedules)
-        current_index = 0
-        if current_schedule:
-            try:
-                current_index = all_schedules.index(current_schedule)
-            except ValueError:
-                current_index = 0
-
-        calendar_data = self.get_monthly_schedules(today.year, today.month)
+        cursor_schedule = current_schedule or (schedules_to_display[0] if schedules_to_display else None)
+        current_cursor = schedule_cursor.encode_cursor(
+            cursor_schedule.playback_start, cursor_schedule.id
+        ) if cursor_schedule else ''
 
         device_groups_with_schedules = DeviceGroup.objects.annotate(
             actual_schedule_count=Count('devices__published_schedules', distinct=True)
@@ -1926,30 +1998,69 @@ class SchedulesView(View):
             'current_media_url': current_media_url,
             'current_media_type': current_media_type,
             'current_index': current_index,
-            'total_schedules': len(all_schedules),
+            'current_cursor': current_cursor,
+            'total_schedules': total_schedules,
             'today': today,
             'now': now,
-            'calendar_data': json.dumps(calendar_data),
             'device_groups_with_schedules': device_groups_with_schedules,
             'active_group_filter': group_filter,
         }
         return render(request, self.template_name, context)
 
     
+    def _current_schedule(self, todays, today, now, group_ids):
+        """Schedule yang sedang tayang, dicari lewat schedule_index lalu satu lookup pk"""
+        covering = schedule_index.at(today, now, groups=group_ids or None)
+        if not covering:
+            return None
+        return todays.filter(pk=covering[0].schedule_id).select_related('content', 'playlist').first()
+
+    def check_current_schedule(self, request):
+        """AJAX auto refresh: schedule yang sedang tayang beserta cursor navigasinya"""
+        today = timezone.localtime(timezone.now()).date()
+        now = timezone.localtime(timezone.now()).time()
+        group_ids = parse_group_ids(request.GET.get('group', ''))
+
+        todays = schedule_cursor.todays_schedules(today, now, group_ids)
+        current = None
+        covering = schedule_index.at(today, now, groups=group_ids or None)
+        if covering:
+            row = todays.filter(pk=covering[0].schedule_id).values(*schedule_cursor.NAV_FIELDS).first()
+            current = schedule_cursor.serialize(row) if row else None
+
+        current_index = 0
+        if current:
+            start, schedule_id = schedule_cursor.decode_cursor(current['cursor'])
+            current_index = todays.filter(
+                Q(playback_start__lt=start) | Q(playback_start=start, id__lt=schedule_id)
+            ).count()
+
+        return JsonResponse({
+            'status': 'success',
+            'current_schedule': current,
+            'current_media_url': current['media_url'] if current else None,
+            'current_media_type': current['media_type'] if current else None,
+            'current_index': current_index,
+            'cursor': current['cursor'] if current else '',
+        })
+
     def get_calendar_data(self, request):
-        """AJAX endpoint for calendar data"""
+        """AJAX endpoint for calendar data (cached JSON, 304 via If-None-Match)"""
         try:
             year = int(request.GET.get('year', timezone.now().year))
             month = int(request.GET.get('month', timezone.now().month))
+            group_ids = parse_group_ids(request.GET.get('group', ''))
             
-            group_filter = request.GET.get('group', '')
-            
-            calendar_data = self.get_monthly_schedules(year, month, group_filter)
+            body, etag = month_payload(year, month, group_ids)
             
-            return JsonResponse({
-                'status': 'success',
-                'schedules': calendar_data['schedules']
-            })
+            if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+            if etag in [tag.strip() for tag in if_none_match.split(',')]:
+                response = HttpResponseNotModified()
+            else:
+                response = HttpResponse(body, content_type='application/json')
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, no-cache'
+            return response
         except Exception as e:
             logger.error(f"Error getting calendar data: {str(e)}")
             return JsonResponse({
@@ -1959,53 +2070,10 @@ class SchedulesView(View):
     
     def get_monthly_schedules(self, year, month, group_filter=None):
         """Get all schedules for a specific month with optional device group filter"""
-        first_day = date(year, month, 1)
-        if month == 12:
-            last_day = date(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            last_day = date(year, month + 1, 1) - timedelta(days=1)
-        
-        schedules = Schedule.objects.filter(
-            playback_date__gte=first_day,
-            playback_date__lte=last_day,
-            publish_status='Published'
-        )
-        
-        if group_filter:
-            group_ids = [int(id) for id in group_filter.split(',') if id.isdigit()]
-            schedules = schedules.filter(
-                publish_to__group__id__in=group_ids
-            ).distinct()
-        
-        schedules = schedules.order_by('playback_date', 'playback_start')
-        
-        schedules_data = []
-        for schedule in schedules:
-            schedule_data = {
-                'id': schedule.id,
-                'schedule_name': schedule.schedule_name,
-                'playback_date': schedule.playback_date.isoformat(),
-                'playback_start': schedule.playback_start.strftime('%H:%M') if schedule.playback_start else None,
-                'playback_end': schedule.playback_end.strftime('%H:%M') if schedule.playback_end else None,
-                'publish_status': schedule.publish_status,
-            }
-            
-            if schedule.is_content and schedule.content and schedule.content.file:
-                schedule_data['media_url'] = schedule.content.file.url
-                schedule_data['media_type'] = schedule.content.file_type_content().lower()
-            elif schedule.is_playlist and schedule.playlist and schedule.playlist.file:
-                schedule_data['media_url'] = schedule.playlist.file.url
-                schedule_data['media_type'] = schedule.playlist.file_type_playlist().lower()
-            else:
-                schedule_data['media_url'] = None
-                schedule_data['media_type'] = None
-            
-            schedules_data.append(schedule_data)
-        
         return {
             'year': year,
             'month': month,
-            'schedules': schedules_data
+            'schedules': build_month(year, month, parse_group_ids(group_filter))
         }
     
     def get_schedules_by_date(self, request):
@@ -2019,21 +2087,20 @@ class SchedulesView(View):
             
             target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
             
-            schedules = Schedule.objects.filter(
-                playback_date=target_date,
+            schedules = Schedule.objects.spanning(target_date, target_date).filter(
                 publish_status='Published'
             )
             
             if group_filter:
                 group_ids = [int(id) for id in group_filter.split(',') if id.isdigit()]
-                schedules = schedules.filter(
-                    publish_to__group__id__in=group_ids
-                ).distinct()
+                schedules = schedules.for_groups(group_ids, target_date, target_date)
             
             schedules = schedules.order_by('playback_start')
             
             schedules_data = []
             for schedule in schedules:
+                if not schedule.occurs_on(target_date):
+                    continue
                 schedule_data = {
                     'id': schedule.id,
                     'schedule_name': schedule.schedule_name,
@@ -2077,6 +2144,8 @@ class SchedulesView(View):
         
         if action == 'delete':
             return self.delete_schedule(request)
+        elif action == 'delete_series':
+            return self.delete_schedule_series(request)
         elif action == 'update':
             return self.update_schedule(request)
         elif action == 'navigate':
@@ -2101,21 +2170,20 @@ class SchedulesView(View):
             
             target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
             
-            schedules = Schedule.objects.filter(
-                playback_date=target_date,
+            schedules = Schedule.objects.spanning(target_date, target_date).filter(
                 publish_status='Published'
             )
             
             if group_filter:
                 group_ids = [int(id) for id in group_filter.split(',') if id.isdigit()]
-                schedules = schedules.filter(
-                    publish_to__group__id__in=group_ids
-                ).distinct()
+                schedules = schedules.for_groups(group_ids, target_date, target_date)
             
             schedules = schedules.order_by('playback_start')
             
             schedules_data = []
             for schedule in schedules:
+                if not schedule.occurs_on(target_date):
+                    continue
                 schedule_data = {
                     'id': schedule.id,
                     'schedule_name': schedule.schedule_name,
@@ -2142,66 +2210,53 @@ class SchedulesView(View):
             }, status=400)
     
     def navigate_schedule(self, request):
-        """Handle previous/next navigation with device group filter"""
+        """Handle previous/next navigation with device group filter (keyset cursor)"""
         try:
             direction = request.POST.get('direction')  # 'prev' or 'next'
-            current_index = int(request.POST.get('current_index', 0))
+            if direction not in ('prev', 'next'):
+                return JsonResponse({'status': 'error', 'message': 'Invalid direction'})
+            current_index = int(request.POST.get('current_index', 0) or 0)
             
             today = timezone.localtime(timezone.now()).date()
             now = timezone.localtime(timezone.now()).time()
+            group_ids = parse_group_ids(request.POST.get('group', ''))
             
-            group_filter = request.POST.get('group', '')
-            
-            todays_schedules = Schedule.objects.filter(
-                playback_date=today,
-                publish_status='Published',
-                playback_end__gte=now
-            )
-            
-            if group_filter:
-                group_ids = [int(id) for id in group_filter.split(',') if id.isdigit()]
-                todays_schedules = todays_schedules.filter(
-                    publish_to__group__id__in=group_ids
-                ).distinct()
-            
-            todays_schedules = list(todays_schedules.order_by('playback_start'))
+            todays = schedule_cursor.todays_schedules(today, now, group_ids)
             
-            if not todays_schedules:
-                return JsonResponse({'status': 'error', 'message': 'No schedules available'})
+            target = None
+            has_more = False
+            cursor = request.POST.get('cursor')
+            if cursor:
+                target, has_more = schedule_cursor.neighbour(
+                    todays, schedule_cursor.decode_cursor(cursor), direction
+                )
             
-            if direction == 'prev':
-                new_index = max(0, current_index - 1)
-            elif direction == 'next':
-                new_index = min(len(todays_schedules) - 1, current_index + 1)
+            if target is None:
+                # Sudah di ujung (atau belum ada cursor): tetap di schedule saat ini / pertama
+                if cursor:
+                    start, schedule_id = schedule_cursor.decode_cursor(cursor)
+                    row = todays.filter(pk=schedule_id).values(*schedule_cursor.NAV_FIELDS).first()
+                    target = schedule_cursor.serialize(row) if row else None
+                if target is None:
+                    target = schedule_cursor.first(todays)
+                    current_index = 0
+                if target is None:
+                    return JsonResponse({'status': 'error', 'message': 'No schedules available'})
+                new_index = current_index
             else:
-                return JsonResponse({'status': 'error', 'message': 'Invalid direction'})
-            
-            target_schedule = todays_schedules[new_index]
-            
-            media_url = None
-            media_type = None
-            
-            if target_schedule.is_content and target_schedule.content and target_schedule.content.file:
-                media_url = target_schedule.content.file.url
-                media_type = target_schedule.content.file_type_content().lower()
-            elif target_schedule.is_playlist and target_schedule.playlist and target_schedule.playlist.file:
-                media_url = target_schedule.playlist.file.url
-                media_type = target_schedule.playlist.file_type_playlist().lower()
+                new_index = current_index + 1 if direction == 'next' else max(0, current_index - 1)
             
             return JsonResponse({
                 'status': 'success',
-                'schedule': {
-                    'id': target_schedule.id,
-                    'name': target_schedule.schedule_name,
-                    'start_time': target_schedule.playback_start.strftime('%H:%M') if target_schedule.playback_start else '',
-                    'end_time': target_schedule.playback_end.strftime('%H:%M') if target_schedule.playback_end else '',
-                    'media_url': media_url,
-                    'media_type': media_type,
-                },
+                'schedule': target,
+                'cursor': target['cursor'],
                 'new_index': new_index,
-                'total_schedules': len(todays_schedules)
+                'has_prev': has_more if direction == 'prev' else new_index > 0,
+                'has_next': has_more if direction == 'next' else True,
             })
             
+        except ValueError as e:
+            return JsonResponse({'status': 'error', 'message': 'Invalid cursor'}, status=400)
         except Exception as e:
             logger.error(f"Error navigating schedule: {str(e)}")
             return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
@@ -2214,14 +2269,13 @@ class SchedulesView(View):
             
             today = timezone.localtime(timezone.now()).date()
             
-            if schedule.playback_date != today:
+            if not schedule.occurs_on(today):
                 return JsonResponse({
                     'status': 'error',
                     'message': 'Cannot skip schedule from another day'
                 }, status=400)
             
-            todays_schedules = Schedule.objects.filter(
-                playback_date=today,
+            todays_schedules = Schedule.objects.with_recurring_ids(today, today).filter(
                 publish_status='Published'
             ).exclude(id=schedule_id).order_by('playback_end')
             
@@ -2239,22 +2293,18 @@ class SchedulesView(View):
                 new_start_time = (datetime.combine(today, last_schedule.playback_end) + timedelta(minutes=1)).time()
                 new_end_time = (datetime.combine(today, new_start_time) + current_duration).time()
                 
-                conflicting_schedules = Schedule.objects.filter(
-                    playback_date=today,
-                    publish_status='Published',
-                    playback_start__lt=new_end_time,
-                    playback_end__gt=new_start_time
-                ).exclude(id=schedule_id)
+                conflicting_schedules = Schedule.objects.overlap_dates(
+                    [today], new_start_time, new_end_time, exclude=schedule_id
+                )
                 
-                if conflicting_schedules.exists():
+                if conflicting_schedules:
                     return JsonResponse({
                         'status': 'error',
                         'message': 'Cannot skip - would conflict with existing schedules'
                     }, status=400)
                 
-                schedule.playback_start = new_start_time
-                schedule.playback_end = new_end_time
-                schedule.save()
+                # Hanya kemunculan hari ini yang dipindah, bukan seluruh seri
+                schedule.split_occurrence(today, playback_start=new_start_time, playback_end=new_end_time)
                 
                 return JsonResponse({'status': 'success'})
             else:
@@ -2301,16 +2351,40 @@ class SchedulesView(View):
             return JsonResponse({'status': 'error'}, status=400)
     
     def delete_schedule(self, request):
-        """Delete a schedule without confirmation"""
+        """Delete one occurrence (occurrence_date, default today) without confirmation"""
         try:
             schedule_id = request.POST.get('schedule_id')
             schedule = get_object_or_404(Schedule, id=schedule_id)
-            schedule.delete()
+            
+            occurrence_date = request.POST.get('occurrence_date')
+            if occurrence_date:
+                day = datetime.strptime(occurrence_date, '%Y-%m-%d').date()
+            else:
+                day = timezone.localtime(timezone.now()).date()
+            
+            if not schedule.occurs_on(day):
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'Schedule does not occur on this date'
+                }, status=400)
+            
+            schedule.exclude_occurrence(day)
             return JsonResponse({'status': 'success'})
         except Exception as e:
             logger.error(f"Error deleting schedule: {str(e)}")
             return JsonResponse({'status': 'error'}, status=400)
     
+    def delete_schedule_series(self, request):
+        """Delete a schedule with all of its occurrences"""
+        try:
+            schedule_id = request.POST.get('schedule_id')
+            schedule = get_object_or_404(Schedule, id=schedule_id)
+            schedule.delete()
+            return JsonResponse({'status': 'success'})
+        except Exception as e:
+            logger.error(f"Error deleting schedule series: {str(e)}")
+            return JsonResponse({'status': 'error'}, status=400)
+    
     def update_schedule(self, request):
         """Update schedule without notifications"""
         try:
@@ -2319,9 +2393,30 @@ class SchedulesView(View):
             
             schedule.schedule_name = request.POST.get('schedule_name', schedule.schedule_name)
             
+            # Form menampilkan tanggal kemunculan; hanya perubahan nyata yang memindah seri
+            rule_changed = False
             playback_date = request.POST.get('playback_date')
             if playback_date:
-                schedule.playback_date = datetime.strptime(playback_date, '%Y-%m-%d').date()
+                playback_date = datetime.strptime(playback_date, '%Y-%m-%d').date()
+                occurrence_date = request.POST.get('occurrence_date')
+                shown_date = (
+                    datetime.strptime(occurrence_date, '%Y-%m-%d').date()
+                    if occurrence_date else schedule.playback_date
+                )
+                if playback_date != shown_date:
+                    schedule.playback_date = playback_date
+                    rule_changed = True
+            
+            schedule_type = request.POST.get('schedule_type')
+            if schedule_type in dict(Schedule.SCHEDULE_TYPE_CHOICES) and schedule_type != schedule.schedule_type:
+                schedule.schedule_type = schedule_type
+                rule_changed = True
+            
+            if rule_changed:
+                # recurrence_end ikut dihitung ulang di Schedule.save()
+                schedule.recurrence = build_rule(schedule.schedule_type, schedule.playback_date)
+                schedule.never_expire = schedule.schedule_type == 'List'
+                schedule.repeat = schedule.schedule_type != 'None'
             
             playback_start = request.POST.get('playback_start')
             if playback_start:
@@ -2399,7 +2494,7 @@ class SchedulesRecycleBinView(View):
             type_filters = Q()
             
             if 'Today' in types:
-                type_filters |= Q(playback_date=today)
+                type_filters |= Q(pk__in=Schedule.objects.with_recurring_ids(today, today).values('pk'))
             if 'Daily' in types:
                 type_filters |= Q(schedule_type='Daily')
             if 'Weekly' in types:
@@ -2409,15 +2504,13 @@ class SchedulesRecycleBinView(View):
             if 'Never Expire' in types:
                 type_filters |= Q(never_expire=True)
             if 'Expired' in types:
-                type_filters |= Q(playback_date__lt=today, never_expire=False)
+                type_filters |= Q(recurrence_end__lt=today, never_expire=False)
                 
             queryset = queryset.filter(type_filters)
         
         if filters.get('group'):
             group_ids = [int(id) for id in filters['group'].split(',') if id.isdigit()]
-            queryset = queryset.filter(
-                publish_to__group__id__in=group_ids
-            ).distinct()
+            queryset = queryset.for_groups(group_ids)
         
         if filters.get('q'):
             query = filters['q']
@@ -2529,35 +2622,14 @@ class SchedulesRecycleBinView(View):
         return redirect('schedules_recycle_bin')
 
 def export_schedule(request):
-    wb = xlwt.Workbook()
-    ws = wb.add_sheet('Schedule List')
-
-    header_style = xlwt.easyxf(
-        'font: bold on; pattern: pattern solid, fore_colour gray25; align: horiz center'
-    )
-
-    active_style = xlwt.easyxf(
-        'pattern: pattern solid, fore_colour light_green'
-    )
-
-    expired_style = xlwt.easyxf(
-        'pattern: pattern solid, fore_colour red'
-    )
-
-    draft_style = xlwt.easyxf(
-        'pattern: pattern solid, fore_colour yellow'
-    )
-
     headers = [
         "ID", "Schedule Name", "Schedule Type", "Status",
         "Content/Playlist", "Content Title", "Playlist Name",
         "Playback Date", "Never Expire", "Repeat",
         "Playback Start", "Playback End", "Devices",
-        "Description", "Created At", "Updated At"
+        "Description", "Created At", "Updated At",
+        "Recurrence", "Last Date"
     ]
-    
-    for col_num, header in enumerate(headers):
-        ws.write(0, col_num, header, header_style)
 
     column_widths = [
         2000,  
@@ -2575,89 +2647,93 @@ def export_schedule(request):
         6000,  
         6000,  
         5000,  
-        5000  
+        5000,  
+        4000,  
+        4000  
     ]
-    
-    for col_num, width in enumerate(column_widths):
-        ws.col(col_num).width = width
 
     today = timezone.now().date()
     current_time = timezone.now().time()
+    devices_prefetch = Prefetch('publish_to', queryset=Device.objects.only('id', 'name').order_by())
 
     active_schedules = Schedule.objects.filter(
         Q(never_expire=True) |
-        Q(playback_date__gt=today) |
-        Q(playback_date=today, playback_end__gte=current_time)
-    ).select_related('content', 'playlist').prefetch_related('publish_to').order_by('playback_date', 'playback_start', 'playback_end')
+        Q(recurrence_end__gt=today) |
+        Q(recurrence_end=today, playback_end__gte=current_time)
+    ).select_related('content', 'playlist').prefetch_related(devices_prefetch).order_by('playback_date', 'playback_start', 'playback_end', 'id')
 
     expired_schedules = Schedule.objects.filter(
         Q(never_expire=False) &
-        (Q(playback_date__lt=today) |
-         Q(playback_date=today, playback_end__lt=current_time))
-    ).select_related('content', 'playlist').prefetch_related('publish_to').order_by('playback_date', 'playback_start', 'playback_end')
+        (Q(recurrence_end__lt=today) |
+         Q(recurrence_end=today, playback_end__lt=current_time))
+    ).select_related('content', 'playlist').prefetch_related(devices_prefetch).order_by('playback_date', 'playback_start', 'playback_end', 'id')
 
-    schedules = list(active_schedules) + list(expired_schedules)
-    
-    for row_num, schedule in enumerate(schedules, start=1):
-        if schedule.publish_status == 'Draft':
-            row_style = draft_style
-        elif schedule.never_expire or (schedule.playback_date and 
-             (schedule.playback_date > today or 
-              (schedule.playback_date == today and 
-               (not schedule.playback_end or schedule.playback_end >= current_time)))):
-            row_style = active_style
-        else:
-            row_style = expired_style
-
-        content_playlist_type = ""
-        content_title = str(schedule.content.id) if schedule.content else "-"
-        playlist_name = str(schedule.playlist.id) if schedule.playlist else "-"
-        
-        if schedule.content:
-            content_playlist_type = "Content"
-            content_title = (
-                getattr(schedule.content, 'title', None) or
-                getattr(schedule.content, 'name', None) or
-                f"Content-{schedule.content.id}"
-            )
-        
-        if schedule.playlist:
-            content_playlist_type = "Playlist" if not content_playlist_type else "Both"
-            playlist_name = (
-                getattr(schedule.playlist, 'name', None) or
-                getattr(schedule.playlist, 'title', None) or
-                f"Playlist-{schedule.playlist.id}"
-            )
-        
-        playback_date = schedule.playback_date.strftime("%Y-%m-%d") if schedule.playback_date else "-"
-        playback_start = schedule.playback_start.strftime("%H:%M:%S") if schedule.playback_start else "-"
-        playback_end = schedule.playback_end.strftime("%H:%M:%S") if schedule.playback_end else "-"
-        created_at = schedule.created_at.strftime("%Y-%m-%d %H:%M:%S")
-        updated_at = schedule.updated_at.strftime("%Y-%m-%d %H:%M:%S")
-        devices = ", ".join([d.name or f"Device-{d.id}" for d in schedule.publish_to.all()]) if schedule.publish_to.exists() else "-"
-        
-        ws.write(row_num, 0, schedule.id, row_style)
-        ws.write(row_num, 1, schedule.schedule_name, row_style)
-        ws.write(row_num, 2, schedule.schedule_type, row_style)
-        ws.write(row_num, 3, schedule.publish_status, row_style)
-        ws.write(row_num, 4, content_playlist_type, row_style)
-        ws.write(row_num, 5, content_title, row_style)
-        ws.write(row_num, 6, playlist_name, row_style)
-        ws.write(row_num, 7, playback_date, row_style)
-        ws.write(row_num, 8, "Yes" if schedule.never_expire else "No", row_style)
-        ws.write(row_num, 9, "Yes" if schedule.repeat else "No", row_style)
-        ws.write(row_num, 10, playback_start, row_style)
-        ws.write(row_num, 11, playback_end, row_style)
-        ws.write(row_num, 12, devices, row_style)
-        ws.write(row_num, 13, schedule.description if schedule.description else "-", row_style)
-        ws.write(row_num, 14, created_at, row_style)
-        ws.write(row_num, 15, updated_at, row_style)
-
-    response = HttpResponse(content_type='application/vnd.ms-excel')
-    response['Content-Disposition'] = 'attachment; filename=ScheduleList.xls'
-    wb.save(response)
-    
-    return response
+    def rows():
+        for schedule in itertools.chain(chunked(active_schedules), chunked(expired_schedules)):
+            yield schedule_export_row(schedule, today, current_time)
+
+    return export_response(
+        request, Export('ScheduleList', 'Schedule List', headers, rows(), widths=column_widths)
+    )
+
+def schedule_export_row(schedule, today, current_time):
+    if schedule.publish_status == 'Draft':
+        row_style = 'draft'
+    elif schedule.never_expire or (schedule.recurrence_end and 
+         (schedule.recurrence_end > today or 
+          (schedule.recurrence_end == today and 
+           (not schedule.playback_end or schedule.playback_end >= current_time)))):
+        row_style = 'active'
+    else:
+        row_style = 'expired'
+
+    content_playlist_type = ""
+    content_title = str(schedule.content.id) if schedule.content else "-"
+    playlist_name = str(schedule.playlist.id) if schedule.playlist else "-"
+
+    if schedule.content:
+        content_playlist_type = "Content"
+        content_title = (
+            getattr(schedule.content, 'title', None) or
+            getattr(schedule.content, 'name', None) or
+            f"Content-{schedule.content.id}"
+        )
+
+    if schedule.playlist:
+        content_playlist_type = "Playlist" if not content_playlist_type else "Both"
+        playlist_name = (
+            getattr(schedule.playlist, 'name', None) or
+            getattr(schedule.playlist, 'title', None) or
+            f"Playlist-{schedule.playlist.id}"
+        )
+
+    playback_date = schedule.playback_date.strftime("%Y-%m-%d") if schedule.playback_date else "-"
+    playback_start = schedule.playback_start.strftime("%H:%M:%S") if schedule.playback_start else "-"
+    playback_end = schedule.playback_end.strftime("%H:%M:%S") if schedule.playback_end else "-"
+    created_at = schedule.created_at.strftime("%Y-%m-%d %H:%M:%S")
+    updated_at = schedule.updated_at.strftime("%Y-%m-%d %H:%M:%S")
+    devices = ", ".join([d.name or f"Device-{d.id}" for d in schedule.publish_to.all()]) or "-"
+
+    return [
+        schedule.id,
+        schedule.schedule_name,
+        schedule.schedule_type,
+        schedule.publish_status,
+        content_playlist_type,
+        content_title,
+        playlist_name,
+        playback_date,
+        "Yes" if schedule.never_expire else "No",
+        "Yes" if schedule.repeat else "No",
+        playback_start,
+        playback_end,
+        devices,
+        schedule.description if schedule.description else "-",
+        created_at,
+        updated_at,
+        describe_recurrence(schedule.recurrence),
+        schedule.recurrence_end.strftime("%Y-%m-%d") if schedule.recurrence_end else "-",
+    ], row_style
 
 logger = logging.getLogger(__name__)
 
@@ -2788,45 +2864,38 @@ class ManagePageView(View):
             f"{media_type}: {media_name}"
         )
         
-        schedules_to_create = []
-        
-        if schedule_type == 'None':
-            dates = [base_date]
-        elif schedule_type == 'Daily':
-            dates = [base_date + timedelta(days=i) for i in range(7)]
-        elif schedule_type == 'Weekly':
-            dates = []
-            current_date = base_date
-            while current_date.month == base_date.month:
-                dates.append(current_date)
-                current_date += timedelta(weeks=1)
-        elif schedule_type == 'Monthly':
-            dates = [base_date + relativedelta(months=i) for i in range(12)]
-        elif schedule_type == 'List':
-            dates = [base_date + timedelta(days=i) for i in range(365)]
-        
-        for playback_date in dates:
-            schedule = Schedule(
-                schedule_name=form_data['schedule_name'],
-                schedule_type=schedule_type,
-                content=content,
-                playlist=playlist,
-                playback_date=playback_date,
-                never_expire=(schedule_type == 'List'),
-                repeat=(schedule_type != 'None'),
-                playback_start=form_data['playback_start'],
-                playback_end=form_data['playback_end'],
-                description=description,
-                publish_status='Published'
+        dates = expand_dates(schedule_type, base_date)
+        
+        conflict_dates = Schedule.objects.overlap_dates(
+            dates, form_data['playback_start'], form_data['playback_end'],
+            groups=[device_group.id]
+        )
+        if conflict_dates:
+            messages.warning(
+                request,
+                f"{len(conflict_dates)} of {len(dates)} dates overlap existing schedules in "
+                f"{device_group.name} (first: {conflict_dates[0]})"
             )
-            schedules_to_create.append(schedule)
         
-        with transaction.atomic():
-            created_schedules = Schedule.objects.bulk_create(schedules_to_create)
-            for schedule in created_schedules:
-                schedule.publish_to.set(devices_in_group)
+        schedule = Schedule(
+            schedule_name=form_data['schedule_name'],
+            schedule_type=schedule_type,
+            content=content,
+            playlist=playlist,
+            playback_date=base_date,
+            recurrence=build_rule(schedule_type, base_date),
+            never_expire=(schedule_type == 'List'),
+            repeat=(schedule_type != 'None'),
+            playback_start=form_data['playback_start'],
+            playback_end=form_data['playback_end'],
+            description=description,
+            publish_status='Published'
+        )
+        
+        bulk_create_schedules([schedule], devices_in_group)
         
-        return len(created_schedules)
+        # Satu baris schedule; nilai kembali adalah jumlah kemunculannya
+        return len(dates)
     
     def get(self, request, *args, **kwargs):
         context = self.get_context_data(request)
@@ -2848,7 +2917,8 @@ class ManagePageView(View):
             try:
                 created_count = self.create_schedules(form.cleaned_data, request)
                 if created_count > 0:
-                    messages.success(request, f"Successfully created {created_count} schedules!")
+                    occurrences = f"{created_count} occurrence{'s' if created_count != 1 else ''}"
+                    messages.success(request, f"Successfully created 1 schedule with {occurrences}!")
                     return redirect('schedules')
                 else:
                     messages.warning(request, "No schedules were created. Please check your input.")
@@ -2869,7 +2939,7 @@ def device_view(request):
     group_id = request.GET.get('group_id')
     search_query = request.GET.get('q', '').strip()  
     
-    devices = Device.objects.all().order_by('-is_online', '-last_updated')
+    devices = Device.objects.select_related('group')
     groups = DeviceGroup.objects.all().order_by('name')
     
     if group_id:
@@ -2888,17 +2958,20 @@ def device_view(request):
             models.Q(group__name__icontains=search_query)
         )
 
-        device_count = devices.count()
+    page = DEVICE_LISTING.paginate(request, devices)
+    if search_query:
+        device_count = page.total
     
     return render(request, 'device/device_page.html', {
-        'devices': devices,
+        'devices': page,
+        'page': page,
         'groups': groups,
         'selected_group': selected_group,
         'device_count': device_count,
         'schedule_count': schedule_count,
         'current_time': timezone.now(),
-        'sort': request.GET.get('sort', ''),
-        'order': request.GET.get('order', ''),
+        'sort': page.sort,
+        'order': page.order,
         'view': request.GET.get('view', 'table')
     })
 
@@ -2908,29 +2981,9 @@ def device_update(request, pk):
     if request.method == 'POST':
         new_group_id = request.POST.get('group')
         
-        old_group = device.group
         device.group_id = new_group_id if new_group_id else None
         device.save()
         
-        if old_group:
-            old_group.update_device_count()
-        if device.group:
-            device.group.update_device_count()
-        
-        schedules = Schedule.objects.filter(publish_to=device)
-        
-        affected_groups = set()
-        if old_group:
-            affected_groups.add(old_group)
-        if device.group:
-            affected_groups.add(device.group)
-        
-        for schedule in schedules:
-            affected_groups.update(schedule.get_related_groups())
-        
-        for group in affected_groups:
-            group.update_schedule_count()
-        
         messages.success(request, 'Device group has been updated successfully!')
         return redirect('device_view') 
     
@@ -2988,53 +3041,31 @@ def device_group_delete(request, pk):
     return JsonResponse({'success': False, 'message': 'Invalid request'}, status=400)
 
 def export_device(request):
-    wb = xlwt.Workbook()
-    ws = wb.add_sheet('Device List')
-
-    header_style = xlwt.easyxf(
-        'font: bold on; pattern: pattern solid, fore_colour gray25; align: horiz center'
-    )
-    
-    online_style = xlwt.easyxf(
-        'pattern: pattern solid, fore_colour light_green'
-    )
-    
-    offline_style = xlwt.easyxf(
-        'pattern: pattern solid, fore_colour red'
-    )
-
     headers = [
         "ID", "IP Address", "Hostname", 
         "User Agent", "Resolution", 
         "Group", "Is Online", "Created At",
         "Last Updated"
     ]
-    
-    for col_num, header in enumerate(headers):
-        ws.write(0, col_num, header, header_style)
-
     col_widths = [2000, 5000, 5000, 10000, 4000, 5000, 3000, 5000, 5000]
-    for col_num, width in enumerate(col_widths):
-        ws.col(col_num).width = width
-
-    devices = Device.objects.all().select_related('group')
-    for row_num, device in enumerate(devices, start=1):
-        row_style = online_style if device.is_online else offline_style
-        
-        ws.write(row_num, 0, device.id, row_style)
-        ws.write(row_num, 1, device.ip_address, row_style)
-        ws.write(row_num, 2, device.name if device.name else "", row_style)
-        ws.write(row_num, 3, device.user_agent, row_style)
-        ws.write(row_num, 4, device.resolution, row_style)
-        ws.write(row_num, 5, device.group.name if device.group else "No Group", row_style)
-        ws.write(row_num, 6, "Yes" if device.is_online else "No", row_style)
-        ws.write(row_num, 7, device.created_at.strftime('%Y-%m-%d %H:%M:%S'), row_style)
-        ws.write(row_num, 8, device.last_updated.strftime('%Y-%m-%d %H:%M:%S'), row_style)
-
-    response = HttpResponse(content_type='application/vnd.ms-excel')
-    response['Content-Disposition'] = 'attachment; filename=DeviceList.xls'
-    wb.save(response)
-    return response
+
+    devices = Device.objects.select_related('group').order_by('id')
+
+    def rows():
+        for device in chunked(devices):
+            yield [
+                device.id,
+                device.ip_address,
+                device.name if device.name else "",
+                device.user_agent,
+                device.resolution,
+                device.group.name if device.group else "No Group",
+                "Yes" if device.is_online else "No",
+                device.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                device.last_updated.strftime('%Y-%m-%d %H:%M:%S'),
+            ], 'online' if device.is_online else 'offline'
+
+    return export_response(request, Export('DeviceList', 'Device List', headers, rows(), widths=col_widths))
 
 logger = logging.getLogger(__name__)
 
@@ -3126,11 +3157,8 @@ class DigitalSignageViews:
         device = getattr(request, 'signage_device', None)
         
         if device is None:
-            try:
-                device = Device.objects.get(ip_address=ip_address)
-                request.signage_device = device
-            except Device.DoesNotExist:
-                device = None
+            device = get_device_snapshot(ip_address)
+            request.signage_device = device
         
         group_info = DigitalSignageViews._get_group_info(device)
         schedule_info = DigitalSignageViews._get_current_schedule(device)
@@ -3172,12 +3200,7 @@ class DigitalSignageViews:
             schedule_end_timestamp = schedule_info['end_timestamp']
         
         if next_schedule_info:
-            next_date = timezone.datetime.strptime(next_schedule_info['date'], "%Y-%m-%d").date()
-            next_start_time = timezone.datetime.strptime(next_schedule_info['start_time'], "%H:%M").time()
-            next_schedule_datetime = timezone.make_aware(
-                timezone.datetime.combine(next_date, next_start_time)
-            )
-            next_schedule_timestamp = next_schedule_datetime.timestamp()
+            next_schedule_timestamp = next_schedule_info['start_timestamp']
         
         context = {
             'ip_address': ip_address,
@@ -3191,6 +3214,7 @@ class DigitalSignageViews:
             'current_timestamp': current_timestamp,
             'schedule_end_timestamp': schedule_end_timestamp,
             'next_schedule_timestamp': next_schedule_timestamp,
+            'stream_enabled': isinstance(request, ASGIRequest),
             'media_content_json': json.dumps(media_content) if media_content else 'null',
             'schedule_info_json': json.dumps(schedule_info) if schedule_info else 'null',
             'group_info_json': json.dumps(group_info) if group_info else 'null',
@@ -3218,271 +3242,190 @@ class DigitalSignageViews:
         
         return render(request, 'schedules/components/display.html', context)
 
+    @staticmethod
+    @never_cache
+    async def signage_stream(request):
+        """
+        Server-Sent Events untuk layar signage (butuh server ASGI).
+        Mengirim event `timeline` berisi slot aktif dan slot berikutnya setiap
+        kali timeline group device berubah atau saat batas slot terlewati.
+        Di WSGI koneksi ini akan menahan satu worker selamanya, jadi dijawab
+        204 (EventSource berhenti reconnect) dan display tetap polling.
+        """
+        if not isinstance(request, ASGIRequest):
+            return HttpResponse(status=204)
+
+        ip_address = request.META.get('REMOTE_ADDR', '0.0.0.0')
+        keepalive = settings.SIGNAGE_SETTINGS.get('STREAM_KEEPALIVE', 15)
+
+        def build_payload():
+            device = get_device_snapshot(ip_address)
+            current = DigitalSignageViews._get_current_schedule(device)
+            upcoming = DigitalSignageViews._get_next_schedule(device)
+            return device.group_id if device else None, {
+                'current': compact_slot(current),
+                'next': compact_slot(upcoming),
+                'ts': timezone.now().timestamp(),
+            }
+
+        async def event_stream():
+            group_id, payload = await sync_to_async(build_payload)()
+            subscription = hub.subscribe(group_id, ip_address)
+            try:
+                yield 'retry: 5000\n\n'
+                while True:
+                    yield format_event('timeline', payload)
+
+                    boundaries = [
+                        slot[key] for slot in (payload['current'], payload['next']) if slot
+                        for key in ('at', 'until') if slot.get(key) and slot[key] > payload['ts']
+                    ]
+                    wait = keepalive
+                    if boundaries:
+                        wait = max(1, min(keepalive, min(boundaries) - payload['ts'] + 1))
+
+                    try:
+                        event = await asyncio.wait_for(subscription.queue.get(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        event = None
+
+                    if event == CLOSED:
+                        return
+
+                    new_group_id, new_payload = await sync_to_async(build_payload)()
+                    if new_group_id != group_id:
+                        hub.unsubscribe(subscription)
+                        subscription = hub.subscribe(new_group_id, ip_address)
+                        group_id = new_group_id
+
+                    if event is None and new_payload['current'] == payload['current'] and new_payload['next'] == payload['next']:
+                        payload = new_payload
+                        yield ': keepalive\n\n'
+                        continue
+                    payload = new_payload
+            finally:
+                hub.unsubscribe(subscription)
+
+        response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    @staticmethod
+    @never_cache
+    def signage_manifest(request):
+        """
+        Manifest prefetch untuk device yang meminta: slot dalam
+        PREFETCH_HORIZON_HOURS ke depan beserta URL, ukuran dan hash media.
+        Mendukung If-None-Match (304) berdasarkan versi manifest.
+        """
+        ip_address = request.META.get('REMOTE_ADDR', '0.0.0.0')
+        device = get_device_snapshot(ip_address)
+        manifest = build_prefetch_manifest(device)
+
+        etag = f'"{manifest["version"]}"'
+        if etag in [tag.strip() for tag in request.META.get('HTTP_IF_NONE_MATCH', '').split(',')]:
+            response = HttpResponse(status=304)
+        else:
+            response = JsonResponse(manifest)
+        response['ETag'] = etag
+        return response
+
+    @staticmethod
+    def signage_service_worker(request):
+        """Service worker prefetch media, dilayani dengan scope '/' agar bisa mencegat /media/"""
+        response = render(
+            request, 'schedules/components/signage_sw.js',
+            {'MEDIA_URL': settings.MEDIA_URL}, content_type='application/javascript'
+        )
+        response['Service-Worker-Allowed'] = '/'
+        response['Cache-Control'] = 'no-cache'
+        return response
+
     @staticmethod
     def _get_group_info(device):
         """Mendapatkan informasi group dari device"""
-        if device and device.group:
-            group = device.group
-            return {
-                'name': group.name,
-                'id': group.id,
-                'device_count': group.device_count,
-                'schedule_count': group.schedule_count,
-                'description': group.description
-            }
+        timeline = get_group_timeline(device.group_id) if device else None
+        if timeline:
+            return timeline['group']
         return None
 
     @staticmethod
     def _get_current_schedule(device):
-        """Mendapatkan schedule aktif untuk device berdasarkan group"""
-        if not device or not device.group:
+        """Mendapatkan schedule aktif untuk device berdasarkan timeline group"""
+        if not device or not device.group_id:
             return None
         
-        now_time = timezone.localtime().time()
-        today_date = timezone.localtime().date()
-        now_datetime = timezone.localtime()
-        
-        active_schedules = Schedule.objects.filter(
-            publish_to__group=device.group,
-            publish_status='Published',
-            playback_date=today_date,
-            playback_start__lte=now_time,
-            playback_end__gte=now_time
-        ).select_related('content', 'playlist').order_by('-playback_start')
+        now_timestamp = timezone.now().timestamp()
+        entry = find_current_entry(get_group_timeline(device.group_id), now_timestamp)
         
-        if active_schedules.exists():
-            schedule = active_schedules.first()
-            file_path, media_type = DigitalSignageViews._get_file_info(schedule)
-            
-            schedule_end_datetime = timezone.make_aware(
-                timezone.datetime.combine(schedule.playback_date, schedule.playback_end)
-            )
-            
+        if entry:
             return {
-                'name': schedule.schedule_name,
-                'date': schedule.playback_date.strftime("%Y-%m-%d"),
-                'start_time': schedule.playback_start.strftime("%H:%M"),
-                'end_time': schedule.playback_end.strftime("%H:%M"),
-                'content_type': 'Content' if schedule.content else 'Playlist' if schedule.playlist else 'None',
-                'file_path': file_path,
-                'media_type': media_type,
+                'name': entry['name'],
+                'date': entry['date'],
+                'start_time': entry['start_time'],
+                'end_time': entry['end_time'],
+                'content_type': entry['content_type'],
+                'file_path': entry_file_path(entry, device.resolution),
+                'media_type': entry['media_type'],
                 'is_current': True,
-                'schedule_id': schedule.id,
-                'end_timestamp': schedule_end_datetime.timestamp(),
-                'remaining_seconds': max(0, (schedule_end_datetime - now_datetime).total_seconds())
+                'schedule_id': entry['schedule_id'],
+                'start_timestamp': entry['start_timestamp'],
+                'end_timestamp': entry['end_timestamp'],
+                'remaining_seconds': max(0, entry['end_timestamp'] - now_timestamp)
             }
         
         return None
 
     @staticmethod
     def _get_next_schedule(device):
-        """Mendapatkan schedule berikutnya untuk device"""
-        if not device or not device.group:
+        """Mendapatkan schedule berikutnya untuk device dari timeline group"""
+        if not device or not device.group_id:
             return None
         
-        now_time = timezone.localtime().time()
-        today_date = timezone.localtime().date()
-        now_datetime = timezone.localtime()
-        
-        next_schedules = Schedule.objects.filter(
-            publish_to__group=device.group,
-            publish_status='Published',
-            playback_date__gte=today_date
-        ).filter(
-            Q(playback_date__gt=today_date) | 
-            Q(playback_date=today_date, playback_start__gt=now_time)
-        ).select_related('content', 'playlist').order_by('playback_date', 'playback_start')
-        
-        if next_schedules.exists():
-            schedule = next_schedules.first()
-            file_path, media_type = DigitalSignageViews._get_file_info(schedule)
-            
-            schedule_start_datetime = timezone.make_aware(
-                timezone.datetime.combine(schedule.playback_date, schedule.playback_start)
-            )
-            
+        now_timestamp = timezone.now().timestamp()
+        entry = find_next_entry(get_group_timeline(device.group_id), now_timestamp)
+        
+        if entry:
             return {
-                'name': schedule.schedule_name,
-                'date': schedule.playback_date.strftime("%Y-%m-%d"),
-                'start_time': schedule.playback_start.strftime("%H:%M"),
-                'end_time': schedule.playback_end.strftime("%H:%M"),
-                'content_type': 'Content' if schedule.content else 'Playlist' if schedule.playlist else 'None',
-                'file_path': file_path,
-                'media_type': media_type,
+                'name': entry['name'],
+                'date': entry['date'],
+                'start_time': entry['start_time'],
+                'end_time': entry['end_time'],
+                'content_type': entry['content_type'],
+                'file_path': entry_file_path(entry, device.resolution),
+                'media_type': entry['media_type'],
                 'is_current': False,
-                'schedule_id': schedule.id,
-                'start_timestamp': schedule_start_datetime.timestamp(),
-                'seconds_until_start': max(0, (schedule_start_datetime - now_datetime).total_seconds())
+                'schedule_id': entry['schedule_id'],
+                'start_timestamp': entry['start_timestamp'],
+                'end_timestamp': entry['end_timestamp'],
+                'seconds_until_start': max(0, entry['start_timestamp'] - now_timestamp)
             }
         
         return None
 
     @staticmethod
-    def _get_file_info(schedule):
-        """Mendapatkan file path dan media type dari schedule"""
-        file_obj = None
-        media_type = 'unknown'
-        
-        if schedule.content:
-            file_obj = schedule.content.file
-            media_type = schedule.content.file_type_content().lower()
-        elif schedule.playlist:
-            file_obj = schedule.playlist.file
-            media_type = schedule.playlist.file_type_playlist().lower()
-        
-        if file_obj:
-            return file_obj.url, media_type
-        else:
-            return '/media/assets/loading.MP4', 'video'
+    def _get_file_info(schedule, device=None):
+        """Mendapatkan file path (rendition terdekat untuk device) dan media type dari schedule"""
+        return resolve_file_info(schedule, device.resolution if device else None)
     
     @staticmethod
     def _get_media_info(schedule_info):
-        """Mendapatkan informasi media dan mengoptimalkan untuk tampilan layar"""
-        media_info = {
-            'dimensions': None,
-            'optimized': False,
-            'aspect_ratio': None,
-            'file_size': None
-        }
-        
+        """
+        Informasi media (dimensi, optimized, ukuran) dari tabel MediaMetadata.
+        Probe PIL/ffprobe dilakukan saat upload/transcode, bukan di sini.
+        """
         if not schedule_info or not schedule_info.get('file_path'):
-            return media_info
+            return build_media_info(None)
         
         try:
-            file_path = schedule_info['file_path']
-            media_type = schedule_info['media_type']
-            
-            if file_path.startswith('/media/'):
-                full_path = os.path.join(settings.MEDIA_ROOT, file_path[7:])
-            else:
-                full_path = file_path
-            
-            if not os.path.exists(full_path):
-                logger.warning(f"[MEDIA_INFO] File tidak ditemukan: {full_path}")
-                return media_info
-            
-            media_info['file_size'] = os.path.getsize(full_path)
-            
-            if media_type in ['image', 'jpg', 'jpeg', 'png', 'gif', 'bmp']:
-                media_info = DigitalSignageViews._process_image_with_pil(full_path, media_info)
-            elif media_type in ['video', 'mp4', 'avi', 'mov', 'mkv', 'wmv']:
-                media_info = DigitalSignageViews._process_video_info(full_path, media_info)
-            
+            name = media_name_from_url(schedule_info['file_path'])
+            metadata = get_media_metadata(name)
+            if metadata is None:
+                logger.warning(f"[MEDIA_INFO] File tidak ditemukan: {schedule_info['file_path']}")
+            return build_media_info(metadata)
         except Exception as e:
             logger.error(f"[MEDIA_INFO] Error processing media: {str(e)}")
-        
-        return media_info
-    
-    @staticmethod
-    def _process_image_with_pil(file_path, media_info):
-        """Process image file untuk mendapatkan dimensi dan optimasi menggunakan PIL"""
-        try:
-            with Image.open(file_path) as img:
-                width, height = img.size
-                media_info['dimensions'] = {
-                    'width': width,
-                    'height': height
-                }
-                media_info['aspect_ratio'] = width / height if height > 0 else 1
-                
-                common_resolutions = [
-                    (1920, 1080),  # Full HD
-                    (1366, 768),   # HD
-                    (3840, 2160),  # 4K
-                    (2560, 1440),  # 2K
-                ]
-                
-                for res_width, res_height in common_resolutions:
-                    if abs(width - res_width) <= 50 and abs(height - res_height) <= 50:
-                        media_info['optimized'] = True
-                        break
-                
-                aspect_16_9 = 16/9
-                aspect_4_3 = 4/3
-                current_aspect = media_info['aspect_ratio']
-                
-                if (abs(current_aspect - aspect_16_9) <= 0.1 or 
-                    abs(current_aspect - aspect_4_3) <= 0.1):
-                    media_info['optimized'] = True
-                
-                logger.info(f"[IMAGE_INFO] {file_path}: {width}x{height}, AR: {current_aspect:.2f}, Optimized: {media_info['optimized']}")
-                
-        except Exception as e:
-            logger.error(f"[IMAGE_PROCESS] Error: {str(e)}")
-        
-        return media_info
-    
-    @staticmethod
-    def _process_video_info(file_path, media_info):
-        """Process video file untuk mendapatkan informasi dasar"""
-        try:
-            try:
-                import subprocess
-                import json
-                
-                cmd = [
-                    'ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_format', '-show_streams',
-                    file_path
-                ]
-                
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-                
-                if result.returncode == 0:
-                    video_info = json.loads(result.stdout)
-                    
-                    for stream in video_info.get('streams', []):
-                        if stream.get('codec_type') == 'video':
-                            width = stream.get('width')
-                            height = stream.get('height')
-                            
-                            if width and height:
-                                media_info['dimensions'] = {
-                                    'width': width,
-                                    'height': height
-                                }
-                                media_info['aspect_ratio'] = width / height if height > 0 else 1
-                                
-                                common_resolutions = [
-                                    (1920, 1080),  # Full HD
-                                    (1366, 768),   # HD
-                                    (3840, 2160),  # 4K
-                                    (2560, 1440),  # 2K
-                                ]
-                                
-                                for res_width, res_height in common_resolutions:
-                                    if abs(width - res_width) <= 50 and abs(height - res_height) <= 50:
-                                        media_info['optimized'] = True
-                                        break
-                                
-                                aspect_16_9 = 16/9
-                                current_aspect = media_info['aspect_ratio']
-                                
-                                if abs(current_aspect - aspect_16_9) <= 0.1:
-                                    media_info['optimized'] = True
-                                
-                                logger.info(f"[VIDEO_INFO] {file_path}: {width}x{height}, AR: {current_aspect:.2f}, Optimized: {media_info['optimized']}")
-                                break
-                    
-                else:
-                    logger.warning(f"[VIDEO_PROCESS] ffprobe failed for: {file_path}")
-                    
-            except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError) as e:
-                logger.warning(f"[VIDEO_PROCESS] ffprobe not available or failed: {str(e)}")
-                
-                # Fallback: assume common video resolution
-                media_info['dimensions'] = {
-                    'width': 1920,
-                    'height': 1080
-                }
-                media_info['aspect_ratio'] = 16/9
-                media_info['optimized'] = True
-                
-                logger.info(f"[VIDEO_INFO] {file_path}: Using fallback 1920x1080 (16:9)")
-                
-        except Exception as e:
-            logger.error(f"[VIDEO_PROCESS] Error: {str(e)}")
-        
-        return media_info
+            return build_media_info(None)
     
     @staticmethod
     def get_media_optimization_status(request):
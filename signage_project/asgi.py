@@ -2,6 +2,10 @@
 ASGI config for signage_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve the project through this module (e.g. uvicorn/daphne) to enable the
+long-lived ``/signage/stream/`` Server-Sent Events connections. Under WSGI
+each connection would hold a worker forever, so the display page does not
+open the stream and the view answers 204; displays then use XHR polling only.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -125,18 +125,41 @@ CSRF_TRUSTED_ORIGINS = ['http://localhost:8000', 'http://127.0.0.1:8000']
 
 # File Upload Settings
 DATA_UPLOAD_MAX_MEMORY_SIZE = 52428800  # 50MB
-FILE_UPLOAD_MAX_MEMORY_SIZE = 52428800  # 50MB
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2621440  # 2.5MB, larger uploads are streamed to FILE_UPLOAD_TEMP_DIR
+FILE_UPLOAD_TEMP_DIR = BASE_DIR / 'tmp'  # same filesystem as MEDIA_ROOT so encodes move with a rename
 ALLOWED_FILE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.webp', '.mp4', '.mov', '.avi', '.mkv']
 
 # Digital Signage Settings
 SIGNAGE_SETTINGS = {
     'DEVICE_PING_INTERVAL': 300,
-    'DEVICE_OFFLINE_THRESHOLD': 600,
+    'DEVICE_OFFLINE_THRESHOLD': 60,
+    'OFFLINE_SWEEP_INTERVAL': 30,
+    'OFFLINE_SWEEP_IN_PROCESS': True,  # False jika sweep_offline_devices --loop dijalankan terpisah
     'DEFAULT_CONTENT_DURATION': 10000,
     'DEFAULT_REFRESH_INTERVAL': 30,
     'MAX_CONTENT_SIZE': 100 * 1024 * 1024,
     'SUPPORTED_IMAGE_FORMATS': ['JPEG', 'PNG', 'WEBP'],
     'SUPPORTED_VIDEO_FORMATS': ['MP4', 'AVI', 'MOV', 'MKV'],
+    'TIMELINE_DAYS': 7,
+    'SCHEDULE_INDEX_TTL': 300,
+    'STREAM_KEEPALIVE': 15,
+    'HEARTBEAT_FLUSH_INTERVAL': 10,
+    'HEARTBEAT_MAX_BUFFER': 500,
+    'PLAYLIST_ENCODE_WORKERS': None,
+    'RENDITION_CACHE_DIR': None,  # default MEDIA_ROOT/renditions
+    'RENDITION_CACHE_MAX_BYTES': 5 * 1024 ** 3,
+    'MEDIA_METADATA_MISS_TTL': 60,  # detik; file hilang/belum di-probe di jalur display
+    'RENDITION_LADDER': [(1280, 720), (1920, 1080), (3840, 2160)],  # ditambah resolusi Device yang terdaftar
+    'MEDIA_SENDFILE_HEADER': None,  # 'X-Accel-Redirect' (nginx) atau 'X-Sendfile' (Apache)
+    'MEDIA_SENDFILE_PREFIX': '/protected-media/',  # location internal nginx untuk X-Accel-Redirect
+    'PREFETCH_HORIZON_HOURS': 6,  # jangkauan manifest prefetch media per device
+    'SCHEDULE_BULK_BATCH_SIZE': 2000,  # baris per INSERT saat create_schedules
+    'LISTING_PAGE_SIZE': 25,  # baris per halaman listing content/playlist/device
+    'LISTING_MAX_PAGE_SIZE': 100,
+    'LISTING_COUNT_EXACT_LIMIT': 1000,  # di atas ini total memakai estimasi planner
+    'DASHBOARD_CACHE_TTL': 30,  # detik snapshot statistik dashboard di-cache
+    'SOURCE_SIZE_CACHE_TTL': 60 * 60,
+    'EXPORT_CHUNK_SIZE': 2000,  # baris per fetch saat export di-stream
 }
 
 # Cache settings
@@ -159,4 +182,5 @@ X_FRAME_OPTIONS = 'SAMEORIGIN'
 # Create necessary directories
 os.makedirs(BASE_DIR / 'staticfiles', exist_ok=True)
 os.makedirs(BASE_DIR / 'media', exist_ok=True)
-os.makedirs(BASE_DIR / 'logs', exist_ok=True)
\ No newline at end of file
+os.makedirs(BASE_DIR / 'logs', exist_ok=True)
+os.makedirs(BASE_DIR / 'tmp', exist_ok=True)
\ No newline at end of file